@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+本地模拟的 GitHub REST / GraphQL 接口，供基准测试离线使用
+仓库数据按编号确定性生成；可配置延迟、错误率、速率限制与README大小
+
+单独运行：python benchmarks/fake_github.py --repos 100 --port 8765
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+# ========== 合成数据 ==========
+LANGUAGE_POOL = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Shell", "HTML", "CSS", "C", "Java"]
+TOPIC_POOL = ["cli", "tool", "web", "automation", "github", "api", "dashboard", "scraper", "bot", "utils"]
+README_PARAGRAPH = "这是一个用于基准测试的合成项目，提供各种实用的功能和工具集合，帮助开发者提高效率。\n\n"
+README_FILLER = "- 示例功能条目：支持批量处理、缓存与并发请求等常见场景\n"
+README_CACHE_BYTES = 128 * 1024 * 1024  # 服务器端缓存已生成README的内存上限
+
+def parse_size(value: str) -> int:
+    """
+    解析 1KB / 512KB / 5MB 形式的大小，返回字节数
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*', value.upper())
+    if not match:
+        raise ValueError(f"无法解析大小: {value}")
+    units = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+    return int(float(match.group(1)) * units[match.group(2)])
+def build_readme(name: str, size: int) -> str:
+    """
+    生成约 size 字节（UTF-8）的README：标题、描述段落、代码块，其余用列表条目填充
+    """
+    head = f"# {name}\n\n{README_PARAGRAPH}## 安装\n\n```bash\npip install {name}\n```\n\n## 功能\n\n"
+    filler_bytes = len(README_FILLER.encode('utf-8'))
+    missing = size - len(head.encode('utf-8'))
+    return head + README_FILLER * max(0, missing // filler_bytes)
+def build_repo(owner: str, index: int) -> Dict[str, Any]:
+    """
+    生成编号为 index 的仓库（REST /repos/{owner}/{repo} 格式）
+    每隔几个仓库留空描述，以触发README描述提取
+    """
+    name = f"repo-{index}"
+    day = 1 + index % 28
+    month = 1 + index % 12
+    return {
+        "name": name,
+        "full_name": f"{owner}/{name}",
+        "owner": {"login": owner},
+        "html_url": f"https://github.com/{owner}/{name}",
+        "description": "" if index % 3 == 0 else f"Synthetic benchmark repository {index}",
+        "stargazers_count": (index * 7919) % 500,
+        "forks_count": (index * 104729) % 50,
+        "watchers_count": (index * 7919) % 500,
+        "open_issues_count": index % 9,
+        "created_at": "2023-01-01T00:00:00Z",
+        "updated_at": f"2025-{month:02d}-{day:02d}T00:00:00Z",
+        "pushed_at": f"2025-{month:02d}-{day:02d}T00:00:00Z",
+        "language": LANGUAGE_POOL[index % len(LANGUAGE_POOL)],
+        "topics": [TOPIC_POOL[(index + k) % len(TOPIC_POOL)] for k in range(index % 4)],
+        "license": {"name": "MIT License"} if index % 2 == 0 else None,
+        "has_wiki": index % 2 == 1,
+        "has_pages": index % 5 == 0,
+        "has_projects": True,
+        "archived": False,
+        "disabled": False,
+        "private": False,
+        "fork": False,
+    }
+def build_languages(index: int) -> Dict[str, int]:
+    """
+    生成按字节数降序的语言统计
+    """
+    count = 1 + index % 3
+    return {
+        LANGUAGE_POOL[(index + k) % len(LANGUAGE_POOL)]: 100000 // (k + 1) + index
+        for k in range(count)
+    }
+def build_graphql_node(repo: Dict[str, Any], languages: Dict[str, int], readme: str, readme_sha: str) -> Dict[str, Any]:
+    """
+    将合成仓库转换为 GraphQL RepoFields 节点
+    """
+    return {
+        'name': repo['name'],
+        'url': repo['html_url'],
+        'description': repo['description'] or None,
+        'stargazerCount': repo['stargazers_count'],
+        'forkCount': repo['forks_count'],
+        'issues': {'totalCount': repo['open_issues_count']},
+        'pullRequests': {'totalCount': 0},
+        'createdAt': repo['created_at'],
+        'updatedAt': repo['updated_at'],
+        'pushedAt': repo['pushed_at'],
+        'primaryLanguage': {'name': repo['language']},
+        'languages': {'edges': [{'size': size, 'node': {'name': lang}} for lang, size in languages.items()]},
+        'repositoryTopics': {'nodes': [{'topic': {'name': topic}} for topic in repo['topics']]},
+        'licenseInfo': repo['license'],
+        'hasWikiEnabled': repo['has_wiki'],
+        'hasProjectsEnabled': repo['has_projects'],
+        'isArchived': repo['archived'],
+        'isDisabled': repo['disabled'],
+        'isPrivate': repo['private'],
+        'readmeMd': {'text': readme, 'oid': readme_sha},
+        'readmeLower': None,
+        'readmePlain': None,
+    }
+
+# ========== 模拟服务器 ==========
+class FakeGitHub:
+    """
+    在后台线程中运行的模拟 GitHub API
+    latency: 每个请求的附加延迟（秒）；error_rate: 返回 502 的比例；
+    rate_limit: 每个令牌在 rate_window 秒内可用的请求数（None 表示不限制）
+    """
+    def __init__(self, owner: str = 'bench', repos: int = 100, readme_size: int = 1024,
+                 latency: float = 0.0, error_rate: float = 0.0, rate_limit: Optional[int] = None,
+                 rate_window: float = 60.0, seed: int = 0, host: str = '127.0.0.1', port: int = 0):
+        self.owner = owner
+        self.repos = repos
+        self.readme_size = readme_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.budgets: Dict[str, Dict[str, float]] = {}
+        self.stats = {'requests': 0, 'graphql': 0, 'not_modified': 0, 'errors': 0, 'rate_limited': 0, 'bytes': 0}
+        self._readme_cache: Dict[str, Tuple[str, str, str]] = {}
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    def start(self) -> 'FakeGitHub':
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    def __enter__(self) -> 'FakeGitHub':
+        return self.start()
+    def __exit__(self, *exc):
+        self.stop()
+    def reset_stats(self):
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+            self.budgets.clear()
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats)
+    def repo_index(self, name: str) -> Optional[int]:
+        """
+        repo-<n> 形式且在范围内时返回编号
+        """
+        match = re.fullmatch(r'repo-(\d+)', name)
+        if match and int(match.group(1)) < self.repos:
+            return int(match.group(1))
+        return None
+    def readme(self, name: str) -> Tuple[str, str, str]:
+        """
+        返回 (README文本, base64内容, blob SHA)，按仓库名缓存，避免大README重复编码
+        """
+        with self.lock:
+            cached = self._readme_cache.get(name)
+        if cached is None:
+            text = build_readme(name, self.readme_size)
+            raw = text.encode('utf-8')
+            sha = hashlib.sha1(b'blob %d\0' % len(raw) + raw).hexdigest()
+            cached = (text, base64.encodebytes(raw).decode('ascii'), sha)
+            with self.lock:
+                if len(self._readme_cache) < 1000 and len(self._readme_cache) * len(raw) < README_CACHE_BYTES:
+                    self._readme_cache[name] = cached
+        return cached
+    def take_budget(self, token: str) -> Tuple[bool, Dict[str, str]]:
+        """
+        扣减令牌的请求额度，返回 (是否允许, 速率限制响应头)
+        """
+        if self.rate_limit is None:
+            return True, {}
+        now = time.time()
+        with self.lock:
+            budget = self.budgets.get(token)
+            if budget is None or now >= budget['reset']:
+                budget = self.budgets[token] = {'remaining': self.rate_limit, 'reset': now + self.rate_window}
+            allowed = budget['remaining'] > 0
+            if allowed:
+                budget['remaining'] -= 1
+            headers = {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(int(budget['remaining'])),
+                'X-RateLimit-Reset': str(int(budget['reset']) + 1),
+            }
+        return allowed, headers
+    def route(self, path: str, raw_media: bool = False) -> Optional[Any]:
+        """
+        REST 路由：返回响应数据，None 表示 404
+        raw_media 为真时 README 直接返回正文字节（application/vnd.github.raw）
+        """
+        parsed = urlparse(path)
+        parts = parsed.path.strip('/').split('/')
+        query = parse_qs(parsed.query)
+        if len(parts) == 3 and parts[0] in ('users', 'orgs') and parts[2] == 'repos':
+            if parts[1] != self.owner:
+                return []
+            per_page = int(query.get('per_page', ['30'])[0])
+            page = int(query.get('page', ['1'])[0])
+            start = (page - 1) * per_page
+            return [build_repo(self.owner, i) for i in range(start, min(start + per_page, self.repos))]
+        if len(parts) < 3 or parts[0] != 'repos' or parts[1] != self.owner:
+            return None
+        index = self.repo_index(parts[2])
+        if index is None:
+            return None
+        if len(parts) == 3:
+            return build_repo(self.owner, index)
+        if parts[3] == 'languages':
+            return build_languages(index)
+        if parts[3] == 'readme':
+            text, content, sha = self.readme(parts[2])
+            if raw_media:
+                return text.encode('utf-8')
+            return {'name': 'README.md', 'path': 'README.md', 'sha': sha, 'encoding': 'base64', 'content': content}
+        return None
+    def graphql(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        解析 build_graphql_batch_query 生成的别名查询并返回对应节点
+        """
+        variables = payload.get('variables') or {}
+        data: Dict[str, Any] = {}
+        errors = []
+        for alias, var in re.findall(r'(r\d+): repository\(owner: \$owner, name: \$(n\d+)\)', payload.get('query', '')):
+            name = variables.get(var, '')
+            index = self.repo_index(name) if variables.get('owner') == self.owner else None
+            if index is None:
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias], 'message': f"Could not resolve to a Repository with the name '{name}'."})
+                continue
+            text, _, sha = self.readme(name)
+            data[alias] = build_graphql_node(build_repo(self.owner, index), build_languages(index), text, sha)
+        return {'data': data, 'errors': errors} if errors else {'data': data}
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            def log_message(self, *args):
+                pass
+            def send_body(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None,
+                          content_type: str = 'application/json; charset=utf-8'):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if body:
+                    self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    try:
+                        self.wfile.write(body)
+                    except (BrokenPipeError, ConnectionResetError):
+                        self.close_connection = True  # 客户端读到字节上限后提前断开
+                        return
+                with fake.lock:
+                    fake.stats['bytes'] += len(body)
+            def admit(self, graphql: bool = False) -> Optional[Dict[str, str]]:
+                """
+                统一处理延迟、速率限制与随机错误；请求被拒绝时返回 None
+                """
+                with fake.lock:
+                    fake.stats['requests'] += 1
+                    if graphql:
+                        fake.stats['graphql'] += 1
+                    failed = fake.random.random() < fake.error_rate
+                if fake.latency:
+                    time.sleep(fake.latency)
+                allowed, headers = fake.take_budget(self.headers.get('Authorization', ''))
+                if not allowed:
+                    with fake.lock:
+                        fake.stats['rate_limited'] += 1
+                    body = json.dumps({'message': 'API rate limit exceeded'}).encode('utf-8')
+                    self.send_body(403, body, headers)
+                    return None
+                if failed:
+                    with fake.lock:
+                        fake.stats['errors'] += 1
+                    self.send_body(502, json.dumps({'message': 'Bad Gateway'}).encode('utf-8'), headers)
+                    return None
+                return headers
+            def do_GET(self):
+                headers = self.admit()
+                if headers is None:
+                    return
+                raw_media = 'vnd.github.raw' in self.headers.get('Accept', '')
+                data = fake.route(self.path, raw_media)
+                if data is None:
+                    self.send_body(404, json.dumps({'message': 'Not Found'}).encode('utf-8'), headers)
+                    return
+                is_raw = isinstance(data, bytes)
+                body = data if is_raw else json.dumps(data, ensure_ascii=False).encode('utf-8')
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                headers['ETag'] = etag
+                if self.headers.get('If-None-Match') == etag:
+                    with fake.lock:
+                        fake.stats['not_modified'] += 1
+                    self.send_body(304, headers=headers)
+                    return
+                self.send_body(200, body, headers, 'text/plain; charset=utf-8' if is_raw else 'application/json; charset=utf-8')
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length)
+                headers = self.admit(graphql=True)
+                if headers is None:
+                    return
+                if urlparse(self.path).path.rstrip('/') != '/graphql':
+                    self.send_body(404, json.dumps({'message': 'Not Found'}).encode('utf-8'), headers)
+                    return
+                try:
+                    payload = json.loads(raw)
+                except json.JSONDecodeError:
+                    self.send_body(400, json.dumps({'message': 'Problems parsing JSON'}).encode('utf-8'), headers)
+                    return
+                self.send_body(200, json.dumps(fake.graphql(payload), ensure_ascii=False).encode('utf-8'), headers)
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟 GitHub API（基准测试用）")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--owner', default='bench')
+    parser.add_argument('--repos', type=int, default=100)
+    parser.add_argument('--readme-size', default='1KB', help="README大小，如 1KB、5MB")
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=None, help="每个令牌在窗口内的请求数")
+    parser.add_argument('--rate-window', type=float, default=60.0, help="速率限制窗口（秒）")
+    args = parser.parse_args()
+    fake = FakeGitHub(
+        owner=args.owner, repos=args.repos, readme_size=parse_size(args.readme_size),
+        latency=args.latency_ms / 1000, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, rate_window=args.rate_window, port=args.port,
+    )
+    print(f"🧪 模拟 GitHub API 已启动: {fake.url}（{args.repos} 个仓库，owner={args.owner}）")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+
+if __name__ == "__main__":
+    main()
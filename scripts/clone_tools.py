@@ -1,39 +1,211 @@
 #!/usr/bin/env python3
 """
-将列表中的仓库克隆为子模块
+将 config.json 中的仓库添加 / 更新为 tools/ 下的子模块
+并发处理（-j 限制同时进行的 git 操作数），使用浅克隆 + 无blob的部分克隆
+已登记的子模块默认检出上层仓库记录的提交，不改变子模块指针；
+--remote 时更新到远程 HEAD 并暂存新的指针（需要自行提交）
+
+用法示例：
+    python scripts/clone_tools.py              # 添加缺少的子模块并检出已有的
+    python scripts/clone_tools.py -j 8 --full  # 完整历史克隆
+    python scripts/clone_tools.py --no-add     # 只初始化 / 检出已登记的子模块（CI 使用）
+    python scripts/clone_tools.py --remote     # 将子模块更新到远程 HEAD 并暂存指针变化
 """
+import os
+import sys
+import argparse
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from toolbox import config
+
+TOOLS_DIR = 'tools'
+DEFAULT_BASE_URL = 'https://github.com'
+# 修改上层仓库（.gitmodules、索引、.git/config）的命令需要串行执行，避免 index.lock 冲突
+_superproject_lock = threading.Lock()
+
+def run_git(args: List[str], cwd: str = ROOT_DIR) -> subprocess.CompletedProcess:
+    """
+    运行 git 命令并捕获输出（不经过 shell）
+    """
+    return subprocess.run(['git'] + args, cwd=cwd, capture_output=True, text=True)
+def clone_options(full: bool) -> List[str]:
+    return [] if full else ['--depth', '1', '--filter=blob:none']
+def get_remote_head(url: str) -> Optional[str]:
+    """
+    远程默认分支的提交SHA，失败时返回None
+    """
+    result = run_git(['ls-remote', url, 'HEAD'])
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.split()[0]
+def get_local_head(path: str) -> Optional[str]:
+    """
+    已检出子模块的提交SHA；目录不存在或尚未初始化时返回None
+    """
+    if not os.path.exists(os.path.join(ROOT_DIR, path, '.git')):
+        return None
+    result = run_git(['rev-parse', 'HEAD'], cwd=os.path.join(ROOT_DIR, path))
+    return result.stdout.strip() if result.returncode == 0 else None
+def get_recorded_commit(path: str) -> Optional[str]:
+    """
+    上层仓库索引中记录的子模块提交（gitlink），没有记录时返回None
+    """
+    result = run_git(['rev-parse', '--verify', '--quiet', f':{path}'])
+    return result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else None
+def get_registered_submodules() -> Dict[str, str]:
+    """
+    .gitmodules 中登记的子模块：路径 -> URL
+    """
+    result = run_git(['config', '-f', '.gitmodules', '--get-regexp', r'^submodule\..*\.(path|url)$'])
+    paths, urls = {}, {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(' ')
+        name, _, kind = key[len('submodule.'):].rpartition('.')
+        (paths if kind == 'path' else urls)[name] = value
+    return {path: urls.get(name, '') for name, path in paths.items()}
+
+# ========== 子模块处理 ==========
+def provision(repo: str, path: str, url: str, registered: bool, args: argparse.Namespace) -> str:
+    """
+    添加或更新单个子模块，返回结果说明
+    """
+    if registered and not args.remote:
+        return checkout_recorded(path, url, args)
+
+    remote_head = get_remote_head(url)
+    if remote_head is None:
+        return '❌ 无法获取远程 HEAD'
+    local_head = get_local_head(path)
+    if local_head == remote_head:
+        return f'⏭️  已是最新 ({remote_head[:7]})'
+
+    full_path = os.path.join(ROOT_DIR, path)
+    if local_head is None and not registered:
+        if os.path.exists(full_path) and os.listdir(full_path):
+            return '❌ 目录已存在且不是子模块'
+        # 克隆可以并发进行；登记到上层仓库时再串行（git 会直接使用已克隆的目录）
+        result = run_git(['clone', '--quiet'] + clone_options(args.full) + [url, path])
+        if result.returncode != 0:
+            return f'❌ 克隆失败: {result.stderr.strip()}'
+        with _superproject_lock:
+            result = run_git(['submodule', 'add', '--force', url, path])
+            if result.returncode == 0:
+                # 把克隆目录中的 .git 移入 .git/modules，与 git submodule add 直接克隆的布局一致
+                run_git(['submodule', 'absorbgitdirs', '--', path])
+                if not args.full:
+                    run_git(['config', '-f', '.gitmodules', f'submodule.{path}.shallow', 'true'])
+                    run_git(['add', '.gitmodules'])
+        return f'✅ 已添加 ({remote_head[:7]})' if result.returncode == 0 else f'❌ 登记失败: {result.stderr.strip()}'
+
+    if local_head is None:
+        # 已登记但尚未初始化：先检出记录的提交
+        message = checkout_recorded(path, url, args)
+        if message.startswith('❌'):
+            return message
+        local_head = get_local_head(path)
+        if local_head == remote_head:
+            return f'✅ 已初始化 ({remote_head[:7]})'
+
+    # 拉取远程 HEAD 并检出
+    fetch = ['fetch', '--quiet'] + clone_options(args.full) + ['origin', remote_head]
+    result = run_git(fetch, cwd=full_path)
+    if result.returncode == 0:
+        result = run_git(['checkout', '--quiet', '--detach', remote_head], cwd=full_path)
+    if result.returncode != 0:
+        return f'❌ 更新失败: {result.stderr.strip()}'
+    if not registered:
+        return f'🔄 已更新 {(local_head or "")[:7]} -> {remote_head[:7]}'
+    # 有意更新子模块指针：暂存新的 gitlink，由使用者提交
+    with _superproject_lock:
+        result = run_git(['add', '--', path])
+    if result.returncode != 0:
+        return f'❌ 暂存子模块指针失败: {result.stderr.strip()}'
+    return f'🔄 已更新 {(local_head or "")[:7]} -> {remote_head[:7]}（已暂存新的子模块指针）'
+def checkout_recorded(path: str, url: str, args: argparse.Namespace) -> str:
+    """
+    初始化并检出上层仓库记录的提交，不改变子模块指针
+    只有 submodule init 与 absorbgitdirs（写入 .git/config、.git/modules）持有上层仓库锁，
+    克隆与拉取在各自的子模块目录中并发进行
+    """
+    recorded = get_recorded_commit(path)
+    if recorded is None:
+        return '❌ 上层仓库中没有该子模块的提交记录'
+    local_head = get_local_head(path)
+    if local_head == recorded:
+        return f'⏭️  已是记录的提交 ({recorded[:7]})'
+    full_path = os.path.join(ROOT_DIR, path)
+    if local_head is None:
+        with _superproject_lock:
+            result = run_git(['submodule', 'init', '--', path])
+        if result.returncode != 0:
+            return f'❌ 初始化失败: {result.stderr.strip()}'
+        if os.path.exists(full_path) and os.listdir(full_path):
+            return '❌ 子模块目录不为空，无法克隆'
+        result = run_git(['clone', '--quiet', '--no-checkout'] + clone_options(args.full) + [url, path])
+        if result.returncode != 0:
+            return f'❌ 克隆失败: {result.stderr.strip()}'
+    fetch = ['fetch', '--quiet'] + clone_options(args.full) + ['origin', recorded]
+    result = run_git(fetch, cwd=full_path)
+    if result.returncode == 0:
+        result = run_git(['checkout', '--quiet', '--detach', recorded], cwd=full_path)
+    if result.returncode != 0:
+        return f'❌ 检出失败: {result.stderr.strip()}'
+    if local_head is None:
+        # 把克隆目录中的 .git 移入 .git/modules，与 git submodule update 的布局一致
+        with _superproject_lock:
+            result = run_git(['submodule', 'absorbgitdirs', '--', path])
+        if result.returncode != 0:
+            return f'❌ 登记失败: {result.stderr.strip()}'
+        return f'✅ 已初始化 ({recorded[:7]})'
+    return f'🔄 已检出记录的提交 {local_head[:7]} -> {recorded[:7]}'
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="将 config.json 中的仓库添加 / 更新为 tools/ 下的子模块")
+    parser.add_argument('--config', default=config.CONFIG_FILE, help=f"配置文件路径（默认 {config.CONFIG_FILE}）")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="同时处理的仓库数量（默认读取 max_workers）")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help=f"新子模块的仓库地址前缀（默认 {DEFAULT_BASE_URL}）")
+    parser.add_argument('--full', action='store_true', help="完整克隆（默认浅克隆且不下载历史blob）")
+    parser.add_argument('--no-add', action='store_true', help="不添加新的子模块，只初始化 / 检出已登记的")
+    parser.add_argument('--remote', action='store_true',
+                        help="将已登记的子模块更新到远程 HEAD 并暂存新的子模块指针（默认检出记录的提交）")
+    return parser.parse_args(argv)
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    os.chdir(ROOT_DIR)
+    config.load_env()
+    config.load_config(args.config)
+    jobs = max(1, int(args.jobs or config.MAX_WORKERS))
+
+    registered = get_registered_submodules()
+    targets = []
+    for repo in config.REPO_LIST:
+        path = f"{TOOLS_DIR}/{repo}"
+        url = f"{args.base_url.rstrip('/')}/{config.USERNAME}/{repo}.git"
+        if path in registered:
+            targets.append((repo, path, registered[path] or url, True))
+        elif not args.no_add:
+            targets.append((repo, path, url, False))
+    print(f"🔧 处理 {len(targets)} 个子模块（并发 {jobs}，{'完整克隆' if args.full else '浅克隆'}）...")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [(repo, executor.submit(provision, repo, path, url, is_registered, args))
+                   for repo, path, url, is_registered in targets]
+        for repo, future in futures:
+            try:
+                message = future.result()
+            except Exception as e:
+                message = f'❌ {type(e).__name__}: {e}'
+            failed += message.startswith('❌')
+            print(f"  {repo}: {message}")
 
-import os, subprocess
-
-REPOS = ["NodeWeb", "CustomNode", "50DayChallenge"]  # 你的仓库列表
-USER = "DaiZhouHui"
-
-def run_cmd(cmd):
-    """运行命令并打印输出"""
-    print(f"$ {cmd}")
-    result = subprocess.run(cmd, shell=True, text=True)
-    return result.returncode == 0
-
-def main():
-    print("🔧 开始设置子模块...")
-    
-    for repo in REPOS:
-        target_dir = f"tools/{repo}"
-        if os.path.exists(target_dir):
-            print(f"⏭️  跳过 {repo}，目录已存在")
-            continue
-        
-        print(f"\n📥 添加子模块: {repo}")
-        cmd = f"git submodule add https://github.com/{USER}/{repo}.git {target_dir}"
-        if run_cmd(cmd):
-            print(f"   ✅ 成功")
-        else:
-            print(f"   ❌ 失败")
-    
-    print("\n🎉 子模块添加完成！")
-    print("运行以下命令初始化：")
-    print("  git submodule init")
-    print("  git submodule update")
+    print(f"\n🎉 子模块处理完成！失败 {failed} 个" if failed else "\n🎉 子模块处理完成！")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,32 @@
+"""
+pytest 配置：test_token.py 是需要真实令牌的手动检查脚本，导入时就会发请求，不作为测试收集
+需要网络的测试使用 fake_github 夹具（本地模拟 GitHub API）
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+collect_ignore = ['test_token.py']
+
+@pytest.fixture
+def fake_github(tmp_path, monkeypatch):
+    """
+    本地模拟 GitHub API（benchmarks/fake_github.py）：客户端的共享单例指向它，缓存写入临时目录
+    """
+    from benchmarks.fake_github import FakeGitHub
+    from toolbox import cache, client, config, ratelimit, retry
+    fake = FakeGitHub(owner='bench', repos=5).start()
+    monkeypatch.setattr(config, 'API_BASE_URL', fake.url)
+    monkeypatch.setenv('GITHUB_GRAPHQL_URL', f"{fake.url}/graphql")
+    monkeypatch.setattr(config, 'USERNAME', 'bench')
+    monkeypatch.setattr(config, 'GITHUB_TOKENS', ['test-token'])
+    monkeypatch.setattr(config, 'CACHE_MODE', 'revalidate')
+    monkeypatch.setattr(cache, '_cache_store', cache.JsonFileCache(str(tmp_path / 'cache')))
+    monkeypatch.setattr(ratelimit, '_rate_limiter', None)
+    monkeypatch.setattr(retry, '_circuit_breaker', None)
+    monkeypatch.setattr(client, '_http_session', None)
+    yield fake
+    fake.stop()
@@ -0,0 +1,38 @@
+"""
+仓库分析：有界并发与结果顺序
+"""
+import threading
+import time
+
+from benchmarks.fake_github import build_languages, build_repo
+
+from toolbox import analysis, config
+
+def test_results_follow_input_order(fake_github, monkeypatch):
+    monkeypatch.setattr(config, 'FETCH_BACKEND', 'rest')
+    fake_github.repos = 8
+    names = [f'repo-{i}' for i in range(8)] + ['missing']
+    records = analysis.analyze_repositories(names, 4)
+    assert [record.name if record else None for record in records] == names[:-1] + [None]
+    assert records[5].stars == build_repo('bench', 5)['stargazers_count']
+    assert records[5].language_bytes == build_languages(5)
+def test_worker_pool_is_bounded(monkeypatch):
+    monkeypatch.setattr(config, 'FETCH_BACKEND', 'rest')
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+    def fake_analyze(repo_name):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        time.sleep(0.02)
+        with lock:
+            active['now'] -= 1
+        return repo_name
+    monkeypatch.setattr(analysis, 'analyze_repository', fake_analyze)
+    names = [f'repo-{i}' for i in range(12)]
+    assert analysis.analyze_repositories(names, 3) == names
+    assert 1 < active['peak'] <= 3
+    # max_workers 为 1 时顺序执行
+    active['peak'] = 0
+    assert analysis.analyze_repositories(names[:3], 1) == names[:3]
+    assert active['peak'] == 1
@@ -0,0 +1,68 @@
+"""
+离线基准测试：模拟 GitHub API 的行为与完整的冷 / 热运行
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+import requests
+
+from benchmarks.fake_github import FakeGitHub, parse_size
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def fake():
+    with FakeGitHub(owner='bench', repos=3, readme_size=256) as fake:
+        yield fake
+
+def test_parse_size():
+    assert parse_size('512') == 512
+    assert parse_size('1KB') == 1024 and parse_size('1.5k') == 1536 and parse_size(' 5MB ') == 5 * 1024 ** 2
+    with pytest.raises(ValueError):
+        parse_size('lots')
+def test_rest_routes_and_etag(fake):
+    response = requests.get(f'{fake.url}/repos/bench/repo-1')
+    assert response.status_code == 200 and response.json()['full_name'] == 'bench/repo-1'
+    again = requests.get(f'{fake.url}/repos/bench/repo-1', headers={'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304 and fake.snapshot()['not_modified'] == 1
+    raw = requests.get(f'{fake.url}/repos/bench/repo-1/readme', headers={'Accept': 'application/vnd.github.raw'})
+    assert raw.text.startswith('# repo-1') and len(raw.content) <= 256
+    assert requests.get(f'{fake.url}/repos/bench/repo-3').status_code == 404
+    assert [repo['name'] for repo in requests.get(f'{fake.url}/users/bench/repos?per_page=2&page=2').json()] == ['repo-2']
+def test_rate_limit_and_errors(fake):
+    fake.rate_limit = 2
+    headers = {'Authorization': 'token a'}
+    codes = [requests.get(f'{fake.url}/repos/bench/repo-0', headers=headers).status_code for _ in range(3)]
+    assert codes == [200, 200, 403]
+    limited = requests.get(f'{fake.url}/repos/bench/repo-0', headers=headers)
+    assert limited.headers['X-RateLimit-Remaining'] == '0'
+    # 令牌的额度相互独立
+    assert requests.get(f'{fake.url}/repos/bench/repo-0', headers={'Authorization': 'token b'}).status_code == 200
+    fake.rate_limit = None
+    fake.error_rate = 1.0
+    assert requests.get(f'{fake.url}/repos/bench/repo-0').status_code == 502
+def test_graphql_batch(fake):
+    query = 'r0: repository(owner: $owner, name: $n0) r1: repository(owner: $owner, name: $n1)'
+    body = requests.post(f'{fake.url}/graphql', json={
+        'query': query, 'variables': {'owner': 'bench', 'n0': 'repo-2', 'n1': 'missing'},
+    }).json()
+    assert body['data']['r0']['name'] == 'repo-2' and body['data']['r1'] is None
+    assert body['errors'][0]['type'] == 'NOT_FOUND'
+@pytest.mark.parametrize('backend', ['rest', 'graphql'])
+def test_cold_and_warm_runs(tmp_path, backend):
+    results_file = tmp_path / 'results.json'
+    subprocess.run([sys.executable, os.path.join(ROOT_DIR, 'benchmarks', 'run_benchmark.py'),
+                    '--sizes', '3', '--backend', backend, '--json', str(results_file)],
+                   cwd=tmp_path, capture_output=True, text=True, check=True)
+    cold, warm = json.loads(results_file.read_text(encoding='utf-8'))
+    assert (cold['phase'], warm['phase']) == ('cold', 'warm')
+    assert cold['exit_code'] == 0 and warm['exit_code'] == 0
+    assert cold['requests'] > 0 and cold['cache_hit_ratio'] == 0
+    if backend == 'rest':
+        assert warm['requests'] < cold['requests']
+    else:
+        # GraphQL 批量查询不经过 REST 缓存：3 个仓库每次都是一个批量请求
+        assert cold['requests'] == warm['requests'] == 1
@@ -0,0 +1,49 @@
+"""
+二进制索引的编码与读取
+"""
+from datetime import datetime
+
+import pytest
+
+from toolbox.binary_index import BinaryIndex, encode_binary_index, write_binary_index
+from toolbox.records import RepositoryRecord
+from toolbox.render import generate_index_data
+
+REPOSITORIES = [
+    RepositoryRecord("zeta", "https://github.com/o/zeta", final_description="最后一个", stars=2,
+                     language="Go", topics=["cli", "工具"], license="MIT License", has_wiki=True),
+    RepositoryRecord("Alpha", "https://github.com/o/Alpha", final_description="", stars=7, forks=3),
+    RepositoryRecord("beta", "https://github.com/o/beta", final_description="第二个", topics=["cli"]),
+]
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / "tools_index.bin"
+    with open(path, 'wb') as f:
+        write_binary_index(REPOSITORIES, f, datetime(2026, 1, 1))
+    return path
+
+def test_round_trip_matches_json_index(index_path):
+    data = generate_index_data(REPOSITORIES, datetime(2026, 1, 1))
+    with BinaryIndex.open(str(index_path)) as index:
+        assert len(index) == 3
+        assert list(index) == data['repositories']
+        assert index[-1] == data['repositories'][-1]
+        assert index.to_index_data() == data
+def test_lookup_by_name(index_path):
+    with BinaryIndex.open(str(index_path)) as index:
+        assert index.get("ALPHA")['stars'] == 7
+        assert index.get("zeta")['topics'] == ["cli", "工具"]
+        assert index.get("gamma") is None
+        with pytest.raises(IndexError):
+            index[3]
+def test_empty_index(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(encode_binary_index(generate_index_data([], datetime(2026, 1, 1))))
+    with BinaryIndex.open(str(path)) as index:
+        assert len(index) == 0 and index.get("a") is None
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not an index" * 10)
+    with pytest.raises(ValueError):
+        BinaryIndex.open(str(path))
@@ -0,0 +1,96 @@
+"""
+缓存后端：键规范化、有效期、SQLite 的 LRU 淘汰与旧版 JSON 缓存迁移
+"""
+import itertools
+import json
+
+import pytest
+
+from toolbox import cache, config
+from toolbox.cache import (
+    JsonFileCache, SqliteCache, get_cache_ttl, get_endpoint_class, guess_legacy_cache_endpoint, is_cache_fresh,
+    normalize_cache_key,
+)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    每次调用 time.time 前进 1 秒，保证访问顺序可区分
+    """
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(cache.time, 'time', lambda: float(next(ticks)))
+
+def test_normalize_cache_key():
+    assert normalize_cache_key('//repos/Owner/Repo/') == '/repos/owner/repo'
+    assert normalize_cache_key('/users/Me/repos?page=2&per_page=100') == '/users/me/repos?page=2&per_page=100'
+    assert normalize_cache_key('/users/me/repos?per_page=100&page=2') == '/users/me/repos?page=2&per_page=100'
+def test_endpoint_class_and_ttl(monkeypatch):
+    assert get_endpoint_class('/repos/o/r') == 'info'
+    assert get_endpoint_class('/repos/o/r/readme') == 'readme'
+    assert get_endpoint_class('/users/o/repos?page=1') == 'list'
+    monkeypatch.setattr(config, 'CACHE_TTL', {'info': 5})
+    assert get_cache_ttl('/repos/o/r') == 5
+    assert get_cache_ttl('/repos/o/r/readme') == cache.DEFAULT_CACHE_TTL['readme']
+    entry = {'cached_at': cache.time.time() - 10}
+    assert not is_cache_fresh(entry, '/repos/o/r')
+    assert is_cache_fresh(entry, '/repos/o/r/readme')
+    assert not is_cache_fresh({'cached_at': None}, '/repos/o/r/readme')
+def test_sqlite_roundtrip_and_persistence(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    store = SqliteCache(path)
+    store.set('/repos/Owner/Repo', {'name': 'Repo'}, '"etag"', 'Mon, 01 Jan 2024 00:00:00 GMT')
+    entry = store.get('/repos/owner/repo')
+    assert entry['data'] == {'name': 'Repo'} and entry['etag'] == '"etag"'
+    assert entry['last_modified'] == 'Mon, 01 Jan 2024 00:00:00 GMT' and entry['cached_at']
+    assert store.get('/repos/owner/other') is None
+    store.close()
+    reopened = SqliteCache(path)
+    assert len(reopened) == 1 and reopened.get('/repos/owner/repo')['data'] == {'name': 'Repo'}
+    reopened.close()
+def test_sqlite_evicts_least_recently_used(tmp_path, clock):
+    store = SqliteCache(str(tmp_path / 'cache.sqlite3'), max_bytes=100)
+    for name in ('a', 'b', 'c'):
+        store.set(f'/repos/o/{name}', 'x' * 28, None, None)  # 每条 30 字节
+    assert store.get('/repos/o/a') is not None  # a 最近被访问过
+    store.set('/repos/o/d', 'x' * 28, None, None)
+    # 超出 100 字节后淘汰到 90 字节以内：删除最久未访问的 b
+    assert store.get('/repos/o/b') is None
+    assert all(store.get(f'/repos/o/{name}') is not None for name in ('a', 'c', 'd'))
+    assert store.total_bytes == 90
+    store.close()
+    # 容量上限调小后，打开时立即淘汰
+    smaller = SqliteCache(store.path, max_bytes=40)
+    assert len(smaller) == 1 and smaller.total_bytes == 30
+    smaller.close()
+def test_replacing_an_entry_updates_total_size(tmp_path):
+    store = SqliteCache(str(tmp_path / 'cache.sqlite3'))
+    store.set('/repos/o/a', 'x' * 8, None, None)
+    store.set('/repos/o/a', 'x' * 18, None, None)
+    assert len(store) == 1 and store.total_bytes == 20
+    store.close()
+def test_guess_legacy_cache_endpoint():
+    assert guess_legacy_cache_endpoint('cache__repos_me_tool.json', {'full_name': 'me/tool'}) == '/repos/me/tool'
+    readme = {'url': 'https://api.github.com/repos/me/tool/contents/README.md'}
+    assert guess_legacy_cache_endpoint('cache__repos_me_tool_readme.json', readme) == '/repos/me/tool/readme'
+    assert guess_legacy_cache_endpoint('cache__repos_me_my_tool_languages.json', {'Go': 1}) == '/repos/me/my_tool/languages'
+    assert guess_legacy_cache_endpoint('cache__users_me_repos.json', [{}]) is None
+def test_migrates_json_cache_into_empty_sqlite_store(tmp_path, monkeypatch):
+    json_dir = tmp_path / 'api_cache'
+    JsonFileCache(str(json_dir)).set('/repos/me/new', {'name': 'new'}, '"e1"', None)
+    (json_dir / 'cache__repos_me_old.json').write_text(json.dumps({'full_name': 'me/old', 'name': 'old'}), encoding='utf-8')
+    (json_dir / 'cache__repos_me_broken.json').write_text('{', encoding='utf-8')
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(json_dir))
+    monkeypatch.setattr(cache, '_cache_store', None)
+    monkeypatch.setattr(config, 'CACHE_BACKEND', 'sqlite')
+    monkeypatch.setattr(config, 'CACHE_PATH', str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(config, 'CACHE_MAX_BYTES', None)
+    store = cache.get_cache_store()
+    try:
+        assert isinstance(store, SqliteCache) and len(store) == 2
+        assert store.get('/repos/me/new')['etag'] == '"e1"'
+        # 旧版纯数据文件没有验证信息与缓存时间，下次使用时会重新请求
+        old = store.get('/repos/me/old')
+        assert old['data']['name'] == 'old' and old['etag'] is None and old['cached_at'] is None
+        assert cache.get_cache_store() is store
+    finally:
+        store.close()
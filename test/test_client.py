@@ -0,0 +1,147 @@
+"""
+REST / GraphQL 客户端：缓存、条件请求与错误处理（使用假响应或本地模拟 API，不发真实网络请求）
+"""
+import pytest
+import requests
+
+from toolbox import client, config
+from toolbox.cache import CACHE_STATS, JsonFileCache
+from toolbox.retry import CircuitBreaker
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None, text='{}'):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        if self.payload is None:
+            raise requests.exceptions.JSONDecodeError('Expecting value', self.text, 0)
+        return self.payload
+
+class FakeTransport:
+    """
+    按顺序返回预设响应，并记录每次请求的请求头
+    """
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, method, url, resource='core', headers=None, max_wait=None, **kwargs):
+        self.calls.append((method, url, dict(headers or {})))
+        return self.responses.pop(0)
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = JsonFileCache(str(tmp_path))
+    monkeypatch.setattr(client, 'get_cache_store', lambda: store)
+    monkeypatch.setattr(config, 'CACHE_MODE', 'revalidate')
+    return store
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    monkeypatch.setattr(client, 'get_circuit_breaker', lambda: breaker)
+    monkeypatch.setattr(client, 'wait_before_retry', lambda attempt, retry_after=None: True)
+    return breaker
+
+def test_malformed_json_is_not_retried(store, breaker, monkeypatch):
+    transport = FakeTransport(FakeResponse(text='<html>'), FakeResponse(payload={'ok': True}))
+    monkeypatch.setattr(client, 'send_github_request', transport)
+    assert client.call_github_api('/repos/u/broken') is None
+    # 正文无法解析不是网络故障：不重试，也不计入熔断
+    assert len(transport.calls) == 1
+    assert breaker.allow('info')
+    assert store.get('/repos/u/broken') is None
+def test_malformed_graphql_json_is_not_retried(breaker, monkeypatch):
+    transport = FakeTransport(FakeResponse(text='<html>'), FakeResponse(payload={'data': {}}))
+    monkeypatch.setattr(client, 'send_github_request', transport)
+    assert client.call_github_graphql('query { viewer { login } }', {}) is None
+    assert len(transport.calls) == 1
+    assert breaker.allow('graphql')
+
+def cache_events(action):
+    before = dict(CACHE_STATS)
+    result = action()
+    return result, {kind: count - before.get(kind, 0) for kind, count in CACHE_STATS.items() if count != before.get(kind, 0)}
+
+def test_fresh_cache_is_used_without_request(fake_github):
+    first, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-1'))
+    assert first['name'] == 'repo-1' and events == {'miss': 1}
+    second, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-1'))
+    assert second == first and events == {'cached': 1}
+    assert fake_github.snapshot()['requests'] == 1
+def test_expired_cache_is_revalidated_with_etag(fake_github, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_TTL', {'info': 0})
+    first = client.call_github_api('/repos/bench/repo-2')
+    second, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-2'))
+    assert second == first and events == {'revalidated': 1}
+    assert fake_github.snapshot()['not_modified'] == 1
+    # 内容变化时重新获取并替换缓存
+    monkeypatch.setattr('benchmarks.fake_github.build_repo', lambda owner, index: {'name': 'changed'})
+    third, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-2'))
+    assert third == {'name': 'changed'} and events == {'refetched': 1}
+def test_forced_revalidation_and_prefer_cache(fake_github, monkeypatch):
+    client.call_github_api('/repos/bench/repo-3')
+    _, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-3', revalidate=True))
+    assert events == {'revalidated': 1}
+    monkeypatch.setattr(config, 'CACHE_TTL', {'info': 0})
+    monkeypatch.setattr(config, 'CACHE_MODE', 'prefer-cache')
+    _, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-3'))
+    assert events == {'cached': 1}
+    assert fake_github.snapshot()['requests'] == 2
+def test_failed_request_falls_back_to_stale_cache(fake_github, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_TTL', {'info': 0})
+    monkeypatch.setattr(client, 'wait_before_retry', lambda attempt, retry_after=None: False)
+    first = client.call_github_api('/repos/bench/repo-4')
+    fake_github.error_rate = 1.0
+    second, events = cache_events(lambda: client.call_github_api('/repos/bench/repo-4'))
+    assert second == first and events == {'stale': 1}
+    assert client.call_github_api('/repos/bench/repo-0') is None
+def test_http_session_is_shared_and_pooled(monkeypatch):
+    monkeypatch.setattr(client, '_http_session', None)
+    monkeypatch.setattr(config, 'HTTP_POOL_SIZE', None)
+    monkeypatch.setattr(config, 'MAX_WORKERS', 6)
+    session = client.get_http_session()
+    assert client.get_http_session() is session
+    adapter = session.get_adapter('https://api.github.com')
+    assert adapter._pool_maxsize == 18 and adapter.max_retries.total == 0
+    # 令牌由调度器按请求设置，不写入会话的通用请求头
+    assert 'Authorization' not in session.headers
+    monkeypatch.setattr(config, 'HTTP_POOL_SIZE', 3)
+    assert client.get_http_pool_size() == 3
+def test_requests_reuse_connections(fake_github):
+    connections = []
+    original = fake_github.server.get_request
+    def get_request():
+        request = original()
+        connections.append(request[1])
+        return request
+    fake_github.server.get_request = get_request
+    for i in range(5):
+        assert client.call_github_api(f'/repos/bench/repo-{i}')['name'] == f'repo-{i}'
+    # keep-alive：5 个请求复用同一个 TCP 连接
+    assert fake_github.snapshot()['requests'] == 5
+    assert len(connections) == 1
+def test_raw_readme_truncation_drops_partial_line():
+    data = client.build_raw_readme_data(b'line one\nline two\npart', True)
+    assert data['content'] == 'line one\nline two\n' and data['truncated']
+    assert data['sha'] == client.hashlib.sha1(b'line one\nline two\n').hexdigest()
+    assert client.build_raw_readme_data(b'whole\nfile', False)['content'] == 'whole\nfile'
+def test_readme_is_streamed_up_to_the_cap(fake_github, monkeypatch):
+    fake_github.readme_size = 256 * 1024
+    monkeypatch.setattr(config, 'README_MAX_BYTES', 4096)
+    content, sha = client.get_repository_readme_blob('bench', 'repo-1')
+    assert content.startswith('# repo-1') and len(content.encode('utf-8')) <= 4096 and content.endswith('\n')
+    full = fake_github.readme('repo-1')[0].encode('utf-8')
+    # 与 GraphQL / 本地检出读取的完整正文按相同规则截断，SHA 一致
+    assert client.build_readme_blob(full) == (content, sha)
+    cached = client.get_cache_store().get('/repos/bench/repo-1/readme')['data']
+    assert cached['encoding'] == 'raw' and cached['truncated'] and cached['content'] == content
+    monkeypatch.setattr(config, 'README_MAX_BYTES', 0)
+    assert client.build_readme_blob(full)[0] == full.decode('utf-8')
+def test_legacy_base64_readme_cache(fake_github):
+    store = client.get_cache_store()
+    store.set('/repos/bench/old/readme', {'encoding': 'base64', 'content': 'IyBPbGQK', 'sha': 'abc'}, None, None)
+    assert client.get_repository_readme_blob('bench', 'old') == ('# Old\n', 'abc')
@@ -0,0 +1,94 @@
+"""
+scripts/clone_tools.py：用本地裸仓库作为远程，验证子模块的添加、按记录检出与 --remote 更新
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GIT_ENV = {
+    'GIT_CONFIG_COUNT': '4',
+    'GIT_CONFIG_KEY_0': 'protocol.file.allow', 'GIT_CONFIG_VALUE_0': 'always',
+    'GIT_CONFIG_KEY_1': 'uploadpack.allowAnySHA1InWant', 'GIT_CONFIG_VALUE_1': 'true',
+    'GIT_CONFIG_KEY_2': 'user.name', 'GIT_CONFIG_VALUE_2': 'test',
+    'GIT_CONFIG_KEY_3': 'user.email', 'GIT_CONFIG_VALUE_3': 'test@example.com',
+    'GIT_TERMINAL_PROMPT': '0',
+}
+
+def git(cwd, *args) -> str:
+    result = subprocess.run(['git', *args], cwd=cwd, env={**os.environ, **GIT_ENV},
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+def commit_to_remote(tmp_path, name: str, message: str) -> str:
+    """
+    在远程裸仓库 remote/u/{name}.git 上追加一个提交，返回提交SHA
+    """
+    work = tmp_path / 'work' / name
+    if not work.exists():
+        git(tmp_path, 'clone', '-q', str(tmp_path / 'remote' / 'u' / f'{name}.git'), str(work))
+    (work / 'README.md').write_text(f'# {name}\n\n{message}\n', encoding='utf-8')
+    git(work, 'add', '-A')
+    git(work, 'commit', '-q', '-m', message)
+    git(work, 'push', '-q', 'origin', 'HEAD')
+    return git(work, 'rev-parse', 'HEAD')
+def run_clone_tools(project, *args) -> subprocess.CompletedProcess:
+    env = {**os.environ, **GIT_ENV, 'PYTHONPATH': ROOT_DIR}
+    return subprocess.run([sys.executable, str(project / 'scripts' / 'clone_tools.py'), *args],
+                          cwd=project, env=env, capture_output=True, text=True)
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    上层仓库（含 clone_tools.py 与 config.json）以及 A、B 两个远程仓库
+    """
+    for name in ('A', 'B'):
+        git(tmp_path, 'init', '-q', '--bare', str(tmp_path / 'remote' / 'u' / f'{name}.git'))
+        commit_to_remote(tmp_path, name, 'first')
+    project = tmp_path / 'sup'
+    (project / 'scripts').mkdir(parents=True)
+    shutil.copy(os.path.join(ROOT_DIR, 'scripts', 'clone_tools.py'), project / 'scripts')
+    (project / 'config.json').write_text(json.dumps({'github_username': 'u', 'repositories': ['A', 'B']}), encoding='utf-8')
+    git(project, 'init', '-q')
+    git(project, 'add', '-A')
+    git(project, 'commit', '-q', '-m', 'init')
+    return project
+
+def base_url(project) -> str:
+    return (project.parent / 'remote').as_uri()
+
+def test_adds_shallow_submodules(project):
+    result = run_clone_tools(project, '--base-url', base_url(project), '-j', '2')
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert git(project, 'config', '-f', '.gitmodules', 'submodule.tools/A.shallow') == 'true'
+    for name in ('A', 'B'):
+        assert (project / 'tools' / name / 'README.md').read_text(encoding='utf-8').startswith(f'# {name}')
+        assert git(project / 'tools' / name, 'rev-parse', '--is-shallow-repository') == 'true'
+    # .git 目录已移入上层仓库的 .git/modules
+    assert (project / '.git' / 'modules' / 'tools' / 'A').is_dir() and (project / 'tools' / 'A' / '.git').is_file()
+    assert '⏭️' in run_clone_tools(project, '--base-url', base_url(project)).stdout
+def test_checks_out_recorded_commits_and_updates_with_remote(project, tmp_path):
+    run_clone_tools(project, '--base-url', base_url(project))
+    git(project, 'commit', '-q', '-m', 'add submodules')
+    recorded = git(project, 'rev-parse', 'HEAD:tools/A')
+    newer = commit_to_remote(tmp_path, 'A', 'second')
+    checkout = tmp_path / 'checkout'
+    git(tmp_path, 'clone', '-q', str(project), str(checkout))
+    # 新克隆的上层仓库：--no-add 只初始化已登记的子模块，检出记录的提交而不是远程 HEAD
+    result = run_clone_tools(checkout, '--no-add', '--base-url', base_url(project))
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert git(checkout / 'tools' / 'A', 'rev-parse', 'HEAD') == recorded
+    assert git(checkout, 'status', '--porcelain') == ''
+    # --remote：更新到远程 HEAD 并暂存新的子模块指针
+    result = run_clone_tools(checkout, '--remote', '--base-url', base_url(project))
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert git(checkout / 'tools' / 'A', 'rev-parse', 'HEAD') == newer
+    assert git(checkout, 'diff', '--cached', '--name-only') == 'tools/A'
+def test_reports_failures(project):
+    (project / 'config.json').write_text(json.dumps({'github_username': 'u', 'repositories': ['A', 'Missing']}), encoding='utf-8')
+    result = run_clone_tools(project, '--base-url', base_url(project))
+    assert result.returncode == 1
+    assert '❌' in result.stdout and (project / 'tools' / 'A' / 'README.md').exists()
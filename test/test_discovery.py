@@ -0,0 +1,49 @@
+"""
+账号仓库发现：分页遍历、过滤与去重
+"""
+import pytest
+
+from toolbox import config, discovery
+from toolbox.discovery import discover_repositories, get_discovery_settings, repo_matches_filters
+
+@pytest.fixture
+def pages(fake_github, monkeypatch):
+    monkeypatch.setattr(discovery, 'DISCOVERY_PAGE_SIZE', 10)
+    fake_github.repos = 25
+    return fake_github
+
+def settings(**overrides):
+    return {**discovery.DEFAULT_DISCOVERY, 'users': ['bench'], **overrides}
+
+def test_settings_default_to_configured_user(monkeypatch):
+    monkeypatch.setattr(config, 'USERNAME', 'someone')
+    monkeypatch.setattr(config, 'DISCOVERY', {'enabled': True, 'exclude': ['old-*']})
+    result = get_discovery_settings()
+    assert result['users'] == ['someone'] and result['exclude'] == ['old-*'] and result['include'] == ['*']
+    monkeypatch.setattr(config, 'DISCOVERY', {'orgs': ['team']})
+    assert get_discovery_settings()['users'] == []
+def test_pages_until_short_page(pages):
+    items = discover_repositories(settings())
+    assert [item['name'] for item in items] == [f'repo-{i}' for i in range(25)]
+    assert pages.snapshot()['requests'] == 3
+def test_full_last_page_requests_one_more(pages):
+    pages.repos = 20
+    assert len(discover_repositories(settings())) == 20
+    assert pages.snapshot()['requests'] == 3
+def test_accounts_are_deduplicated(pages):
+    items = discover_repositories(settings(orgs=['bench'], include=['repo-1*']))
+    assert [item['name'] for item in items] == ['repo-1'] + [f'repo-1{i}' for i in range(10)]
+def test_failed_page_stops_account(pages, monkeypatch):
+    monkeypatch.setattr('toolbox.client.wait_before_retry', lambda attempt, retry_after=None: False)
+    pages.error_rate = 1.0
+    assert discover_repositories(settings()) == []
+def test_filters():
+    item = {'name': 'tool-cli', 'archived': False, 'fork': False, 'topics': ['cli']}
+    assert repo_matches_filters(item, settings())
+    assert not repo_matches_filters({**item, 'archived': True}, settings())
+    assert repo_matches_filters({**item, 'archived': True}, settings(include_archived=True))
+    assert not repo_matches_filters({**item, 'fork': True}, settings())
+    assert repo_matches_filters(item, settings(topics=['web', 'cli']))
+    assert not repo_matches_filters(item, settings(topics=['web']))
+    assert not repo_matches_filters(item, settings(include=['lib-*']))
+    assert not repo_matches_filters(item, settings(exclude=['*-cli']))
@@ -0,0 +1,63 @@
+"""
+README 描述提取
+"""
+from toolbox import extract
+from toolbox.extract import (
+    clean_description, dump_description_memo, extract_description_from_readme, find_readme_description,
+    iter_lines, load_description_memo,
+)
+
+def test_iter_lines_matches_split():
+    assert list(iter_lines("")) == []
+    assert list(iter_lines("a")) == ["a"]
+    assert list(iter_lines("a\nb")) == ["a", "b"]
+    assert list(iter_lines("\n\nc\n")) == ["", "", "c"]
+def test_keyword_paragraph_preferred_over_first_long_line():
+    readme = (
+        "# Tool\n\n"
+        "This first paragraph is long enough to be used as a fallback description.\n\n"
+        "这是一个用于批量处理图片与视频文件的命令行工具集合\n"
+    )
+    assert find_readme_description(readme) == "这是一个用于批量处理图片与视频文件的命令行工具集合"
+def test_keyword_found_far_below_fallback():
+    readme = (
+        "# Tool\n\n"
+        "This first paragraph is long enough to be used as a fallback description.\n"
+        + "- item\n" * 200
+        + "本项目是一个命令行工具集合，提供批量处理等常用功能\n"
+    )
+    assert find_readme_description(readme) == "本项目是一个命令行工具集合，提供批量处理等常用功能"
+def test_fallback_used_without_keywords():
+    readme = "# Tool\n\n![badge](x.svg)\n\nThis first paragraph is long enough to be used as a description.\n"
+    assert find_readme_description(readme) == "This first paragraph is long enough to be used as a description."
+def test_code_blocks_and_comments_are_skipped():
+    readme = (
+        "# Tool\n\n"
+        "```bash\n这是一个用于演示的代码块中的文字，不应该被选中作为描述\n```\n"
+        "<!--\n这是一个注释中的文字，提供了一些说明，不应该被选中\n-->\n"
+        "~~~~\n```\n这是一个嵌套围栏中的文字，提供了一些说明内容\n~~~~\n"
+        "Plain text that is long enough to become the fallback description.\n"
+    )
+    assert find_readme_description(readme) == "Plain text that is long enough to become the fallback description."
+def test_no_candidate_returns_none():
+    assert find_readme_description("# Title\n\nshort\n") is None
+def test_clean_description_strips_markdown_and_truncates():
+    assert clean_description("**Bold** [link](http://x) `code` *it* ![img](a.png)") == "Bold link code it "
+    assert clean_description("x" * 200) == "x" * 177 + "..."
+def test_extract_description_fallbacks():
+    assert extract_description_from_readme("", "repo") == "repo - 一个实用的开发工具项目"
+    assert extract_description_from_readme("# Title\n", "repo") == "repo 项目，提供实用的功能和工具"
+def test_memo_round_trip(monkeypatch):
+    monkeypatch.setattr(extract, '_description_memo', {})
+    readme = "# Tool\n\n这是一个用于测试记忆功能的小工具，提供README描述提取\n"
+    assert extract_description_from_readme(readme, "repo", "sha-1") == "这是一个用于测试记忆功能的小工具，提供README描述提取"
+    # 相同 SHA 直接使用记忆结果，不再解析内容
+    assert extract_description_from_readme("# Other\n", "repo", "sha-1") == "这是一个用于测试记忆功能的小工具，提供README描述提取"
+    dumped = dump_description_memo(["sha-1", "missing", None])
+    assert dumped == {'version': extract.DESCRIPTION_MEMO_VERSION, 'entries': {"sha-1": "这是一个用于测试记忆功能的小工具，提供README描述提取"}}
+
+    monkeypatch.setattr(extract, '_description_memo', {})
+    load_description_memo({'version': extract.DESCRIPTION_MEMO_VERSION - 1, 'entries': {"sha-1": "old"}})
+    assert extract._description_memo == {}
+    load_description_memo(dumped)
+    assert extract._description_memo == dumped['entries']
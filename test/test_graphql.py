@@ -0,0 +1,42 @@
+"""
+GraphQL 批量查询与节点转换
+"""
+from benchmarks.fake_github import build_graphql_node, build_languages, build_repo
+
+from toolbox import analysis, config
+from toolbox.graphql import build_graphql_batch_query, graphql_node_languages, graphql_node_readme, graphql_node_to_rest
+
+def test_batch_query_aliases_each_repository():
+    query = build_graphql_batch_query(3)
+    assert 'query($owner: String!, $n0: String!, $n1: String!, $n2: String!)' in query
+    for i in range(3):
+        assert f'r{i}: repository(owner: $owner, name: $n{i}) {{ ...RepoFields }}' in query
+    assert 'fragment RepoFields on Repository' in query
+def test_node_matches_rest_fields():
+    repo = build_repo('bench', 7)
+    node = build_graphql_node(repo, build_languages(7), '# readme', 'sha')
+    node['pullRequests'] = {'totalCount': 2}
+    rest = graphql_node_to_rest(node)
+    assert rest['stargazers_count'] == repo['stargazers_count']
+    # REST 的 watchers_count 与星标数相同，而不是关注者数
+    assert rest['watchers_count'] == repo['stargazers_count']
+    assert rest['open_issues_count'] == repo['open_issues_count'] + 2
+    assert rest['topics'] == repo['topics'] and rest['license'] == repo['license']
+    assert graphql_node_languages(node) == build_languages(7)
+    assert graphql_node_readme(node) == '# readme'
+def test_node_with_missing_fields():
+    rest = graphql_node_to_rest({'name': 'x', 'licenseInfo': None, 'primaryLanguage': None, 'repositoryTopics': None})
+    assert rest['license'] is None and rest['language'] is None and rest['topics'] == []
+    assert rest['open_issues_count'] == 0 and rest['watchers_count'] == 0
+    assert graphql_node_languages({'languages': None}) == {}
+    assert graphql_node_readme({'readmeMd': None, 'readmePlain': {'text': 'plain'}}) == 'plain'
+def test_repositories_are_fetched_in_batches(fake_github, monkeypatch):
+    monkeypatch.setattr(config, 'FETCH_BACKEND', 'graphql')
+    monkeypatch.setattr(config, 'GRAPHQL_BATCH_SIZE', 2)
+    names = ['repo-0', 'repo-1', 'missing', 'repo-3', 'repo-4']
+    records = analysis.analyze_repositories(names, 2)
+    assert fake_github.snapshot()['graphql'] == 3
+    assert fake_github.snapshot()['requests'] == 3  # README 与语言统计随批量查询返回，没有 REST 请求
+    assert [record.name if record else None for record in records] == ['repo-0', 'repo-1', None, 'repo-3', 'repo-4']
+    assert records[3].stars == build_repo('bench', 3)['stargazers_count']
+    assert records[3].language_bytes == build_languages(3)
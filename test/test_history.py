@@ -0,0 +1,56 @@
+"""
+快照历史与增长趋势
+"""
+import os
+from datetime import date
+
+from toolbox.history import HistoryStore, from_day, get_trends, load_rollup, record_snapshot, to_day
+from toolbox.records import RepositoryRecord
+
+def make_repo(name: str, stars: int, forks: int = 0) -> RepositoryRecord:
+    return RepositoryRecord(name, f"https://github.com/Owner/{name}", stars=stars, forks=forks, pushed_at="2026-01-01")
+
+def test_day_conversion():
+    assert from_day(to_day("2026-03-01")) == "2026-03-01"
+    assert to_day(date(2026, 3, 1)) == to_day("2026-03-01T12:00:00Z")
+def test_no_trends_before_first_snapshot(tmp_path):
+    path = str(tmp_path)
+    assert get_trends([make_repo("a", 1)], path, date(2026, 1, 1)) is None
+    record_snapshot([make_repo("a", 1)], path, date(2026, 1, 1))
+    # 同一天的快照还不能作为基准
+    assert get_trends([make_repo("a", 1)], path, date(2026, 1, 1)) is None
+def test_trends_from_snapshots(tmp_path):
+    path = str(tmp_path)
+    record_snapshot([make_repo("a", 10), make_repo("b", 5)], path, date(2026, 1, 1))
+    record_snapshot([make_repo("a", 12, 1), make_repo("b", 5)], path, date(2026, 1, 20))
+    trends = get_trends([make_repo("a", 15, 1), make_repo("b", 6)], path, date(2026, 1, 30))
+    assert trends['stars_7d'] == 3 + 1
+    assert trends['stars_30d'] == 5 + 1
+    assert trends['forks_30d'] == 1
+    assert [entry['name'] for entry in trends['fastest_growing']] == ["a", "b"]
+    # 当前数值与最近的快照不同，说明变化发生在当天
+    assert trends['last_changed'] == "2026-01-30"
+    # 只读：计算趋势不追加快照
+    assert HistoryStore(path).repo_series("owner/a")[-1]['stars'] == 12
+def test_trends_stable_between_runs(tmp_path):
+    path = str(tmp_path)
+    record_snapshot([make_repo("a", 10)], path, date(2026, 1, 1))
+    record_snapshot([make_repo("a", 12)], path, date(2026, 1, 5))
+    repositories = [make_repo("a", 12)]
+    first = get_trends(repositories, path, date(2026, 1, 6))
+    record_snapshot(repositories, path, date(2026, 1, 6))
+    assert get_trends(repositories, path, date(2026, 1, 7)) == first
+    assert first['last_changed'] == "2026-01-05"
+def test_unchanged_snapshot_does_not_rewrite(tmp_path):
+    path = str(tmp_path)
+    record_snapshot([make_repo("a", 10)], path, date(2026, 1, 1))
+    mtimes = {name: os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)}
+    sizes = {name: os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)}
+    record_snapshot([make_repo("a", 10)], path, date(2026, 1, 2))
+    assert {name: os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)} == sizes
+    assert {name: os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)} == mtimes
+def test_removed_repositories_are_pruned(tmp_path):
+    path = str(tmp_path)
+    record_snapshot([make_repo("a", 1), make_repo("b", 2)], path, date(2026, 1, 1))
+    record_snapshot([make_repo("a", 1)], path, date(2026, 1, 2))
+    assert list(load_rollup(path)['repos']) == ["owner/a"]
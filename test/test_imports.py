@@ -0,0 +1,43 @@
+"""
+toolbox 包导入时没有副作用：不发请求、不读写文件、不导入 requests
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    'toolbox', 'toolbox.config', 'toolbox.cache', 'toolbox.client', 'toolbox.graphql', 'toolbox.ratelimit',
+    'toolbox.retry', 'toolbox.discovery', 'toolbox.extract', 'toolbox.analysis', 'toolbox.render',
+    'toolbox.records', 'toolbox.language_stats', 'toolbox.incremental', 'toolbox.metrics', 'toolbox.search_index',
+    'toolbox.binary_index', 'toolbox.local', 'toolbox.refresh', 'toolbox.shards', 'toolbox.history',
+    'toolbox.webhook', 'toolbox.cli', 'generate_auto_descriptions',
+]
+PROBE = """
+import importlib, json, sys
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps({
+    'requests': 'requests' in sys.modules,
+    'numpy': 'numpy' in sys.modules,
+    'sqlite3': 'sqlite3' in sys.modules,
+    'threads': __import__('threading').active_count(),
+}))
+"""
+
+def test_import_has_no_side_effects(tmp_path):
+    env = {**os.environ, 'PYTHONPATH': ROOT_DIR, 'PYTHONDONTWRITEBYTECODE': '1'}
+    env.pop('GITHUB_TOKEN', None)
+    result = subprocess.run([sys.executable, '-c', PROBE, *MODULES], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stderr == ''
+    assert json.loads(result.stdout) == {'requests': False, 'numpy': False, 'sqlite3': False, 'threads': 1}
+    # 工作目录中没有创建缓存目录或任何输出文件
+    assert os.listdir(tmp_path) == []
+def test_entry_points_share_the_cli():
+    import generate_auto_descriptions
+    import toolbox
+    from toolbox import __main__, cli
+    assert generate_auto_descriptions.run is cli.run and __main__.run is cli.run
+    assert toolbox.__version__
@@ -0,0 +1,104 @@
+"""
+增量生成：清单读取、记录复用与按内容写入
+"""
+import io
+import json
+import os
+
+from benchmarks.fake_github import build_repo
+
+from toolbox import cli, config
+from toolbox.cli import run_analysis
+from toolbox.incremental import (
+    MANIFEST_VERSION, MatchingSink, get_repo_signature, load_manifest, reuse_manifest_record, write_if_changed,
+)
+from toolbox.records import RepositoryRecord
+
+ITEM = {'name': 'tool', 'pushed_at': '2025-01-02T00:00:00Z', 'updated_at': '2025-01-03T00:00:00Z',
+        'stargazers_count': 9, 'forks_count': 2, 'watchers_count': 9, 'open_issues_count': 1}
+
+def entry_for(record: RepositoryRecord, item=ITEM):
+    return {'signature': get_repo_signature(item), 'repository_info': record.to_dict()}
+
+def test_load_manifest_falls_back_to_empty(tmp_path):
+    empty = {'version': MANIFEST_VERSION, 'outputs': {}, 'repositories': {}}
+    path = tmp_path / 'manifest.json'
+    assert load_manifest(str(path)) == empty
+    path.write_text('{', encoding='utf-8')
+    assert load_manifest(str(path)) == empty
+    path.write_text(json.dumps({'version': MANIFEST_VERSION - 1, 'repositories': {'a': {}}}), encoding='utf-8')
+    assert load_manifest(str(path)) == empty
+    path.write_text(json.dumps({'version': MANIFEST_VERSION, 'repositories': {'a': {}}}), encoding='utf-8')
+    assert load_manifest(str(path)) == {'version': MANIFEST_VERSION, 'outputs': {}, 'repositories': {'a': {}}}
+def test_unchanged_repository_is_reused_with_fresh_counts():
+    record = RepositoryRecord('tool', 'https://github.com/u/tool', stars=3, forks=1, final_description='desc')
+    reused = reuse_manifest_record(entry_for(record), ITEM)
+    assert reused.final_description == 'desc'
+    assert (reused.stars, reused.forks, reused.watchers, reused.open_issues) == (9, 2, 9, 1)
+def test_changed_or_unknown_repository_is_not_reused():
+    entry = entry_for(RepositoryRecord('tool', 'https://github.com/u/tool'))
+    assert reuse_manifest_record(entry, {**ITEM, 'pushed_at': '2025-02-01T00:00:00Z'}) is None
+    assert reuse_manifest_record(entry, {**ITEM, 'updated_at': '2025-02-01T00:00:00Z'}) is None
+    assert reuse_manifest_record(entry, {**ITEM, 'pushed_at': None}) is None
+    assert reuse_manifest_record(entry, None) is None
+    assert reuse_manifest_record(None, ITEM) is None
+def test_matching_sink():
+    sink = MatchingSink(io.StringIO('abcdef'))
+    sink.write('abc')
+    sink.write('def')
+    assert sink.finish()
+    sink = MatchingSink(io.StringIO('abcdef'))
+    sink.write('abc')
+    assert not sink.finish()  # 现有文件更长
+    sink = MatchingSink(io.StringIO('abc'))
+    sink.write('abX')
+    assert not sink.finish()
+def test_write_if_changed_keeps_unchanged_files(tmp_path):
+    path = str(tmp_path / 'out.md')
+    outputs = {}
+    content = {'body': 'v1'}
+    def write(f, generated_at):
+        f.write(f"{content['body']} @ {generated_at.isoformat()}\n")
+    assert write_if_changed(path, write, outputs)
+    first_time = outputs[path]
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == f"v1 @ {first_time}\n"
+    os.utime(path, (0, 0))
+    # 内容不变：沿用上次的生成时间比较，不重写文件
+    assert not write_if_changed(path, write, outputs)
+    assert outputs[path] == first_time and os.stat(path).st_mtime == 0
+    content['body'] = 'v2'
+    assert write_if_changed(path, write, outputs)
+    with open(path, encoding='utf-8') as f:
+        assert f.read().startswith('v2 @ ')
+    # 文件被删除后重新生成
+    os.remove(path)
+    assert write_if_changed(path, write, outputs) and os.path.exists(path)
+def test_write_if_changed_binary(tmp_path):
+    path = str(tmp_path / 'out.bin')
+    outputs = {}
+    def write(f, generated_at):
+        f.write(b'\x00\x01payload')
+    assert write_if_changed(path, write, outputs, binary=True)
+    assert not write_if_changed(path, write, outputs, binary=True)
+def test_run_analysis_reanalyzes_only_changed_repositories(fake_github, monkeypatch):
+    monkeypatch.setattr(config, 'FETCH_BACKEND', 'rest')
+    monkeypatch.setattr(config, 'MAX_WORKERS', 2)
+    monkeypatch.setattr(config, 'REPO_LIST', ['repo-0', 'repo-1', 'repo-2'])
+    analyzed = []
+    original = cli.analyze_repositories
+    def spy(repo_names, max_workers):
+        analyzed.append(list(repo_names))
+        return original(repo_names, max_workers)
+    monkeypatch.setattr(cli, 'analyze_repositories', spy)
+    names, first, entries = run_analysis({'enabled': False}, {}, True)
+    assert names == ['repo-0', 'repo-1', 'repo-2'] and all(first)
+    assert sorted(entries) == ['bench/repo-0', 'bench/repo-1', 'bench/repo-2']
+    # 第二次运行：签名不变的仓库复用清单记录，只重新分析 repo-1
+    entries['bench/repo-1']['signature']['pushed_at'] = '2000-01-01T00:00:00Z'
+    _, second, new_entries = run_analysis({'enabled': False}, entries, True)
+    assert analyzed == [names, ['repo-1']]
+    assert [record.to_dict() for record in second] == [record.to_dict() for record in first]
+    assert new_entries['bench/repo-1']['signature'] == get_repo_signature(build_repo('bench', 1))
+    run_analysis({'enabled': False}, new_entries, True)
+    assert analyzed[-1] == []
@@ -0,0 +1,39 @@
+"""
+按字节数加权的语言统计（标准库实现与可选的 numpy 实现结果一致）
+"""
+import pytest
+
+from toolbox import language_stats
+from toolbox.language_stats import compute_language_distribution, format_language_distribution, merge_language_distributions
+
+BREAKDOWNS = [{'Go': 300, 'C': 100}, {'Python': 100, 'Go': 0}, {}, {'C': 100, 'Shell': 0}]
+EXPECTED = [
+    {'language': 'Go', 'bytes': 300, 'share': 0.5, 'repositories': 2, 'rank': 1},
+    {'language': 'C', 'bytes': 200, 'share': 0.3333, 'repositories': 2, 'rank': 2},
+    {'language': 'Python', 'bytes': 100, 'share': 0.1667, 'repositories': 1, 'rank': 3},
+]
+
+@pytest.fixture(params=['stdlib', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        monkeypatch.setattr(language_stats, '_numpy', pytest.importorskip('numpy'))
+    else:
+        monkeypatch.setattr(language_stats, '_numpy', None)
+    return request.param
+
+def test_distribution(backend):
+    assert compute_language_distribution(BREAKDOWNS) == EXPECTED
+def test_ties_ranked_by_name(backend):
+    distribution = compute_language_distribution([{'Rust': 10, 'Go': 10, 'C': 10}])
+    assert [entry['language'] for entry in distribution] == ['C', 'Go', 'Rust']
+def test_empty_and_zero(backend):
+    assert compute_language_distribution([]) == []
+    assert compute_language_distribution([{'Go': 0}, None]) == []
+def test_merge_matches_combined(backend):
+    merged = merge_language_distributions([
+        compute_language_distribution(BREAKDOWNS[:2]), compute_language_distribution(BREAKDOWNS[2:]),
+    ])
+    assert merged == EXPECTED
+def test_format_language_distribution():
+    text = format_language_distribution(EXPECTED, top=2)
+    assert 'Go' in text and 'C' in text and 'Python' not in text
@@ -0,0 +1,75 @@
+"""
+本地检出分析：语言字节统计与按 git tree 哈希缓存
+"""
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from toolbox import config, local
+from toolbox.cache import JsonFileCache
+
+def git(cwd, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+@pytest.fixture
+def checkout(tmp_path, monkeypatch):
+    repo = tmp_path / 'tools' / 'demo'
+    (repo / 'src' / 'node_modules').mkdir(parents=True)
+    (repo / 'README.md').write_text('# Demo\n\n' + 'A small demo tool used by the local backend tests. ' * 4, encoding='utf-8')
+    (repo / 'main.py').write_text('print("hello")\n' * 10, encoding='utf-8')
+    (repo / 'src' / 'app.js').write_text('console.log(1);\n', encoding='utf-8')
+    (repo / 'src' / 'node_modules' / 'dep.js').write_text('x' * 1000, encoding='utf-8')
+    (repo / 'Dockerfile').write_text('FROM python\n', encoding='utf-8')
+    git(repo, 'init', '-q')
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', 'init')
+    monkeypatch.setattr(config, 'LOCAL_TOOLS_DIR', str(tmp_path / 'tools'))
+    monkeypatch.setattr(config, 'README_MAX_BYTES', None)
+    store = JsonFileCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr(local, 'get_cache_store', lambda: store)
+    return repo
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+    original = local.read_local_readme
+    monkeypatch.setattr(local, 'read_local_readme', lambda root: calls.append(root) or original(root))
+    return calls
+
+def test_compute_language_bytes_skips_ignored_directories(checkout):
+    languages = local.compute_language_bytes(str(checkout))
+    assert languages == {'Python': 150, 'JavaScript': 16, 'Dockerfile': 12}
+    assert list(languages) == ['Python', 'JavaScript', 'Dockerfile']
+def test_walk_pool_is_shared(checkout):
+    pool = local.get_walk_executor()
+    assert local.get_walk_executor() is pool
+    with ThreadPoolExecutor(max_workers=2) as other:
+        assert local.compute_language_bytes(str(checkout), other) == local.compute_language_bytes(str(checkout))
+def test_missing_checkout_returns_none(checkout):
+    assert local.load_local_repository('absent') is None
+def test_clean_tree_is_cached_by_tree_hash(checkout, scans):
+    first = local.load_local_repository('demo')
+    assert first['readme'].startswith('# Demo') and first['readme_sha']
+    assert local.load_local_repository('demo') == first
+    assert len(scans) == 1
+    # 新提交改变 tree 哈希，重新统计
+    (checkout / 'extra.go').write_text('package main\n', encoding='utf-8')
+    git(checkout, 'add', '-A')
+    git(checkout, 'commit', '-q', '-m', 'go')
+    assert local.load_local_repository('demo')['languages']['Go'] == 13
+    assert len(scans) == 2
+def test_dirty_tree_is_not_cached(checkout, scans):
+    (checkout / 'main.py').write_text('print("changed")\n', encoding='utf-8')
+    assert local.get_tree_hash(str(checkout)) is None
+    local.load_local_repository('demo')
+    local.load_local_repository('demo')
+    assert len(scans) == 2
+def test_cache_key_includes_readme_limit(checkout, scans, monkeypatch):
+    full = local.load_local_repository('demo')
+    monkeypatch.setattr(config, 'README_MAX_BYTES', 16)
+    capped = local.load_local_repository('demo')
+    assert len(scans) == 2
+    assert len(capped['readme']) <= 16 and full['readme'].startswith(capped['readme'])
+    assert capped['readme_sha'] != full['readme_sha']
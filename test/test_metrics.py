@@ -0,0 +1,71 @@
+"""
+运行指标：阶段耗时、端点延迟统计、写入耗时拆分与性能采样
+"""
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from toolbox import client
+from toolbox.metrics import METRICS, MetricsCollector, Profiler, summarize_latencies, timed_writer, write_metrics
+
+@pytest.fixture
+def metrics():
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+
+def test_summarize_latencies():
+    summary = summarize_latencies([5.0, 30.0, 20.0, 12000.0], {'200': 3, '502': 1})
+    assert summary['count'] == 4 and summary['min_ms'] == 5.0 and summary['max_ms'] == 12000.0
+    assert summary['p50_ms'] == 30.0 and summary['p95_ms'] == 12000.0
+    assert summary['histogram']['<=10ms'] == 1 and summary['histogram']['<=25ms'] == 1
+    assert summary['histogram']['<=50ms'] == 1 and summary['histogram']['>10000ms'] == 1
+    assert sum(summary['histogram'].values()) == 4
+def test_collector_report():
+    collector = MetricsCollector()
+    with collector.phase('analyze'):
+        pass
+    collector.record_request('info', 0.05, 200, 1000)
+    collector.record_request('info', 0.15, None)
+    collector.record_request('readme', 0.01, 304)
+    collector.count('retries', 2)
+    report = collector.report({'miss': 3})
+    assert report['phases']['analyze']['count'] == 1
+    assert report['phases']['fetch'] == {'seconds': 0.21, 'count': 3}
+    assert report['endpoints']['info']['status'] == {'200': 1, 'no_response': 1}
+    assert report['endpoints']['readme']['count'] == 1
+    assert report['requests']['requests'] == 3 and report['requests']['bytes_downloaded'] == 1000
+    assert report['requests']['retries'] == 2 and report['cache'] == {'miss': 3}
+    json.dumps(report)
+def test_timed_writer_splits_render_and_write(metrics):
+    def write(sink, generated_at):
+        sink.write('a')
+        sink.write('b')
+    sink = io.StringIO()
+    timed_writer(write)(sink, datetime.now())
+    assert sink.getvalue() == 'ab'
+    assert set(metrics.report()['phases']) == {'render', 'write'}
+def test_requests_are_recorded_per_endpoint_class(fake_github, metrics):
+    client.call_github_api('/repos/bench/repo-0')
+    client.call_github_api('/repos/bench/repo-0/languages')
+    client.call_github_api('/repos/bench/missing')
+    report = metrics.report()
+    assert report['endpoints']['info']['status'] == {'200': 1, '404': 1}
+    assert report['endpoints']['languages']['count'] == 1
+    assert report['requests']['requests'] == 3 and report['requests']['bytes_downloaded'] > 0
+def test_write_metrics_with_profile(tmp_path, metrics):
+    profiler = Profiler('all', str(tmp_path / 'run.prof'))
+    profiler.start()
+    sorted(str(i) for i in range(1000))
+    profile = profiler.stop()
+    assert (tmp_path / 'run.prof').exists() and profile['cpu']['top_cumulative']
+    assert profile['memory']['peak_bytes'] > 0
+    path = tmp_path / 'metrics.json'
+    write_metrics(str(path), {'cached': 1}, profile)
+    report = json.loads(path.read_text(encoding='utf-8'))
+    assert report['cache'] == {'cached': 1} and set(report['profile']) == {'cpu', 'memory'}
+    # 未启用采样时报告中没有 profile
+    write_metrics(str(path), None, Profiler(None).stop())
+    assert 'profile' not in json.loads(path.read_text(encoding='utf-8'))
@@ -0,0 +1,75 @@
+"""
+多令牌速率限制调度
+"""
+import pytest
+
+from toolbox import ratelimit
+from toolbox.ratelimit import RateLimitScheduler, mask_token
+
+class FakeClock:
+    """
+    替换 time.time / time.sleep：sleep 只推进时间并记录
+    """
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, 'time', clock.time)
+    monkeypatch.setattr(ratelimit.time, 'sleep', clock.sleep)
+    return clock
+
+def headers(remaining: int, reset_at: float, limit: int = 5000):
+    return {'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Limit': str(limit), 'X-RateLimit-Reset': str(reset_at)}
+
+def test_no_tokens_returns_none(clock):
+    assert RateLimitScheduler([]).acquire() is None
+    assert clock.sleeps == []
+def test_prefers_token_with_most_remaining(clock):
+    scheduler = RateLimitScheduler(['token-a', 'token-b'], reserve=0)
+    scheduler.update('token-a', headers(100, clock.now + 600))
+    scheduler.update('token-b', headers(4000, clock.now + 600))
+    assert scheduler.acquire() == 'token-b'
+    # 各资源的额度分开记录：graphql 尚无额度信息，两个令牌都可用
+    assert scheduler.acquire('graphql') in ('token-a', 'token-b')
+def test_reserve_is_not_spent(clock):
+    scheduler = RateLimitScheduler(['token-a', 'token-b'], reserve=10, max_wait=0)
+    scheduler.update('token-a', headers(10, clock.now + 600))
+    scheduler.update('token-b', headers(11, clock.now + 600))
+    assert scheduler.acquire() == 'token-b'
+    # token-b 预先扣减到 10，两个令牌都只剩保留额度
+    assert scheduler.acquire() is None
+def test_waits_for_earliest_reset(clock):
+    scheduler = RateLimitScheduler(['token-a', 'token-b'], reserve=0, max_wait=120)
+    scheduler.mark_exhausted('token-a', 'core', clock.now + 90)
+    scheduler.mark_exhausted('token-b', 'core', clock.now + 30)
+    assert scheduler.acquire() == 'token-b'
+    assert clock.sleeps == [31]
+def test_per_call_max_wait_caps_the_wait(clock):
+    scheduler = RateLimitScheduler(['token-a'], reserve=0, max_wait=3600)
+    scheduler.mark_exhausted('token-a', 'core', clock.now + 60)
+    assert scheduler.acquire(max_wait=10) is None
+    assert scheduler.acquire(max_wait=-5) is None
+    assert clock.sleeps == []
+def test_paces_requests_when_budget_is_low(clock):
+    scheduler = RateLimitScheduler(['token-a'], reserve=0)
+    scheduler.update('token-a', headers(100, clock.now + 100))
+    assert scheduler.acquire() == 'token-a'
+    # 预先扣减后剩余 99 次、100 秒后重置：把剩余时间均分给剩余额度
+    assert scheduler.acquire() == 'token-a'
+    assert clock.sleeps == [pytest.approx(100 / 99)]
+def test_summary_masks_tokens(clock):
+    scheduler = RateLimitScheduler(['ghp_abcdefghijkl'])
+    scheduler.update('ghp_abcdefghijkl', headers(42, clock.now + 60))
+    assert mask_token('ghp_abcdefghijkl') == 'ghp_…ijkl'
+    [line] = scheduler.summary()
+    assert 'ghp_…ijkl' in line and '42/5000' in line and 'abcdefgh' not in line
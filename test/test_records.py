@@ -0,0 +1,51 @@
+"""
+仓库记录与汇总统计
+"""
+import pytest
+
+from toolbox.records import REPOSITORY_FIELDS, RepositoryRecord, as_records, compute_statistics
+
+def make_repo(name: str, **fields) -> RepositoryRecord:
+    return RepositoryRecord(name, f"https://github.com/owner/{name}", **fields)
+
+def test_defaults_and_unknown_fields():
+    repo = make_repo("a")
+    assert repo.stars == 0 and repo.language == '多种语言' and repo.readme_sha is None
+    # 容器字段每条记录单独创建
+    repo.topics.append("x")
+    assert make_repo("b").topics == []
+    with pytest.raises(TypeError):
+        make_repo("c", unknown=1)
+def test_dict_round_trip():
+    repo = make_repo("a", stars=3, topics=["cli"], language_bytes={"Go": 10}, readme_sha="abc")
+    data = repo.to_dict()
+    assert list(data) == list(REPOSITORY_FIELDS)
+    assert RepositoryRecord.from_dict(data) == repo
+    # 未知字段忽略，缺少名称或链接时返回None
+    assert RepositoryRecord.from_dict({**data, "extra": 1}) == repo
+    assert RepositoryRecord.from_dict({"name": "a"}) is None
+    assert RepositoryRecord.from_dict(None) is None
+def test_as_records_accepts_mappings():
+    repo = make_repo("a", stars=1)
+    records = as_records([repo, {"name": "b", "url": "https://github.com/owner/b"}, {"name": "missing-url"}])
+    assert records[0] is repo
+    assert [record.name for record in records] == ["a", "b"]
+def test_compute_statistics():
+    stats = compute_statistics([
+        make_repo("a", stars=5, forks=1, open_issues=2, language="Go", languages=["Go", "C"],
+                  language_bytes={"Go": 300, "C": 100}, topics=["x", "y"], license="MIT", has_wiki=True),
+        make_repo("b", stars=2, forks=3, language="Go", languages=["Go"], language_bytes={"Go": 100}),
+        make_repo("c", has_pages=True),
+    ])
+    assert (stats.total_repos, stats.total_stars, stats.total_forks, stats.total_issues) == (3, 7, 4, 2)
+    assert stats.unique_languages == ["C", "Go"]
+    assert stats.primary_languages == ["Go", "多种语言"]
+    assert stats.language_counts == {"Go": 2}
+    assert (stats.with_wiki, stats.with_pages, stats.with_license) == (1, 1, 1)
+    assert stats.average_topics == pytest.approx(2 / 3)
+    assert [(entry['language'], entry['bytes'], entry['repositories']) for entry in stats.language_distribution] == [
+        ("Go", 400, 2), ("C", 100, 1),
+    ]
+def test_compute_statistics_empty():
+    stats = compute_statistics([])
+    assert stats.total_repos == 0 and stats.average_topics == 0 and stats.language_distribution == []
@@ -0,0 +1,53 @@
+"""
+stale-while-revalidate：过期缓存的标记与限时后台刷新
+"""
+import time
+
+import pytest
+
+from toolbox import config
+from toolbox.cache import get_cache_store, pop_stale_endpoints
+from toolbox.client import call_github_api
+from toolbox.refresh import BackgroundRefresh, get_endpoint_repo
+
+@pytest.fixture
+def stale(fake_github, monkeypatch):
+    """
+    缓存 repo-0 / repo-1 的信息后让其全部过期，并切换到 stale-while-revalidate 模式
+    """
+    for name in ('repo-0', 'repo-1'):
+        call_github_api(f'/repos/bench/{name}')
+    monkeypatch.setattr(config, 'CACHE_TTL', {'info': 0})
+    monkeypatch.setattr(config, 'CACHE_MODE', 'stale-while-revalidate')
+    pop_stale_endpoints()
+    fake_github.reset_stats()
+    return fake_github
+
+def test_get_endpoint_repo():
+    assert get_endpoint_repo('/repos/Owner/Tool/readme') == 'tool'
+    assert get_endpoint_repo('/repos/owner/tool?x=1') == 'tool'
+    assert get_endpoint_repo('/users/owner/repos') is None
+def test_stale_entries_are_served_and_marked(stale):
+    assert call_github_api('/repos/bench/repo-0')['name'] == 'repo-0'
+    assert call_github_api('/repos/bench/repo-1')['name'] == 'repo-1'
+    assert stale.snapshot()['requests'] == 0
+    assert pop_stale_endpoints() == ['/repos/bench/repo-0', '/repos/bench/repo-1']
+    assert pop_stale_endpoints() == []
+def test_refresh_reports_changed_repositories(stale, monkeypatch):
+    monkeypatch.setattr('benchmarks.fake_github.build_repo', lambda owner, index: {'name': f'repo-{index}', 'index': index})
+    # 只让 repo-1 的数据变化：repo-0 的缓存改写成服务器当前返回的内容（仍然过期）
+    get_cache_store().set('/repos/bench/repo-0', {'name': 'repo-0', 'index': 0}, None, None)
+    result = BackgroundRefresh(['/repos/bench/repo-0', '/repos/bench/repo-1'], budget=10, max_workers=2).wait()
+    assert result == {'changed': {'repo-1'}, 'pending': set()}
+    assert stale.snapshot()['requests'] == 2
+    assert get_cache_store().get('/repos/bench/repo-1')['data'] == {'name': 'repo-1', 'index': 1}
+def test_refresh_stops_at_the_budget(stale):
+    stale.latency = 3.0
+    started = time.monotonic()
+    result = BackgroundRefresh(['/repos/bench/repo-0', '/repos/bench/repo-1'], budget=0.3, max_workers=1).wait()
+    assert time.monotonic() - started < 1.5
+    assert result == {'changed': set(), 'pending': {'repo-0', 'repo-1'}}
+def test_zero_budget_refreshes_nothing(stale):
+    result = BackgroundRefresh(['/repos/bench/repo-0'], budget=0, max_workers=1).wait()
+    assert result == {'changed': set(), 'pending': {'repo-0'}}
+    assert stale.snapshot()['requests'] == 0
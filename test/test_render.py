@@ -0,0 +1,34 @@
+"""
+README 与 JSON 索引的生成
+"""
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from toolbox.records import RepositoryRecord
+from toolbox.render import generate_index_content, generate_index_data, generate_readme_content, write_index
+
+GENERATED_AT = datetime(2026, 1, 1, 8, 0, 0)
+
+def make_repositories(count: int):
+    return [
+        RepositoryRecord(f"repo-{i}", f"https://github.com/o/repo-{i}", stars=i, topics=["cli"] if i % 2 else [],
+                         language="Go", languages=["Go"], language_bytes={"Go": 10 * (i + 1)},
+                         final_description=f"描述 {i}\n\"引号\"", updated_at=f"2025-01-0{i + 1}")
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize('count', [0, 1, 3])
+def test_streamed_index_matches_json_dump(count):
+    repositories = make_repositories(count)
+    sink = io.StringIO()
+    write_index(repositories, sink, GENERATED_AT)
+    assert sink.getvalue() == generate_index_content(repositories, GENERATED_AT)
+    assert json.loads(sink.getvalue()) == generate_index_data(repositories, GENERATED_AT)
+def test_render_accepts_dicts():
+    repositories = make_repositories(3)
+    dicts = [repo.to_dict() for repo in repositories]
+    assert generate_readme_content(dicts, GENERATED_AT) == generate_readme_content(repositories, GENERATED_AT)
+    assert generate_index_content(dicts, GENERATED_AT) == generate_index_content(repositories, GENERATED_AT)
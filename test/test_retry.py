@@ -0,0 +1,83 @@
+"""
+重试退避与断路器
+"""
+import pytest
+
+from toolbox import config, retry
+from toolbox.retry import CircuitBreaker, get_backoff_delay, get_retry_after, is_retryable, is_secondary_rate_limit
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry.time, 'monotonic', clock)
+    return clock
+
+def test_retry_after_parsing():
+    assert get_retry_after(FakeResponse(429, {'Retry-After': '12'})) == 12.0
+    assert get_retry_after(FakeResponse(429, {'Retry-After': 'Thu, 01 Jan 1970 00:00:00 GMT'})) == 0.0
+    assert get_retry_after(FakeResponse(429, {'Retry-After': 'soon'})) is None
+    assert get_retry_after(FakeResponse(429)) is None
+def test_retryable_responses():
+    assert is_retryable(FakeResponse(503)) and is_retryable(FakeResponse(429))
+    assert is_secondary_rate_limit(FakeResponse(403, {'Retry-After': '5'}))
+    assert is_secondary_rate_limit(FakeResponse(403), '{"message": "You have exceeded a secondary rate limit"}')
+    # 权限不足的 403 与流式响应未读取正文时不重试
+    assert not is_retryable(FakeResponse(403), '{"message": "Resource not accessible"}')
+    assert not is_retryable(FakeResponse(403))
+    assert not is_retryable(FakeResponse(404))
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(10):
+        delay = get_backoff_delay(attempt)
+        upper = min(retry.RETRY_MAX_DELAY, retry.RETRY_BASE_DELAY * 2 ** attempt)
+        assert upper / 2 <= delay <= upper
+def test_wait_before_retry_respects_max_wait(monkeypatch):
+    monkeypatch.setattr(config, 'RETRY_MAX_WAIT', 5)
+    sleeps = []
+    monkeypatch.setattr(retry.time, 'sleep', sleeps.append)
+    assert not retry.wait_before_retry(0, retry_after=60)
+    assert retry.wait_before_retry(0, retry_after=1)
+    assert len(sleeps) == 1 and 1 <= sleeps[0] <= 1 + retry.RETRY_BASE_DELAY
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=30)
+    for _ in range(2):
+        breaker.record_failure('readme')
+    assert breaker.allow('readme')
+    breaker.record_failure('readme')
+    assert not breaker.allow('readme')
+    # 各端点类别相互独立
+    assert breaker.allow('info')
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=30)
+    breaker.record_failure('info')
+    breaker.record_success('info')
+    breaker.record_failure('info')
+    assert breaker.allow('info')
+def test_breaker_half_open_probe(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure('graphql')
+    clock.now += 29
+    assert not breaker.allow('graphql')
+    clock.now += 1
+    # 冷却结束后只放行一个试探请求
+    assert breaker.allow('graphql')
+    assert not breaker.allow('graphql')
+    # 试探失败重新计时，成功则关闭
+    breaker.record_failure('graphql')
+    clock.now += 15
+    assert not breaker.allow('graphql')
+    clock.now += 15
+    assert breaker.allow('graphql')
+    breaker.record_success('graphql')
+    assert breaker.allow('graphql') and breaker.allow('graphql')
@@ -0,0 +1,50 @@
+"""
+检索索引的写入与查询
+"""
+from datetime import datetime
+
+import pytest
+
+from toolbox.records import RepositoryRecord
+from toolbox.render import generate_index_entry
+from toolbox.search_index import SearchIndex, tokenize_name, write_search_index
+
+REPOSITORIES = [
+    RepositoryRecord("NodeWeb", "https://github.com/o/NodeWeb", stars=5, language="JavaScript",
+                     topics=["web", "cli"], license="MIT License", updated_at="2025-01-03"),
+    RepositoryRecord("CustomNode", "https://github.com/o/CustomNode", stars=9, language="Python",
+                     topics=["cli"], updated_at="2025-01-01"),
+    RepositoryRecord("50DayChallenge", "https://github.com/o/50DayChallenge", stars=1, language="Python",
+                     topics=["web"], license="MIT License", updated_at="2025-01-02"),
+]
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / "tools_index.search.jsonl"
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        write_search_index(REPOSITORIES, f, datetime(2026, 1, 1))
+    return path
+
+def test_tokenize_name():
+    assert tokenize_name("CustomNode") == ["customnode", "custom", "node"]
+    assert tokenize_name("50DayChallenge") == ["50daychallenge", "50", "day", "challenge"]
+def test_records_ordered_by_stars(index_path):
+    with SearchIndex.open(str(index_path)) as index:
+        assert len(index) == 3
+        assert [index.record(i)['name'] for i in range(3)] == ["CustomNode", "NodeWeb", "50DayChallenge"]
+        assert index.get("nodeweb") == generate_index_entry(REPOSITORIES[0])
+        assert index.get("missing") is None
+def test_query_filters_and_sorts(index_path):
+    with SearchIndex.open(str(index_path)) as index:
+        names = lambda records: [record['name'] for record in records]
+        assert names(index.query(language="python")) == ["CustomNode", "50DayChallenge"]
+        assert names(index.query(topic=["web", "cli"])) == ["NodeWeb"]
+        assert names(index.query(license="MIT License", sort="updated_at")) == ["NodeWeb", "50DayChallenge"]
+        assert names(index.query(text="node", limit=1)) == ["CustomNode"]
+        assert names(index.query(sort="updated_at", limit=None)) == ["NodeWeb", "50DayChallenge", "CustomNode"]
+        assert index.query(language="Go") == []
+        assert "cli" in index.terms("topic")
+        with pytest.raises(ValueError):
+            index.query(sort="name")
+        with pytest.raises(ValueError):
+            index.terms("owner")
@@ -0,0 +1,85 @@
+"""
+多账号分片：索引合并与合并运行（命令行在子进程中运行，避免修改本进程的全局配置）
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from toolbox.binary_index import BinaryIndex
+from toolbox.records import RepositoryRecord
+from toolbox.render import write_index
+from toolbox.shards import merge_index_data, merged_index_records
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN = 'ghp_' + '0' * 36  # 通过 check_tokens 的格式检查
+
+def shard_index(*repositories: RepositoryRecord) -> dict:
+    sink = io.StringIO()
+    write_index(list(repositories), sink, datetime(2025, 1, 1))
+    return json.loads(sink.getvalue())
+def record(name: str, stars: int, language: str, size: int) -> RepositoryRecord:
+    return RepositoryRecord(name, f'https://github.com/x/{name}', stars=stars, forks=1, language=language,
+                            language_bytes={language: size}, final_description=f'{name} 的描述')
+
+SHARDS = [
+    ('alice', shard_index(record('tool-a', 5, 'Python', 300), record('tool-b', 1, 'Go', 100))),
+    ('bob', shard_index(record('tool-c', 7, 'Go', 500))),
+]
+
+def run_cli(cwd, *args, env=None) -> subprocess.CompletedProcess:
+    env = {**os.environ, 'PYTHONPATH': ROOT_DIR, **(env or {})}
+    return subprocess.run([sys.executable, '-m', 'toolbox', *args], cwd=cwd, env=env, capture_output=True, text=True)
+def write_config(path, accounts):
+    path.write_text(json.dumps({'accounts': accounts, 'incremental': False, 'history_dir': False}), encoding='utf-8')
+
+def test_merge_index_data():
+    merged = merge_index_data(SHARDS, datetime(2025, 2, 1))
+    assert merged['metadata']['usernames'] == ['alice', 'bob']
+    assert merged['metadata']['total_repositories'] == 3
+    assert [shard['total_repositories'] for shard in merged['metadata']['shards']] == [2, 1]
+    assert [(repo['name'], repo['owner']) for repo in merged['repositories']] == [
+        ('tool-a', 'alice'), ('tool-b', 'alice'), ('tool-c', 'bob')]
+    statistics = merged['statistics']
+    assert (statistics['total_stars'], statistics['total_forks']) == (13, 3)
+    assert statistics['languages'] == ['Go', 'Python']
+    # 语言分布按合并后的字节数重新排名：Go 600，Python 300
+    assert [entry['language'] for entry in statistics['language_distribution']] == ['Go', 'Python']
+def test_merged_index_records():
+    merged = merge_index_data(SHARDS)
+    repositories, stats = merged_index_records(merged)
+    assert [repo.name for repo in repositories] == ['tool-a', 'tool-b', 'tool-c']
+    assert repositories[2].final_description == 'tool-c 的描述'
+    assert stats.total_stars == 13 and stats.language_distribution == merged['statistics']['language_distribution']
+def test_merge_only_writes_top_level_outputs(tmp_path):
+    write_config(tmp_path / 'config.json', [{'username': 'alice'}, {'username': 'bob'}, {'username': 'carol'}])
+    for username, index in SHARDS:
+        (tmp_path / 'accounts' / username).mkdir(parents=True)
+        (tmp_path / 'accounts' / username / 'tools_index.json').write_text(json.dumps(index), encoding='utf-8')
+    result = run_cli(tmp_path, '--merge-only')
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert '跳过分片 carol' in result.stdout
+    index = json.loads((tmp_path / 'tools_index.json').read_text(encoding='utf-8'))
+    assert [repo['owner'] for repo in index['repositories']] == ['alice', 'alice', 'bob']
+    assert 'tool-c' in (tmp_path / 'README.md').read_text(encoding='utf-8')
+    assert (tmp_path / 'tools_index.search.jsonl').exists()
+    with BinaryIndex.open(str(tmp_path / 'tools_index.bin')) as binary:
+        assert len(binary) == 3
+    metrics = json.loads((tmp_path / 'toolbox_metrics.json').read_text(encoding='utf-8'))
+    assert 'output' in metrics['phases']
+def test_failed_merge_still_writes_metrics(tmp_path):
+    write_config(tmp_path / 'config.json', [{'username': 'alice'}])
+    result = run_cli(tmp_path, '--merge-only', '--metrics', 'metrics.json')
+    assert result.returncode == 1
+    assert json.loads((tmp_path / 'metrics.json').read_text(encoding='utf-8'))['version'] == 1
+def test_shards_run_in_separate_directories(tmp_path, fake_github):
+    write_config(tmp_path / 'config.json', [{'username': 'bench', 'repositories': ['repo-0', 'repo-1']}])
+    result = run_cli(tmp_path, env={'GITHUB_API_URL': fake_github.url, 'GITHUB_TOKEN': TOKEN})
+    assert result.returncode == 0, result.stdout + result.stderr
+    shard = json.loads((tmp_path / 'accounts' / 'bench' / 'tools_index.json').read_text(encoding='utf-8'))
+    assert [repo['name'] for repo in shard['repositories']] == ['repo-0', 'repo-1']
+    merged = json.loads((tmp_path / 'tools_index.json').read_text(encoding='utf-8'))
+    assert [repo['owner'] for repo in merged['repositories']] == ['bench', 'bench']
+    assert (tmp_path / 'accounts' / 'bench' / 'generate.log').exists()
@@ -23,6 +23,7 @@ load_env_file()
 
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 USERNAME = os.getenv('GITHUB_USERNAME')
+API_BASE_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
 
 if not GITHUB_TOKEN:
     print("❌ 错误：未在环境变量中找到 GITHUB_TOKEN。")
@@ -31,15 +32,18 @@ if not GITHUB_TOKEN:
 print(f"🧪 开始测试令牌，用户: {USERNAME}")
 print("-" * 40)
 
-# 测试1: 获取当前用户信息 (验证令牌基础有效性)
-url = "https://api.github.com/user"
-headers = {
+# 两次测试共用一个会话，复用同一个连接
+session = requests.Session()
+session.headers.update({
     'Authorization': f'token {GITHUB_TOKEN}',
     'Accept': 'application/vnd.github.v3+json'
-}
+})
+
+# 测试1: 获取当前用户信息 (验证令牌基础有效性)
+url = f"{API_BASE_URL}/user"
 
 try:
-    response = requests.get(url, headers=headers, timeout=10)
+    response = session.get(url, timeout=10)
     print(f"1. 测试用户API... 状态码: {response.status_code}")
     
     if response.status_code == 200:
@@ -65,9 +69,9 @@ print("-" * 40)
 
 # 测试2: 尝试获取一个具体仓库信息（例如你自己的Toolbox仓库）
 test_repo = "Toolbox"  # 测试你自己的一个公开仓库
-url = f"https://api.github.com/repos/{USERNAME}/{test_repo}"
+url = f"{API_BASE_URL}/repos/{USERNAME}/{test_repo}"
 try:
-    response = requests.get(url, headers=headers, timeout=10)
+    response = session.get(url, timeout=10)
     print(f"2. 测试仓库API ({USERNAME}/{test_repo})... 状态码: {response.status_code}")
     
     if response.status_code == 200:
@@ -0,0 +1,82 @@
+"""
+webhook 签名校验与事件解析
+"""
+import json
+import socket
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from toolbox.webhook import get_event_repo, load_recorded_payload, make_handler, sign_payload, verify_signature
+
+SECRET = "It's a Secret to Everybody"
+BODY = b"Hello, World!"
+
+def test_sign_payload_matches_github_example():
+    # GitHub 文档中的示例签名
+    assert sign_payload(SECRET, BODY) == 'sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17'
+def test_verify_signature():
+    signature = sign_payload(SECRET, BODY)
+    assert verify_signature(SECRET, BODY, signature)
+    assert not verify_signature(SECRET, BODY + b"!", signature)
+    assert not verify_signature("other", BODY, signature)
+    assert not verify_signature(SECRET, BODY, None)
+    assert not verify_signature(SECRET, BODY, "")
+    assert not verify_signature(SECRET, BODY, signature.replace('sha256=', 'sha1='))
+def test_get_event_repo():
+    payload = {'action': 'edited', 'repository': {'full_name': 'Owner/Repo'}}
+    assert get_event_repo('push', payload) == 'owner/repo'
+    assert get_event_repo('repository', payload) == 'owner/repo'
+    assert get_event_repo('repository', {**payload, 'action': 'deleted'}) is None
+    assert get_event_repo('issues', payload) is None
+    assert get_event_repo('push', {'repository': {'full_name': 'no-slash'}}) is None
+    assert get_event_repo('push', []) is None
+def test_load_recorded_payload(tmp_path):
+    recorded = tmp_path / "recorded.json"
+    recorded.write_text(json.dumps({'event': 'star', 'delivery': 'd1', 'payload': {'a': 1}}), encoding='utf-8')
+    assert load_recorded_payload(str(recorded)) == ('star', {'a': 1})
+    assert load_recorded_payload(str(recorded), 'push') == ('push', {'a': 1})
+    raw = tmp_path / "raw.json"
+    raw.write_text(json.dumps({'a': 1}), encoding='utf-8')
+    assert load_recorded_payload(str(raw), 'push') == ('push', {'a': 1})
+    with pytest.raises(ValueError):
+        load_recorded_payload(str(raw))
+
+class FakeUpdater:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, key, repository):
+        self.submitted.append(key)
+
+@pytest.fixture
+def receiver():
+    updater = FakeUpdater()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(updater, SECRET, None))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address, updater
+    server.shutdown()
+    server.server_close()
+
+def post(address, headers: str, body: bytes = b'') -> int:
+    with socket.create_connection(address, timeout=5) as conn:
+        conn.sendall(f"POST / HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode('ascii') + body)
+        status_line = conn.makefile('rb').readline()
+    return int(status_line.split()[1])
+
+def test_receiver_rejects_invalid_content_length(receiver):
+    address, updater = receiver
+    assert post(address, "Content-Length: abc\r\n") == 400
+    assert post(address, "Content-Length: 0\r\n") == 400
+    assert post(address, "Content-Length: 999999999\r\n") == 413
+    assert updater.submitted == []
+def test_receiver_queues_signed_event(receiver):
+    address, updater = receiver
+    body = json.dumps({'repository': {'full_name': 'Owner/Repo'}}).encode('utf-8')
+    headers = (f"Content-Length: {len(body)}\r\nX-GitHub-Event: push\r\n"
+               f"X-Hub-Signature-256: {sign_payload(SECRET, body)}\r\n")
+    assert post(address, headers, body) == 202
+    assert post(address, headers.replace(sign_payload(SECRET, body), sign_payload('other', body)), body) == 401
+    assert updater.submitted == ['owner/repo']
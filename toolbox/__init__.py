@@ -0,0 +1,14 @@
+"""
+Toolbox 仪表板生成库
+
+各子模块导入时不做任何网络、文件或环境变量操作：
+    toolbox.extract   - README 描述提取
+    toolbox.render    - README.md / tools_index.json 内容生成
+    toolbox.search_index - tools_index.json 的检索索引与查询接口
+    toolbox.binary_index - tools_index.json 的二进制（mmap）版本
+    toolbox.analysis  - 仓库分析
+    toolbox.client    - GitHub API 客户端（首次请求时才导入 requests）
+    toolbox.cli       - 命令行入口
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,7 @@
+"""
+python -m toolbox：与 generate_auto_descriptions.py 相同的命令行入口
+"""
+from .cli import run
+
+if __name__ == "__main__":
+    run()
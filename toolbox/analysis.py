@@ -0,0 +1,288 @@
+"""
+仓库分析：将 API 数据整理为 RepositoryRecord 记录
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Callable, Tuple
+
+from . import config
+from .client import (
+    build_readme_blob, call_github_graphql, get_repository_info, get_repository_languages, get_repository_readme_blob,
+)
+from .extract import extract_description_from_readme
+from .local import load_local_repository
+from .metrics import METRICS
+from .records import RepositoryRecord
+from .graphql import (
+    DEFAULT_GRAPHQL_BATCH_SIZE, build_graphql_batch_query,
+    graphql_node_languages, graphql_node_readme, graphql_node_to_rest,
+)
+
+# ========== 并发控制 ==========
+# 同一仓库的多个端点请求（信息/语言/README）通过共享线程池并发发出。
+# 该线程池与 main() 中按仓库划分的线程池相互独立，避免嵌套提交造成死锁。
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_lock = threading.Lock()
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """
+    获取端点请求线程池（首次调用时按 config.MAX_WORKERS 惰性创建）
+    """
+    global _fetch_executor
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=max(2, config.MAX_WORKERS * 2),
+                thread_name_prefix='fetch'
+            )
+        return _fetch_executor
+def analyze_repository(repo_name: str) -> Optional[RepositoryRecord]:
+    """
+    分析单个仓库（超级防御版本）
+    核心原则：任何一步失败都不崩溃，使用默认值继续。
+    """
+    print(f"🔍 分析仓库: {repo_name}")
+    
+    # 0. 语言统计与仓库信息互不依赖，提前并发发出请求
+    langs_future = get_fetch_executor().submit(get_repository_languages, config.USERNAME, repo_name)
+    
+    # 1. 获取仓库基本信息 - 这是最可能失败的根源
+    repo_data = None
+    try:
+        repo_data = get_repository_info(config.USERNAME, repo_name)
+    except Exception as e:
+        print(f"  ⚠️  调用get_repository_info时发生意外错误: {e}")
+    
+    # ========== 核心防御：严格检查 repo_data ==========
+    if repo_data is None:
+        print(f"  ❌ 致命错误：无法获取仓库 '{repo_name}' 的任何信息。将跳过此仓库。")
+        langs_future.cancel()
+        return None
+    
+    if not isinstance(repo_data, dict):
+        print(f"  ⚠️  警告：仓库 '{repo_name}' 的数据类型不是字典 ({type(repo_data)})。将使用空字典。")
+        repo_data = {}
+    # ==================================================
+    
+    return build_repository_info(
+        repo_name,
+        repo_data,
+        readme_loader=lambda: get_repository_readme_blob(config.USERNAME, repo_name),
+        languages_loader=langs_future.result
+    )
+def analyze_local_repository(repo_name: str) -> Optional[RepositoryRecord]:
+    """
+    使用 tools/ 下的本地检出分析仓库：README 与语言字节数读取本地文件，
+    只请求仓库基本信息（星标、Fork、Issue 等）；仓库未检出时改用 REST 分析
+    """
+    local_data = load_local_repository(repo_name)
+    if local_data is None:
+        return analyze_repository(repo_name)
+    
+    print(f"🔍 分析仓库: {repo_name} (本地检出)")
+    repo_data = None
+    try:
+        repo_data = get_repository_info(config.USERNAME, repo_name)
+    except Exception as e:
+        print(f"  ⚠️  调用get_repository_info时发生意外错误: {e}")
+    if repo_data is None:
+        print(f"  ❌ 致命错误：无法获取仓库 '{repo_name}' 的任何信息。将跳过此仓库。")
+        return None
+    if not isinstance(repo_data, dict):
+        repo_data = {}
+    
+    return build_repository_info(
+        repo_name,
+        repo_data,
+        readme_loader=lambda: (local_data['readme'], local_data['readme_sha']),
+        languages_loader=lambda: local_data['languages']
+    )
+def build_repository_info(repo_name: str, repo_data: Dict[str, Any],
+                          readme_loader: Callable[[], Tuple[str, Optional[str]]],
+                          languages_loader: Callable[[], Dict[str, int]]) -> RepositoryRecord:
+    """
+    由REST格式的仓库数据构建仓库记录
+    README（内容, blob SHA）与语言统计通过回调按需获取，REST 与 GraphQL 两种获取方式共用此函数
+    """
+    # 2. 智能提取描述（核心逻辑，每一步都加保护）
+    final_description = f"{repo_name} - 一个开发项目"  # 最终兜底描述
+    readme_sha = None
+    
+    # 尝试获取GitHub官方描述
+    gh_description = ""
+    try:
+        gh_description = repo_data.get('description', '')
+        if gh_description and isinstance(gh_description, str):
+            gh_description = gh_description.strip()
+    except Exception:
+        gh_description = ""
+    
+    # 如果官方描述有效，直接使用
+    if gh_description:
+        final_description = gh_description
+    else:
+        # 否则，尝试通过README提取
+        print(f"  📄 尝试从README提取描述...")
+        readme_content = ""
+        try:
+            readme_content, readme_sha = readme_loader()
+        except Exception as e:
+            print(f"    ⚠️  获取README失败: {e}")
+        
+        if readme_content:
+            try:
+                with METRICS.phase('extract'):
+                    extracted_desc = extract_description_from_readme(readme_content, repo_name, readme_sha)
+                if extracted_desc and extracted_desc != f"{repo_name} - 一个实用的开发工具项目":
+                    final_description = extracted_desc
+            except Exception as e:
+                print(f"    ⚠️  分析README失败: {e}")
+    
+    # 3. 安全地提取所有其他信息，并为任何可能的异常提供默认值
+    try:
+        main_language = repo_data.get('language')
+        if not main_language or not isinstance(main_language, str):
+            main_language = '多种语言'
+    except Exception:
+        main_language = '多种语言'
+    
+    try:
+        languages_list = []
+        language_bytes = {}
+        # 注意：get_repository_languages 函数也可能返回None或失败
+        langs_data = languages_loader()
+        if isinstance(langs_data, dict):
+            languages_list = list(langs_data.keys())[:3]
+            # 保留完整的字节数统计，用于加权语言分布
+            language_bytes = {
+                lang: max(0, int(size)) for lang, size in langs_data.items()
+                if isinstance(lang, str) and isinstance(size, (int, float))
+            }
+    except Exception:
+        languages_list = []
+        language_bytes = {}
+    
+    # 4. 构建最终的仓库记录（所有字段都有默认值）
+    repository_info = RepositoryRecord(
+        # 基本信息（有严格检查，相对安全）
+        name=repo_name,
+        url=repo_data.get('html_url', f'https://github.com/{config.USERNAME}/{repo_name}'),
+        
+        # 描述信息（经过多重保护）
+        official_description=gh_description,  # 原始GitHub描述，可能为空
+        extracted_description=final_description,
+        final_description=final_description,
+        readme_sha=readme_sha,
+        
+        # 统计信息（提供默认值0）
+        stars=repo_data.get('stargazers_count', 0) if isinstance(repo_data.get('stargazers_count'), (int, float)) else 0,
+        forks=repo_data.get('forks_count', 0) if isinstance(repo_data.get('forks_count'), (int, float)) else 0,
+        watchers=repo_data.get('watchers_count', 0) if isinstance(repo_data.get('watchers_count'), (int, float)) else 0,
+        open_issues=repo_data.get('open_issues_count', 0) if isinstance(repo_data.get('open_issues_count'), (int, float)) else 0,
+        
+        # 时间信息（安全提取，提供空字符串默认值）
+        created_at=(repo_data.get('created_at', '')[:10] if isinstance(repo_data.get('created_at'), str) else ''),
+        updated_at=(repo_data.get('updated_at', '')[:10] if isinstance(repo_data.get('updated_at'), str) else ''),
+        pushed_at=(repo_data.get('pushed_at', '')[:10] if isinstance(repo_data.get('pushed_at'), str) else ''),
+        
+        # 技术信息
+        language=main_language,
+        languages=languages_list,
+        language_bytes=language_bytes,
+        topics=repo_data.get('topics', []) if isinstance(repo_data.get('topics'), list) else [],
+        license=(repo_data.get('license', {}).get('name') 
+                 if repo_data.get('license') and isinstance(repo_data.get('license'), dict) 
+                 else None),
+        
+        # 功能特性
+        has_wiki=repo_data.get('has_wiki', False) if isinstance(repo_data.get('has_wiki'), bool) else False,
+        has_pages=repo_data.get('has_pages', False) if isinstance(repo_data.get('has_pages'), bool) else False,
+        has_projects=repo_data.get('has_projects', False) if isinstance(repo_data.get('has_projects'), bool) else False,
+        has_downloads=repo_data.get('has_downloads', True) if isinstance(repo_data.get('has_downloads'), bool) else True,
+        
+        # 状态信息
+        archived=repo_data.get('archived', False) if isinstance(repo_data.get('archived'), bool) else False,
+        disabled=repo_data.get('disabled', False) if isinstance(repo_data.get('disabled'), bool) else False,
+        private=repo_data.get('private', False) if isinstance(repo_data.get('private'), bool) else False,
+    )
+    
+    print(f"  ✅ 成功分析: {repo_name} (⭐ {repository_info.stars})")
+    return repository_info
+def analyze_repository_batch_graphql(repo_names: List[str]) -> List[Optional[RepositoryRecord]]:
+    """
+    用一次 GraphQL 查询分析一批仓库
+    整批请求失败时退回逐个 REST 分析
+    """
+    print(f"🔍 GraphQL批量分析 {len(repo_names)} 个仓库: {repo_names[0]} ... {repo_names[-1]}")
+    variables: Dict[str, Any] = {'owner': config.USERNAME}
+    for i, repo_name in enumerate(repo_names):
+        variables[f'n{i}'] = repo_name
+    
+    data = call_github_graphql(build_graphql_batch_query(len(repo_names)), variables)
+    if data is None:
+        print("  ⚠️  GraphQL批量请求失败，改用REST逐个分析")
+        return [analyze_repository(repo_name) for repo_name in repo_names]
+    
+    results = []
+    for i, repo_name in enumerate(repo_names):
+        node = data.get(f'r{i}')
+        if not isinstance(node, dict):
+            print(f"  ❌ 致命错误：无法获取仓库 '{repo_name}' 的任何信息。将跳过此仓库。")
+            results.append(None)
+            continue
+        results.append(build_repository_info(
+            repo_name,
+            graphql_node_to_rest(node),
+            readme_loader=lambda node=node: build_readme_blob(graphql_node_readme(node).encode('utf-8')),
+            languages_loader=lambda node=node: graphql_node_languages(node)
+        ))
+    return results
+def analyze_discovered_repository(item: Dict[str, Any], fetch_languages: bool = False) -> Optional[RepositoryRecord]:
+    """
+    直接使用仓库列表数据分析仓库，只在需要时请求README（和语言统计）
+    """
+    repo_name = item['name']
+    owner = (item.get('owner') or {}).get('login') or config.USERNAME
+    print(f"🔍 分析仓库: {owner}/{repo_name}")
+    
+    def load_languages() -> Dict[str, int]:
+        if fetch_languages:
+            return get_repository_languages(owner, repo_name)
+        # 列表数据只包含主语言
+        language = item.get('language')
+        return {language: 0} if isinstance(language, str) and language else {}
+    
+    return build_repository_info(
+        repo_name,
+        item,
+        readme_loader=lambda: get_repository_readme_blob(owner, repo_name),
+        languages_loader=load_languages
+    )
+def analyze_discovered_repositories(items: List[Dict[str, Any]], max_workers: int,
+                                    fetch_languages: bool = False) -> List[Optional[RepositoryRecord]]:
+    """
+    并发分析发现的仓库，结果顺序与 items 一致
+    """
+    def analyze(item: Dict[str, Any]) -> Optional[RepositoryRecord]:
+        return analyze_discovered_repository(item, fetch_languages)
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='repo') as pool:
+        return list(pool.map(analyze, items))
+def analyze_repositories(repo_names: List[str], max_workers: int) -> List[Optional[RepositoryRecord]]:
+    """
+    使用有界线程池并发分析多个仓库
+    返回结果与 repo_names 顺序一一对应，保证输出内容确定
+    """
+    if config.FETCH_BACKEND == 'graphql':
+        batch_size = max(1, int(config.GRAPHQL_BATCH_SIZE or DEFAULT_GRAPHQL_BATCH_SIZE))
+        batches = [repo_names[i:i + batch_size] for i in range(0, len(repo_names), batch_size)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch') as pool:
+            return [info for batch in pool.map(analyze_repository_batch_graphql, batches) for info in batch]
+    
+    analyze = analyze_local_repository if config.FETCH_BACKEND == 'local' else analyze_repository
+    if max_workers <= 1:
+        return [analyze(repo_name) for repo_name in repo_names]
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='repo') as pool:
+        # executor.map 按提交顺序返回结果
+        return list(pool.map(analyze, repo_names))
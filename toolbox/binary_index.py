@@ -0,0 +1,240 @@
+"""
+tools_index.json 的二进制版本：定长记录 + 字符串表 + 按名称排序的偏移索引
+读取时用 mmap 映射文件，按需解码单条记录，打开耗时与内存占用不随仓库数量增长；
+可无损还原为 tools_index.json 的结构
+
+    python -m toolbox.binary_index tools_index.bin > tools_index.json
+"""
+import sys
+import json
+import mmap
+import struct
+from datetime import datetime
+from typing import List, Dict, Optional, Any, BinaryIO, Iterator, Tuple
+
+from .records import RepositoryRecord, RepositoryStatistics
+from .render import generate_index_data
+
+# ========== 文件格式 ==========
+# 文件头：魔数、版本、记录数、主题引用数、元数据（metadata + statistics 的JSON）在字符串表中的位置、各区段的文件偏移
+# 记录：name / url / description / language / updated_at / license 六个字符串引用 (偏移, 长度)，
+#       topics 在主题引用区中的 (起始下标, 数量)，stars、forks、has_wiki
+# 字符串引用的偏移相对于字符串表起点；None 用 NULL_REF 表示；相同字符串只存一份
+DEFAULT_BINARY_INDEX_FILE = 'tools_index.bin'
+BINARY_INDEX_MAGIC = b'TBXINDEX'
+BINARY_INDEX_VERSION = 1
+HEADER_STRUCT = struct.Struct('<8sIIIIIQQQQ')
+RECORD_STRUCT = struct.Struct('<12I2I2qB7x')
+STRING_REF_STRUCT = struct.Struct('<2I')
+ORDER_STRUCT = struct.Struct('<I')
+NULL_REF = 0xFFFFFFFF
+RECORD_STRING_FIELDS = ('name', 'url', 'description', 'language', 'updated_at', 'license')
+
+class StringTable:
+    """
+    写入时使用的去重字符串表
+    """
+    def __init__(self):
+        self.data = bytearray()
+        self.refs: Dict[str, Tuple[int, int]] = {}
+    def add(self, value: Optional[Any]) -> Tuple[int, int]:
+        if value is None:
+            return NULL_REF, 0
+        value = str(value)
+        ref = self.refs.get(value)
+        if ref is None:
+            encoded = value.encode('utf-8')
+            ref = (len(self.data), len(encoded))
+            self.data += encoded
+            self.refs[value] = ref
+        return ref
+
+# ========== 写入 ==========
+def encode_binary_index(index_data: Dict[str, Any]) -> bytes:
+    """
+    将 tools_index.json 结构的数据编码为二进制索引
+    """
+    repositories = index_data['repositories']
+    strings = StringTable()
+    records = bytearray()
+    topic_refs = bytearray()
+    topic_count = 0
+    for entry in repositories:
+        refs = []
+        for field in RECORD_STRING_FIELDS:
+            refs.extend(strings.add(entry.get(field)))
+        topics = entry.get('topics') or []
+        for topic in topics:
+            topic_refs += STRING_REF_STRUCT.pack(*strings.add(topic))
+        records += RECORD_STRUCT.pack(
+            *refs, topic_count, len(topics),
+            int(entry.get('stars') or 0), int(entry.get('forks') or 0), 1 if entry.get('has_wiki') else 0,
+        )
+        topic_count += len(topics)
+    # 按名称（不区分大小写）排序的记录下标，用于二分查找
+    name_order = sorted(range(len(repositories)), key=lambda i: (str(repositories[i]['name']).lower(), str(repositories[i]['name'])))
+    order = struct.pack(f'<{len(name_order)}I', *name_order)
+    meta_offset, meta_length = strings.add(json.dumps(
+        {'metadata': index_data['metadata'], 'statistics': index_data['statistics']},
+        ensure_ascii=False, separators=(',', ':'), default=str,
+    ))
+    if len(strings.data) >= NULL_REF:
+        raise ValueError("字符串表超过 4GB，无法写入二进制索引")
+
+    records_offset = HEADER_STRUCT.size
+    topic_refs_offset = records_offset + len(records)
+    order_offset = topic_refs_offset + len(topic_refs)
+    strings_offset = order_offset + len(order)
+    header = HEADER_STRUCT.pack(
+        BINARY_INDEX_MAGIC, BINARY_INDEX_VERSION, len(repositories), topic_count, meta_offset, meta_length,
+        records_offset, topic_refs_offset, order_offset, strings_offset,
+    )
+    return b''.join((header, records, topic_refs, order, strings.data))
+def write_binary_index(repositories: List[RepositoryRecord], sink: BinaryIO, generated_at: Optional[datetime] = None,
+                       stats: Optional[RepositoryStatistics] = None):
+    """
+    将二进制索引写入 sink（二进制模式）；内容与同一时间生成的 tools_index.json 一一对应
+    """
+    sink.write(encode_binary_index(generate_index_data(repositories, generated_at, stats)))
+
+# ========== 读取 ==========
+class BinaryIndex:
+    """
+    用 mmap 只读映射的二进制索引；打开时只解析文件头，记录按下标或名称按需解码
+        with BinaryIndex.open('tools_index.bin') as index:
+            index.get('NodeWeb')
+    """
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mm) < HEADER_STRUCT.size:
+                raise ValueError("二进制索引文件不完整")
+            (magic, version, self.record_count, self.topic_count, self._meta_offset, self._meta_length,
+             self._records_offset, self._topic_refs_offset, self._order_offset,
+             self._strings_offset) = HEADER_STRUCT.unpack_from(self._mm, 0)
+            if magic != BINARY_INDEX_MAGIC:
+                raise ValueError("不是 Toolbox 二进制索引")
+            if version != BINARY_INDEX_VERSION:
+                raise ValueError(f"不支持的二进制索引版本: {version}")
+        except Exception:
+            self._mm.close()
+            raise
+        self._meta: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_BINARY_INDEX_FILE) -> 'BinaryIndex':
+        f = open(path, 'rb')
+        try:
+            return cls(f)
+        except Exception:
+            f.close()
+            raise
+
+    def close(self):
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> 'BinaryIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """
+        按下标解码一条记录（结构与 tools_index.json 中的仓库条目相同）
+        """
+        if index < 0:
+            index += self.record_count
+        if not 0 <= index < self.record_count:
+            raise IndexError("记录下标超出范围")
+        values = RECORD_STRUCT.unpack_from(self._mm, self._records_offset + index * RECORD_STRUCT.size)
+        name, url, description, language, updated_at, license_name = (
+            self._string(values[i], values[i + 1]) for i in range(0, 12, 2)
+        )
+        topic_start, topic_count, stars, forks, has_wiki = values[12:]
+        return {
+            "name": name,
+            "url": url,
+            "description": description,
+            "stars": stars,
+            "forks": forks,
+            "language": language,
+            "updated_at": updated_at,
+            "topics": [self._topic(topic_start + i) for i in range(topic_count)],
+            "has_wiki": bool(has_wiki),
+            "license": license_name
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.record_count):
+            yield self[index]
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        按仓库名（不区分大小写）二分查找，只解码比较路径上的名称
+        """
+        target = name.lower()
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            index = self._name_order(middle)
+            if self._record_name(index).lower() < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.record_count:
+            index = self._name_order(low)
+            if self._record_name(index).lower() == target:
+                return self[index]
+        return None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """
+        tools_index.json 中的 metadata 与 statistics
+        """
+        if self._meta is None:
+            self._meta = json.loads(self._string(self._meta_offset, self._meta_length))
+        return self._meta
+
+    def to_index_data(self) -> Dict[str, Any]:
+        """
+        还原为 tools_index.json 的完整结构
+        """
+        return {
+            "metadata": self.metadata['metadata'],
+            "statistics": self.metadata['statistics'],
+            "repositories": list(self)
+        }
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if offset == NULL_REF:
+            return None
+        start = self._strings_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _topic(self, index: int) -> str:
+        return self._string(*STRING_REF_STRUCT.unpack_from(self._mm, self._topic_refs_offset + index * STRING_REF_STRUCT.size))
+
+    def _name_order(self, position: int) -> int:
+        return ORDER_STRUCT.unpack_from(self._mm, self._order_offset + position * ORDER_STRUCT.size)[0]
+
+    def _record_name(self, index: int) -> str:
+        return self._string(*STRING_REF_STRUCT.unpack_from(self._mm, self._records_offset + index * RECORD_STRUCT.size))
+
+def main(argv: Optional[List[str]] = None):
+    """
+    将二进制索引转换回 tools_index.json 格式并输出到标准输出
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else DEFAULT_BINARY_INDEX_FILE
+    with BinaryIndex.open(path) as index:
+        json.dump(index.to_index_data(), sys.stdout, ensure_ascii=False, indent=2, default=str)
+
+if __name__ == "__main__":
+    main()
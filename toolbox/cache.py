@@ -0,0 +1,365 @@
+"""
+API 响应缓存：JSON 文件与单文件 SQLite 两种后端
+"""
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional, Any
+
+from . import config
+
+# ========== API 缓存 ==========
+# 缓存保存响应数据以及 ETag / Last-Modified，用于条件请求重新验证。
+# 服务器返回 304 时不消耗速率限制，也不传输响应体。
+# 缓存后端可选：
+#   json   - 每个端点一个 api_cache/cache_*.json 文件（旧版格式）
+#   sqlite - 单文件 SQLite 存储，按规范化端点索引，支持容量上限与LRU淘汰
+CACHE_DIR = "api_cache"
+CACHE_FORMAT_VERSION = 1
+CACHE_MODES = ('revalidate', 'prefer-cache', 'stale-while-revalidate')
+# stale-while-revalidate：有缓存时立即使用（过期的记为待刷新），生成输出后在时间预算内于后台重新验证
+SWR_CACHE_MODE = 'stale-while-revalidate'
+CACHE_BACKENDS = ('json', 'sqlite')
+DEFAULT_CACHE_BACKEND = 'sqlite'
+DEFAULT_SQLITE_CACHE_PATH = os.path.join(CACHE_DIR, 'cache.sqlite3')
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 各类端点缓存的有效期（秒）：有效期内直接使用缓存，过期后发条件请求重新验证
+DEFAULT_CACHE_TTL = {
+    'info': 3600,              # 仓库元数据（星标、更新时间）变化快
+    'languages': 24 * 3600,
+    'readme': 7 * 24 * 3600,   # README 很少变化
+    'list': 600,               # 账号仓库列表，用于发现新仓库
+    'default': 3600,
+}
+
+# 本次运行的缓存使用统计（多线程共享，需加锁）
+CACHE_STATS = {'revalidated': 0, 'refetched': 0, 'cached': 0, 'miss': 0, 'stale': 0}
+_cache_stats_lock = threading.Lock()
+# stale-while-revalidate 模式下本次运行使用过的过期缓存端点
+_stale_endpoints: Dict[str, None] = {}
+
+def record_cache_event(kind: str):
+    """
+    记录一次缓存事件：revalidated(304) / refetched(缓存过期重新获取) / cached(直接使用缓存) /
+    miss(无缓存) / stale(请求失败，使用过期缓存)
+    """
+    with _cache_stats_lock:
+        CACHE_STATS[kind] = CACHE_STATS.get(kind, 0) + 1
+def mark_stale_endpoint(endpoint: str):
+    """
+    记录一个使用了过期缓存、需要在后台刷新的端点
+    """
+    with _cache_stats_lock:
+        _stale_endpoints[endpoint] = None
+def pop_stale_endpoints() -> List[str]:
+    """
+    取出并清空待刷新的端点（按首次使用的顺序）
+    """
+    with _cache_stats_lock:
+        endpoints = list(_stale_endpoints)
+        _stale_endpoints.clear()
+    return endpoints
+def normalize_cache_key(endpoint: str) -> str:
+    """
+    规范化端点作为缓存键：去掉多余斜杠，仓库路径不区分大小写，查询参数排序
+    """
+    path, _, query = endpoint.partition('?')
+    path = '/' + '/'.join(part for part in path.split('/') if part)
+    if path.startswith('/repos/') or path.startswith('/users/') or path.startswith('/orgs/'):
+        path = path.lower()
+    if query:
+        path += '?' + '&'.join(sorted(query.split('&')))
+    return path
+def get_endpoint_class(endpoint: str) -> str:
+    """
+    端点分类，用于选择缓存有效期：info / readme / languages / list / default
+    """
+    parts = [part for part in endpoint.split('?')[0].split('/') if part]
+    if len(parts) == 3 and parts[0] == 'repos':
+        return 'info'
+    if len(parts) == 4 and parts[0] == 'repos' and parts[3] in ('readme', 'languages'):
+        return parts[3]
+    if len(parts) == 3 and parts[0] in ('users', 'orgs') and parts[2] == 'repos':
+        return 'list'
+    return 'default'
+def get_cache_ttl(endpoint: str) -> float:
+    """
+    获取端点的缓存有效期（秒）
+    """
+    ttl_table = {**DEFAULT_CACHE_TTL, **(config.CACHE_TTL or {})}
+    ttl = ttl_table.get(get_endpoint_class(endpoint), ttl_table['default'])
+    return float(ttl or 0)
+def is_cache_fresh(entry: Dict[str, Any], endpoint: str) -> bool:
+    """
+    缓存条目是否仍在有效期内
+    """
+    cached_at = entry.get('cached_at')
+    if not cached_at:
+        return False
+    return time.time() - cached_at < get_cache_ttl(endpoint)
+def parse_cached_at(value: Any) -> Optional[float]:
+    """
+    将缓存时间（ISO字符串或时间戳）转换为时间戳
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+class JsonFileCache:
+    """
+    每个端点一个 JSON 文件的缓存（兼容旧版 api_cache/cache_*.json）
+    """
+    name = 'json'
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def get_cache_file(self, endpoint: str) -> str:
+        """
+        将 endpoint 转换为缓存文件路径
+        """
+        safe_endpoint = re.sub(r'[/:?&=]', '_', endpoint)
+        return os.path.join(self.cache_dir, f"cache_{safe_endpoint}.json")
+
+    def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存条目，返回 {'data', 'etag', 'last_modified', 'cached_at'}；无有效缓存时返回None
+        兼容旧版缓存文件（直接保存响应数据，没有验证信息）
+        """
+        cache_file = self.get_cache_file(endpoint)
+        if not os.path.exists(cache_file) or os.path.getsize(cache_file) == 0:
+            return None
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            print(f"  ⚠️  缓存文件损坏，重新请求: {endpoint}")
+            return None
+        
+        entry = load_json_cache_entry(cached)
+        if entry is None:
+            print(f"  ⚠️  缓存数据无效，重新请求: {endpoint}")
+        return entry
+
+    def set(self, endpoint: str, data: Any, etag: Optional[str], last_modified: Optional[str]):
+        """
+        写入缓存条目（写入失败不影响运行）
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry = {
+                '_cache_version': CACHE_FORMAT_VERSION,
+                'endpoint': endpoint,
+                'etag': etag,
+                'last_modified': last_modified,
+                'cached_at': datetime.now().isoformat(),
+                'data': data,
+            }
+            with open(self.get_cache_file(endpoint), 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"  ⚠️  缓存写入失败（不影响运行）: {e}")
+
+    def close(self):
+        pass
+def load_json_cache_entry(cached: Any) -> Optional[Dict[str, Any]]:
+    """
+    解析 JSON 缓存文件内容（新版带验证信息的格式或旧版纯数据格式）
+    """
+    if isinstance(cached, dict) and cached.get('_cache_version') == CACHE_FORMAT_VERSION:
+        if cached.get('data') is None:
+            return None
+        return {
+            'data': cached['data'],
+            'etag': cached.get('etag'),
+            'last_modified': cached.get('last_modified'),
+            'cached_at': parse_cached_at(cached.get('cached_at')),
+            'endpoint': cached.get('endpoint'),
+        }
+    
+    # 旧版格式：整个文件就是响应数据
+    if isinstance(cached, dict) and cached:
+        return {'data': cached, 'etag': None, 'last_modified': None, 'cached_at': None, 'endpoint': None}
+    
+    return None
+class SqliteCache:
+    """
+    单文件 SQLite 缓存：按规范化端点索引，超出容量时按最近访问时间淘汰（LRU）
+    """
+    name = 'sqlite'
+
+    def __init__(self, path: str = DEFAULT_SQLITE_CACHE_PATH, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        import sqlite3
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 多线程共用一个连接，由 self._lock 串行化访问
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                endpoint_class TEXT NOT NULL,
+                data TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                cached_at REAL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        # 容量上限可能已被调小，打开时先淘汰一次
+        with self._lock:
+            self._evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        key = normalize_cache_key(endpoint)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, etag, last_modified, cached_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        try:
+            data = json.loads(row[0])
+        except json.JSONDecodeError:
+            print(f"  ⚠️  缓存数据损坏，重新请求: {endpoint}")
+            return None
+        return {'data': data, 'etag': row[1], 'last_modified': row[2], 'cached_at': row[3]}
+
+    def set(self, endpoint: str, data: Any, etag: Optional[str], last_modified: Optional[str],
+            cached_at: Optional[float] = None):
+        try:
+            self._put(endpoint, data, etag, last_modified, cached_at if cached_at is not None else time.time())
+            with self._lock:
+                self._conn.commit()
+                self._evict()
+        except Exception as e:
+            print(f"  ⚠️  缓存写入失败（不影响运行）: {e}")
+
+    def _put(self, endpoint: str, data: Any, etag: Optional[str], last_modified: Optional[str],
+             cached_at: Optional[float]):
+        key = normalize_cache_key(endpoint)
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        size = len(payload.encode('utf-8'))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, get_endpoint_class(endpoint), payload, etag, last_modified,
+                 cached_at, time.time(), size)
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+
+    def _evict(self):
+        """
+        超出容量上限时删除最久未访问的条目，直到降到上限的 90%（需持有锁）
+        """
+        if not self.max_bytes or self.total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        evicted = 0
+        rows = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self.total_bytes -= size
+            evicted += 1
+        self._conn.commit()
+        print(f"  🧹 缓存超出上限，已淘汰 {evicted} 条最久未使用的记录")
+
+    def migrate_from_json(self, cache_dir: str = CACHE_DIR) -> int:
+        """
+        导入旧版 api_cache/cache_*.json 文件，返回导入条数
+        旧版文件名无法可靠还原端点，优先使用文件内记录的端点或响应数据中的仓库全名
+        """
+        if not os.path.isdir(cache_dir):
+            return 0
+        imported = 0
+        for filename in sorted(os.listdir(cache_dir)):
+            if not (filename.startswith('cache_') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(cache_dir, filename), 'r', encoding='utf-8') as f:
+                    entry = load_json_cache_entry(json.load(f))
+            except (json.JSONDecodeError, IOError):
+                continue
+            if entry is None:
+                continue
+            endpoint = entry.get('endpoint') or guess_legacy_cache_endpoint(filename, entry['data'])
+            if not endpoint:
+                continue
+            self._put(endpoint, entry['data'], entry['etag'], entry['last_modified'], entry['cached_at'])
+            imported += 1
+        with self._lock:
+            self._conn.commit()
+            self._evict()
+        return imported
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+def guess_legacy_cache_endpoint(filename: str, data: Any) -> Optional[str]:
+    """
+    根据旧版缓存文件名和内容推断端点
+    GitHub 用户名不含下划线，因此 owner 为 `_repos_` 之后的第一段
+    """
+    name = filename[len('cache_'):-len('.json')]
+    if not name.startswith('_repos_'):
+        return None
+    if isinstance(data, dict) and isinstance(data.get('full_name'), str):
+        return f"/repos/{data['full_name']}"
+    match = re.search(r'/repos/([^/]+/[^/]+)/contents/', str(data.get('url', ''))) if isinstance(data, dict) else None
+    if match:
+        return f"/repos/{match.group(1)}/readme"
+    owner, _, rest = name[len('_repos_'):].partition('_')
+    if not owner or not rest:
+        return None
+    for suffix in ('languages', 'readme'):
+        if rest.endswith('_' + suffix):
+            return f"/repos/{owner}/{rest[:-len(suffix) - 1]}/{suffix}"
+    return f"/repos/{owner}/{rest}"
+_cache_store = None
+_cache_store_lock = threading.Lock()
+
+def get_cache_store():
+    """
+    获取缓存后端（首次调用时创建；SQLite 库为空时自动迁移旧版 JSON 缓存）
+    """
+    global _cache_store
+    with _cache_store_lock:
+        if _cache_store is None:
+            backend = config.CACHE_BACKEND or DEFAULT_CACHE_BACKEND
+            if backend == 'sqlite':
+                max_bytes = DEFAULT_CACHE_MAX_BYTES if config.CACHE_MAX_BYTES is None else int(config.CACHE_MAX_BYTES)
+                store = SqliteCache(config.CACHE_PATH or DEFAULT_SQLITE_CACHE_PATH, max_bytes)
+                if len(store) == 0:
+                    imported = store.migrate_from_json(CACHE_DIR)
+                    if imported:
+                        print(f"📦 已将 {imported} 个旧版JSON缓存文件导入 {store.path}")
+                _cache_store = store
+            else:
+                _cache_store = JsonFileCache(CACHE_DIR)
+        return _cache_store
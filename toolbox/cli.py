@@ -0,0 +1,491 @@
+"""
+命令行入口：读取配置、分析仓库、生成 README.md 与 tools_index.json
+"""
+import os
+import sys
+import json
+import argparse
+from typing import List, Dict, Optional, Any, Tuple
+
+from . import config
+from .analysis import analyze_discovered_repositories, analyze_repositories
+from .binary_index import DEFAULT_BINARY_INDEX_FILE, write_binary_index
+from .cache import (
+    CACHE_BACKENDS, CACHE_DIR, CACHE_MODES, CACHE_STATS, DEFAULT_CACHE_BACKEND, pop_stale_endpoints,
+)
+from .client import get_http_pool_size
+from .discovery import discover_repositories, get_discovery_settings
+from .extract import dump_description_memo, load_description_memo
+from .graphql import FETCH_BACKENDS
+from .incremental import (
+    DEFAULT_MANIFEST_FILE, fetch_listing_index, get_manifest_key, get_repo_signature,
+    load_manifest, reuse_manifest_record, write_if_changed,
+)
+from .metrics import (
+    DEFAULT_METRICS_FILE, METRICS, PROFILE_MODES, Profiler, timed_writer, write_metrics,
+)
+from .ratelimit import get_rate_limiter
+from .records import RepositoryRecord, RepositoryStatistics, compute_statistics
+from .history import DEFAULT_HISTORY_DIR, get_trends, record_snapshot
+from .refresh import DEFAULT_REFRESH_BUDGET, BackgroundRefresh, get_endpoint_repo
+from .render import write_index, write_readme
+from .search_index import DEFAULT_SEARCH_INDEX_FILE, write_search_index
+from .shards import (
+    load_shard_indexes, merge_index_data, merged_index_records, run_shards, write_merged_binary_index, write_merged_index,
+)
+
+def run_analysis(discovery: Dict[str, Any], manifest_entries: Dict[str, Any], track_changes: bool,
+                 keep: Optional[Dict[str, RepositoryRecord]] = None
+                 ) -> Tuple[List[str], List[Optional[RepositoryRecord]], Dict[str, Any]]:
+    """
+    分析全部目标仓库；时间戳未变化的仓库直接复用清单记录
+    track_changes 为真时获取账号仓库列表以记录变化签名
+    keep（小写仓库名 -> 记录）中的仓库直接沿用给定记录，不重新分析
+    返回 (仓库名列表, 与之对应的分析结果, 新的清单条目)
+    """
+    if discovery['enabled']:
+        items = discover_repositories(discovery)
+        targets = [
+            (get_manifest_key((item.get('owner') or {}).get('login') or config.USERNAME, item['name']), item['name'], item)
+            for item in items
+        ]
+    else:
+        listing = fetch_listing_index(config.USERNAME) if track_changes else {}
+        targets = [(get_manifest_key(config.USERNAME, name), name, listing.get(name.lower())) for name in config.REPO_LIST]
+    
+    keep = keep or {}
+    results = [
+        keep.get(name.lower()) or reuse_manifest_record(manifest_entries.get(key), item)
+        for key, name, item in targets
+    ]
+    stale = [i for i, repo_info in enumerate(results) if repo_info is None]
+    if track_changes:
+        print(f"♻️  增量模式: 复用 {len(targets) - len(stale)} 个未变化的仓库，重新分析 {len(stale)} 个")
+    
+    if discovery['enabled']:
+        analyzed = analyze_discovered_repositories(
+            [targets[i][2] for i in stale], config.MAX_WORKERS, discovery['fetch_languages']
+        )
+    else:
+        analyzed = analyze_repositories([targets[i][1] for i in stale], config.MAX_WORKERS)
+    for i, repo_info in zip(stale, analyzed):
+        results[i] = repo_info
+    
+    new_entries = {}
+    for (key, _, item), repo_info in zip(targets, results):
+        if repo_info and item:
+            new_entries[key] = {'signature': get_repo_signature(item), 'repository_info': repo_info.to_dict()}
+    return [name for _, name, _ in targets], results, new_entries
+def get_history_dir() -> Optional[str]:
+    """
+    快照历史目录；history_dir 为 false 时返回None（不记录历史、不计算趋势）
+    """
+    history_dir = DEFAULT_HISTORY_DIR if config.HISTORY_DIR is None else config.HISTORY_DIR
+    return history_dir or None
+def apply_trends(repositories: List[RepositoryRecord], stats: RepositoryStatistics):
+    """
+    用已记录的快照历史计算增长趋势并写入 stats（只读，不追加快照）
+    """
+    history_dir = get_history_dir()
+    if history_dir:
+        with METRICS.phase('history'):
+            stats.trends = get_trends(repositories, history_dir)
+def record_history(repositories: List[RepositoryRecord]):
+    """
+    追加本次运行的快照；每次运行只调用一次，使用最终的分析结果
+    """
+    history_dir = get_history_dir()
+    if history_dir:
+        with METRICS.phase('history'):
+            record_snapshot(repositories, history_dir)
+def write_outputs(repositories: List[RepositoryRecord], stats: RepositoryStatistics,
+                  outputs: Dict[str, str]) -> Dict[str, bool]:
+    """
+    生成 README.md 与各索引文件（内容未变化的文件不重写），返回 文件路径 -> 是否写入
+    """
+    written = {}
+    with METRICS.phase('output'):
+        # 生成README（流式写入；内容未变化时不重写，避免每次运行都产生差异）
+        print("📝 生成README.md文件...")
+        written["README.md"] = write_if_changed(
+            "README.md",
+            timed_writer(lambda sink, generated_at: write_readme(repositories, sink, generated_at, stats)),
+            outputs
+        )
+        
+        # 生成JSON索引
+        print("📊 生成JSON索引文件...")
+        written["tools_index.json"] = write_if_changed(
+            "tools_index.json",
+            timed_writer(lambda sink, generated_at: write_index(repositories, sink, generated_at, stats)),
+            outputs
+        )
+        
+        # 二进制索引（定长记录，可用 mmap 按需读取，内容与JSON索引对应）
+        binary_index_file = DEFAULT_BINARY_INDEX_FILE if config.BINARY_INDEX_FILE is None else config.BINARY_INDEX_FILE
+        if binary_index_file:
+            written[binary_index_file] = write_if_changed(
+                binary_index_file,
+                timed_writer(lambda sink, generated_at: write_binary_index(repositories, sink, generated_at, stats)),
+                outputs, binary=True
+            )
+        
+        # 生成检索索引（倒排表 + 排序，供下游按条件快速查询）
+        search_index_file = DEFAULT_SEARCH_INDEX_FILE if config.SEARCH_INDEX_FILE is None else config.SEARCH_INDEX_FILE
+        if search_index_file:
+            print("🔎 生成检索索引文件...")
+            written[search_index_file] = write_if_changed(
+                search_index_file,
+                timed_writer(lambda sink, generated_at: write_search_index(repositories, sink, generated_at)),
+                outputs, newline='\n'
+            )
+    return written
+def write_merged_outputs(shards: List[Tuple[str, Dict[str, Any]]], outputs: Dict[str, str]) -> Dict[str, bool]:
+    """
+    由各分片的索引生成顶层 tools_index.json、README.md 与检索 / 二进制索引，返回 文件路径 -> 是否写入
+    README 与检索索引由合并后的索引条目还原，只包含索引中的字段，不含增长趋势
+    """
+    repositories, stats = merged_index_records(merge_index_data(shards))
+    written = {}
+    with METRICS.phase('output'):
+        written["README.md"] = write_if_changed(
+            "README.md",
+            timed_writer(lambda sink, generated_at: write_readme(repositories, sink, generated_at, stats)),
+            outputs
+        )
+        written["tools_index.json"] = write_if_changed(
+            "tools_index.json",
+            timed_writer(lambda sink, generated_at: write_merged_index(shards, sink, generated_at)),
+            outputs
+        )
+        binary_index_file = DEFAULT_BINARY_INDEX_FILE if config.BINARY_INDEX_FILE is None else config.BINARY_INDEX_FILE
+        if binary_index_file:
+            written[binary_index_file] = write_if_changed(
+                binary_index_file,
+                timed_writer(lambda sink, generated_at: write_merged_binary_index(shards, sink, generated_at)),
+                outputs, binary=True
+            )
+        search_index_file = DEFAULT_SEARCH_INDEX_FILE if config.SEARCH_INDEX_FILE is None else config.SEARCH_INDEX_FILE
+        if search_index_file:
+            written[search_index_file] = write_if_changed(
+                search_index_file,
+                timed_writer(lambda sink, generated_at: write_search_index(repositories, sink, generated_at)),
+                outputs, newline='\n'
+            )
+    return written
+def run_sharded(args: argparse.Namespace, argv: List[str]):
+    """
+    多账号模式：并发运行各账号分片（--merge-only 时跳过），然后由各分片的索引生成顶层 README 与索引文件
+    """
+    usernames = [entry['username'] for entry in config.ACCOUNTS]
+    results = {}
+    if not args.merge_only:
+        if not check_tokens():
+            sys.exit(1)
+        jobs = args.shard_jobs or min(len(usernames), config.DEFAULT_MAX_WORKERS)
+        with METRICS.phase('shards'):
+            results = run_shards(argv, jobs)
+    
+    print("🔗 合并各账号索引...")
+    shards = load_shard_indexes(usernames)
+    if not shards:
+        print("❌ 错误：没有可合并的分片索引。")
+        sys.exit(1)
+    manifest_file = config.MANIFEST_FILE or DEFAULT_MANIFEST_FILE
+    manifest = load_manifest(manifest_file) if config.INCREMENTAL else {'outputs': {}, 'repositories': {}}
+    written = write_merged_outputs(shards, manifest.setdefault('outputs', {}))
+    if config.INCREMENTAL:
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    
+    merged = merge_index_data(shards)
+    statistics = merged['statistics']
+    print("-" * 60)
+    print(f"✅ 合并 {len(shards)}/{len(usernames)} 个账号，共 {merged['metadata']['total_repositories']} 个仓库")
+    print(f"⭐ 总星标数: {statistics['total_stars']}")
+    print(f"🍴 总Fork数: {statistics['total_forks']}")
+    print(f"🔧 涉及语言: {len(statistics['languages'])} 种")
+    for path, path_written in written.items():
+        print(f"  • {path} ({'已更新' if path_written else '内容未变化'})")
+    if any(code != 0 for code in results.values()):
+        sys.exit(1)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    解析命令行参数
+    """
+    parser = argparse.ArgumentParser(description="自动分析GitHub仓库并生成Toolbox仪表板")
+    parser.add_argument(
+        '--config', default=config.CONFIG_FILE,
+        help=f"配置文件路径（默认 {config.CONFIG_FILE}）"
+    )
+    parser.add_argument(
+        '-j', '--workers', type=int, default=None,
+        help=f"同时分析的仓库数量（默认读取 {config.CONFIG_FILE} 中的 max_workers，缺省为 {config.DEFAULT_MAX_WORKERS}）"
+    )
+    parser.add_argument(
+        '--cache-mode', choices=CACHE_MODES, default=None,
+        help="缓存策略：revalidate 使用条件请求验证缓存，prefer-cache 有缓存时不发请求，"
+             "stale-while-revalidate 先用缓存生成输出，再在时间预算内后台刷新过期数据"
+    )
+    parser.add_argument(
+        '--refresh-budget', type=float, default=None,
+        help=f"stale-while-revalidate 模式下后台刷新的时间预算（秒，默认读取 refresh_budget，缺省为 {DEFAULT_REFRESH_BUDGET:g}）"
+    )
+    parser.add_argument(
+        '--cache-backend', choices=CACHE_BACKENDS, default=None,
+        help=f"缓存后端：json 每端点一个文件，sqlite 单文件存储（默认 {DEFAULT_CACHE_BACKEND}）"
+    )
+    parser.add_argument(
+        '--pool-size', type=int, default=None,
+        help="HTTP连接池大小（默认读取 http_pool_size，缺省按并发数自动计算）"
+    )
+    parser.add_argument(
+        '--api-url', default=None,
+        help=f"GitHub API 地址（默认 {config.DEFAULT_API_BASE_URL}，可指向本地模拟服务器）"
+    )
+    parser.add_argument(
+        '--backend', choices=FETCH_BACKENDS, default=None,
+        help="数据获取方式：rest 逐仓库请求，graphql 批量查询，local 读取 tools/ 下的本地检出（默认读取 fetch_backend）"
+    )
+    parser.add_argument(
+        '--full', action='store_true',
+        help="忽略增量清单，重新分析全部仓库"
+    )
+    parser.add_argument(
+        '--discover', action='store_true',
+        help="分页遍历账号下的全部仓库，代替 repositories 列表（过滤条件见 discovery 配置）"
+    )
+    parser.add_argument(
+        '--account', default=None,
+        help="只生成 accounts 配置中的一个账号（分片子进程使用）"
+    )
+    parser.add_argument(
+        '--shard-jobs', type=int, default=None,
+        help=f"多账号分片生成时同时运行的进程数（默认为账号数，最多 {config.DEFAULT_MAX_WORKERS}）"
+    )
+    parser.add_argument(
+        '--merge-only', action='store_true',
+        help="不运行分片，只合并各账号已生成的 tools_index.json"
+    )
+    parser.add_argument(
+        '--metrics', default=None,
+        help=f"运行指标JSON文件路径（默认读取 metrics_file，缺省为 {DEFAULT_METRICS_FILE}）"
+    )
+    parser.add_argument(
+        '--profile', choices=PROFILE_MODES, default=None,
+        help="性能采样：cpu 使用 cProfile，memory 使用 tracemalloc，all 两者都用（结果写入指标文件）"
+    )
+    return parser.parse_args(argv)
+def check_tokens() -> bool:
+    """
+    检查是否配置了格式有效的GitHub令牌，缺失时打印获取方法
+    """
+    # 如果没有找到令牌，显示错误信息
+    if not config.GITHUB_TOKEN:
+        print("❌ 错误：未找到 GitHub Token。")
+        print("请按照以下步骤操作：")
+        print("  1. 在项目根目录创建 .env 文件")
+        print("  2. 在 .env 文件中添加: GITHUB_TOKEN=你的GitHub令牌")
+        print("  3. 确保 .env 在 .gitignore 中，不会被提交")
+        print("")
+        print("如何获取GitHub令牌:")
+        print("  1. 访问 https://github.com/settings/tokens")
+        print("  2. 点击 Generate new token (classic)")
+        print("  3. 勾选 'repo' 权限")
+        print("  4. 生成并复制令牌")
+        return False
+    
+    # 验证令牌基本格式（简单检查）
+    if any(len(token) < 20 for token in config.GITHUB_TOKENS):
+        print("❌ 错误：GITHUB_TOKEN 环境变量未设置或格式无效。")
+        print("请确保已在GitHub仓库的Secrets中正确设置 PAT_TOKEN 或 GITHUB_TOKEN。")
+        return False
+    return True
+def main(argv: Optional[List[str]] = None):
+    """
+    主函数：协调整个分析过程
+    """
+    args = parse_args(argv)
+    METRICS.reset()
+    profiler = Profiler(args.profile)
+    profiler.start()
+    config.load_env()
+    try:
+        config.load_config(args.config, args.account)
+    except ValueError as e:
+        print(f"❌ 错误：{e}")
+        sys.exit(1)
+    if config.ACCOUNTS and args.account is None:
+        # 多账号：每个账号一个子进程分片生成，再合并总索引
+        # 合并运行同样写入运行指标；run_sharded 内的 sys.exit 也要先停止分析器
+        metrics_file = args.metrics or config.METRICS_FILE or DEFAULT_METRICS_FILE
+        try:
+            run_sharded(args, sys.argv[1:] if argv is None else argv)
+        finally:
+            write_metrics(metrics_file, CACHE_STATS, profiler.stop())
+            print(f"  • {metrics_file} (运行指标)")
+        return
+    if not check_tokens():
+        sys.exit(1)
+    
+    # 确保缓存目录存在
+    if not os.path.exists(CACHE_DIR):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        print(f"📁 创建缓存目录: {CACHE_DIR}")
+    
+    if args.workers is not None:
+        config.MAX_WORKERS = args.workers
+    config.MAX_WORKERS = max(1, int(config.MAX_WORKERS))
+    if args.cache_mode is not None:
+        config.CACHE_MODE = args.cache_mode
+    if args.refresh_budget is not None:
+        config.REFRESH_BUDGET = args.refresh_budget
+    if config.CACHE_MODE not in CACHE_MODES:
+        print(f"⚠️  未知的缓存策略 {config.CACHE_MODE}，使用 {config.DEFAULT_CACHE_MODE}")
+        config.CACHE_MODE = config.DEFAULT_CACHE_MODE
+    if args.cache_backend is not None:
+        config.CACHE_BACKEND = args.cache_backend
+    if config.CACHE_BACKEND is not None and config.CACHE_BACKEND not in CACHE_BACKENDS:
+        print(f"⚠️  未知的缓存后端 {config.CACHE_BACKEND}，使用 {DEFAULT_CACHE_BACKEND}")
+        config.CACHE_BACKEND = DEFAULT_CACHE_BACKEND
+    if args.pool_size is not None:
+        config.HTTP_POOL_SIZE = args.pool_size
+    if args.api_url:
+        config.API_BASE_URL = args.api_url.rstrip('/')
+    if args.backend is not None:
+        config.FETCH_BACKEND = args.backend
+    if config.FETCH_BACKEND not in FETCH_BACKENDS:
+        print(f"⚠️  未知的数据获取方式 {config.FETCH_BACKEND}，使用 rest")
+        config.FETCH_BACKEND = 'rest'
+    
+    discovery = get_discovery_settings()
+    if args.discover:
+        discovery['enabled'] = True
+    
+    print("=" * 60)
+    print(f"🧰 {config.USERNAME}'s Toolbox 生成器")
+    print("=" * 60)
+    if discovery['enabled']:
+        accounts = discovery['users'] + discovery['orgs']
+        print(f"📋 目标仓库: 自动发现 ({', '.join(accounts)})")
+    else:
+        print(f"📋 目标仓库 ({len(config.REPO_LIST)} 个): {', '.join(config.REPO_LIST)}")
+    print(f"⚙️  并发数: {config.MAX_WORKERS} | 连接池: {get_http_pool_size()} | "
+          f"缓存: {config.CACHE_BACKEND or DEFAULT_CACHE_BACKEND}/{config.CACHE_MODE}")
+    print(f"🌐 API地址: {config.API_BASE_URL} | 获取方式: {config.FETCH_BACKEND}")
+    print("-" * 60)
+    
+    # 分析所有仓库
+    all_repositories = []
+    successful_repos = 0
+    
+    incremental = bool(config.INCREMENTAL)
+    manifest_file = config.MANIFEST_FILE or DEFAULT_MANIFEST_FILE
+    manifest = load_manifest(manifest_file) if incremental else {'outputs': {}, 'repositories': {}}
+    load_description_memo(manifest.get('readme_descriptions'))
+    reusable_entries = manifest['repositories'] if incremental and not args.full else {}
+    with METRICS.phase('analyze'):
+        repo_names, results, new_manifest_entries = run_analysis(discovery, reusable_entries, incremental)
+    for repo_name, repo_info in zip(repo_names, results):
+        if repo_info:
+            all_repositories.append(repo_info)
+            successful_repos += 1
+        else:
+            print(f"  ❌ 跳过仓库: {repo_name}")
+    
+    print("-" * 60)
+    
+    metrics_file = args.metrics or config.METRICS_FILE or DEFAULT_METRICS_FILE
+    # 检查是否有成功分析的仓库
+    if successful_repos == 0:
+        print("❌ 错误：没有成功分析任何仓库。")
+        print("可能的原因:")
+        print("  1. GitHub令牌无效或权限不足")
+        print("  2. 仓库不存在或不是公开仓库")
+        print("  3. 网络连接问题")
+        print("  4. API速率限制")
+        write_metrics(metrics_file, CACHE_STATS, profiler.stop())
+        sys.exit(1)
+    
+    outputs = manifest.setdefault('outputs', {})
+    # stale-while-revalidate：先用缓存数据生成输出，同时在后台刷新本次用到的过期缓存
+    stale_endpoints = pop_stale_endpoints()
+    refresh_job = None
+    if stale_endpoints:
+        budget = DEFAULT_REFRESH_BUDGET if config.REFRESH_BUDGET is None else float(config.REFRESH_BUDGET)
+        print(f"⏳ {len(stale_endpoints)} 个端点使用了过期缓存，后台刷新中（预算 {budget:g} 秒）")
+        refresh_job = BackgroundRefresh(stale_endpoints, budget, config.MAX_WORKERS)
+    stale_repos = {get_endpoint_repo(endpoint) for endpoint in stale_endpoints}
+    # 汇总统计只计算一次，README、JSON索引与摘要共用
+    stats = compute_statistics(all_repositories)
+    stats.stale_repositories = sorted(repo.name for repo in all_repositories if repo.name.lower() in stale_repos)
+    apply_trends(all_repositories, stats)
+    written = write_outputs(all_repositories, stats, outputs)
+    
+    if refresh_job is not None:
+        refreshed = refresh_job.wait()
+        changed = refreshed['changed']
+        print(f"🔄 后台刷新完成: {len(changed)} 个仓库的数据有变化，{len(refreshed['pending'])} 个未能在预算内刷新")
+        if changed or len(refreshed['pending']) < len(stale_repos):
+            # 只重新分析数据有变化的仓库（刷新后的数据已在缓存中），其余沿用已有结果
+            keep = {repo.name.lower(): repo for repo in all_repositories if repo.name.lower() not in changed}
+            with METRICS.phase('analyze'):
+                repo_names, results, new_manifest_entries = run_analysis(discovery, {}, incremental, keep)
+            pop_stale_endpoints()
+            all_repositories = [repo_info for repo_info in results if repo_info]
+            successful_repos = len(all_repositories)
+            stats = compute_statistics(all_repositories)
+            stats.stale_repositories = sorted(
+                repo.name for repo in all_repositories if repo.name.lower() in refreshed['pending']
+            )
+            apply_trends(all_repositories, stats)
+            for path, path_written in write_outputs(all_repositories, stats, outputs).items():
+                written[path] = written[path] or path_written
+    
+    record_history(all_repositories)
+    
+    if incremental:
+        manifest['repositories'] = new_manifest_entries
+        manifest['readme_descriptions'] = dump_description_memo(repo.readme_sha for repo in all_repositories)
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    
+    # 生成摘要报告
+    print("-" * 60)
+    print("🎉 生成完成！")
+    print("=" * 60)
+    print(f"✅ 成功分析: {successful_repos}/{len(repo_names)} 个仓库")
+    print(f"⭐ 总星标数: {stats.total_stars}")
+    print(f"🍴 总Fork数: {stats.total_forks}")
+    print(f"🔧 涉及语言: {len(stats.primary_languages)} 种")
+    print(f"💾 API缓存: 已验证(304) {CACHE_STATS['revalidated']} | 直接使用缓存 {CACHE_STATS['cached']} | "
+          f"重新获取 {CACHE_STATS['refetched']} | 未缓存 {CACHE_STATS['miss']} | 使用过期缓存 {CACHE_STATS['stale']}")
+    for line in get_rate_limiter().summary():
+        print(f"🔑 {line}")
+    print("")
+    print("📁 生成的文件:")
+    for path, path_written in written.items():
+        print(f"  • {path} ({'已更新' if path_written else '内容未变化'})")
+    write_metrics(metrics_file, CACHE_STATS, profiler.stop())
+    print(f"  • {metrics_file} (运行指标)")
+    print("")
+    print("🚀 下一步:")
+    print("  1. 检查 README.md 文件内容")
+    print("  2. 提交更改到GitHub: git add . && git commit -m '更新工具箱'")
+    print("  3. 推送: git push origin main")
+    print("=" * 60)
+def run(argv: Optional[List[str]] = None):
+    """
+    脚本入口：处理中断与未捕获的异常
+    """
+    try:
+        main(argv)
+    except KeyboardInterrupt:
+        print("\n\n⚠️ 用户中断操作。")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n❌ 程序运行出错: {e}")
+        print("错误类型:", type(e).__name__)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,385 @@
+"""
+GitHub API 客户端：共享 HTTP 会话、速率限制调度、带缓存的 REST 请求与 GraphQL 请求
+requests 在首次发请求时才导入，导入本模块本身不做任何网络或文件操作
+"""
+import json
+import time
+import base64
+import binascii
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Any, Tuple
+
+from . import config
+from .cache import (
+    SWR_CACHE_MODE, get_cache_store, get_endpoint_class, is_cache_fresh, mark_stale_endpoint, record_cache_event,
+)
+from .graphql import get_graphql_url
+from .metrics import METRICS
+from .ratelimit import get_rate_limiter, mask_token
+from .retry import get_circuit_breaker, get_retry_after, is_retryable, is_secondary_rate_limit, wait_before_retry
+
+if TYPE_CHECKING:
+    import requests
+
+# ========== HTTP 会话 ==========
+# 所有 GitHub 请求共用一个带连接池的会话，复用 TCP/TLS 连接（keep-alive），
+# 通用请求头也统一在会话上设置。
+_http_session: Optional['requests.Session'] = None
+_http_session_lock = threading.Lock()
+
+def get_http_pool_size() -> int:
+    """
+    连接池大小：未配置时按并发数估算（仓库线程 + 端点线程）
+    """
+    if config.HTTP_POOL_SIZE:
+        return max(1, int(config.HTTP_POOL_SIZE))
+    return max(10, config.MAX_WORKERS * 3)
+def get_http_session() -> 'requests.Session':
+    """
+    获取共享的HTTP会话（首次调用时创建）
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            # Authorization 由速率限制调度器按请求选择令牌后设置
+            session.headers.update({
+                'Accept': 'application/vnd.github.v3+json',
+                'User-Agent': 'Toolbox-Auto-Generator'
+            })
+            pool_size = get_http_pool_size()
+            # 重试由 call_github_api 自行处理，这里不让 urllib3 重试
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
+def is_rate_limited(response: 'requests.Response') -> bool:
+    """
+    是否为主速率限制响应（额度用完）
+    """
+    return response.status_code in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0'
+def send_github_request(method: str, url: str, resource: str = 'core',
+                        headers: Optional[Dict[str, str]] = None, max_wait: Optional[float] = None,
+                        **kwargs) -> Optional['requests.Response']:
+    """
+    通过调度器选择令牌发送请求；遇到速率限制时换令牌或等待重置后重发
+    所有令牌额度都无法在等待上限内恢复时返回None（max_wait 见 RateLimitScheduler.acquire）
+    """
+    scheduler = get_rate_limiter()
+    session = get_http_session()
+    endpoint_class = 'graphql' if resource == 'graphql' else get_endpoint_class(url[len(config.API_BASE_URL):])
+    while True:
+        token = scheduler.acquire(resource, max_wait)
+        if token is None:
+            return None
+        request_headers = dict(headers or {})
+        request_headers['Authorization'] = f'token {token}'
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, headers=request_headers, **kwargs)
+        except Exception:
+            METRICS.record_request(endpoint_class, time.perf_counter() - start, None)
+            raise
+        # 流式响应的正文由调用方按需读取，字节数在读取时另行记录
+        size = 0 if kwargs.get('stream') else len(response.content)
+        METRICS.record_request(endpoint_class, time.perf_counter() - start, response.status_code, size)
+        scheduler.update(token, response.headers, resource)
+        if not is_rate_limited(response):
+            return response
+        
+        METRICS.count('rate_limited')
+        reset = response.headers.get('X-RateLimit-Reset')
+        scheduler.mark_exhausted(token, resource, float(reset) if reset and reset.isdigit() else None)
+        print(f"  ⏳ 令牌 {mask_token(token)} 额度已用完，切换令牌或等待重置")
+# ========== GitHub API 函数 ==========
+# README 以 raw 媒体类型获取（不经过 base64 JSON 包装），流式读取到字节上限即停止；
+# 描述只取自开头的段落，缓存中也只保存读到的部分。
+RAW_MEDIA_TYPE = 'application/vnd.github.raw'
+DEFAULT_README_MAX_BYTES = 64 * 1024
+# 流式（raw）响应出错时只读取这么多字节的正文，足以识别 403 二级限流提示
+ERROR_BODY_MAX_BYTES = 4096
+
+def read_capped_body(response: 'requests.Response', max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    流式读取响应正文，最多 max_bytes 字节（0 表示不限制），返回 (正文, 是否被截断)
+    """
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=8192):
+            if max_bytes and size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+    finally:
+        response.close()  # 截断时丢弃剩余正文，不再下载
+    body = b''.join(chunks)
+    METRICS.count('bytes_downloaded', len(body))
+    return body, truncated
+def build_raw_readme_data(body: bytes, truncated: bool) -> Dict[str, Any]:
+    """
+    将 raw README 正文整理为缓存数据；截断时去掉最后一个不完整的行
+    sha 为所保存内容的 SHA-1，用于记忆描述提取结果
+    """
+    if truncated and b'\n' in body:
+        body = body[:body.rindex(b'\n') + 1]
+    return {
+        'encoding': 'raw',
+        'content': body.decode('utf-8', errors='ignore'),
+        'truncated': truncated,
+        'sha': hashlib.sha1(body).hexdigest(),
+    }
+def call_github_api(endpoint: str, retries: int = 2, raw_max_bytes: Optional[int] = None,
+                    timeout: float = 30, revalidate: bool = False,
+                    max_wait: Optional[float] = None) -> Optional[Dict[str, Any]]:  # 添加重试参数
+    """
+    调用GitHub API，增加超时和重试机制（退避与熔断见 retry.py）
+    有缓存时发送条件请求（If-None-Match / If-Modified-Since）重新验证；
+    请求失败时退回使用已有缓存
+    raw_max_bytes 不为None时以 raw 媒体类型请求，流式读取最多该字节数的正文
+    （0 表示不限制），返回 build_raw_readme_data() 格式的数据
+    revalidate 为真时忽略缓存有效期与缓存策略，总是发出条件请求（后台刷新使用）
+    max_wait 为等待速率限制额度的上限（秒），None 时使用 rate_limit_max_wait
+    """
+    import requests  # 延迟导入，仅在真正发请求时加载
+    url = f"{config.API_BASE_URL}{endpoint}"
+    headers = {}  # 仅存放本次请求特有的请求头（条件请求、媒体类型）
+    raw = raw_max_bytes is not None
+    if raw:
+        headers['Accept'] = RAW_MEDIA_TYPE
+
+    cache = get_cache_store()
+    cache_entry = cache.get(endpoint)
+    if cache_entry is not None:
+        # prefer-cache 模式或缓存仍在有效期内：直接使用，不发请求
+        if not revalidate and (config.CACHE_MODE == 'prefer-cache' or is_cache_fresh(cache_entry, endpoint)):
+            print(f"  💾 从缓存加载: {endpoint}")
+            record_cache_event('cached')
+            return cache_entry['data']
+        # stale-while-revalidate 模式：先使用过期缓存，稍后在后台刷新
+        if not revalidate and config.CACHE_MODE == SWR_CACHE_MODE:
+            print(f"  💾 使用过期缓存（稍后刷新）: {endpoint}")
+            record_cache_event('cached')
+            mark_stale_endpoint(endpoint)
+            return cache_entry['data']
+        if cache_entry['etag']:
+            headers['If-None-Match'] = cache_entry['etag']
+        if cache_entry['last_modified']:
+            headers['If-Modified-Since'] = cache_entry['last_modified']
+    
+    endpoint_class = get_endpoint_class(endpoint)
+    breaker = get_circuit_breaker()
+    for attempt in range(retries + 1):
+        if not breaker.allow(endpoint_class):
+            print(f"  🔌 {endpoint_class} 请求已熔断，跳过: {endpoint}")
+            break
+        try:
+            # 将超时时间从10秒增加到30秒
+            response = send_github_request('GET', url, headers=headers, max_wait=max_wait, timeout=timeout, stream=raw)
+            if response is None:
+                break
+            body = None  # 403 时用于区分二级限流与权限不足
+            if raw and response.status_code != 200:
+                if response.status_code == 403:
+                    chunk = next(response.iter_content(ERROR_BODY_MAX_BYTES), b'')
+                    body = chunk.decode('utf-8', errors='replace')
+                response.close()
+            elif response.status_code == 403:
+                body = response.text
+            
+            # 5xx、429 与二级限流：计入断路器，按 Retry-After 或退避时间等待后重试
+            if is_retryable(response, body):
+                print(f"  ⚠️ API请求失败 ({endpoint}): HTTP {response.status_code} (尝试 {attempt+1}/{retries+1})")
+                METRICS.count('rate_limited' if is_secondary_rate_limit(response, body) else 'errors')
+                breaker.record_failure(endpoint_class)
+                if attempt < retries and wait_before_retry(attempt, get_retry_after(response)):
+                    continue
+                break
+            breaker.record_success(endpoint_class)
+            
+            # 缓存仍然有效：304 不消耗速率限制
+            if response.status_code == 304 and cache_entry is not None:
+                print(f"  💾 缓存已验证: {endpoint}")
+                record_cache_event('revalidated')
+                # 刷新缓存时间，重新开始计算有效期
+                cache.set(
+                    endpoint, cache_entry['data'],
+                    response.headers.get('ETag') or cache_entry['etag'],
+                    response.headers.get('Last-Modified') or cache_entry['last_modified']
+                )
+                return cache_entry['data']
+            
+            # 检查HTTP状态
+            if response.status_code == 403:
+                print(f"  ⚠️ API限制或令牌权限不足: {response.status_code}")
+                break
+            elif response.status_code == 404:
+                print(f"  ⚠️ 仓库不存在: {endpoint}")
+                return None
+            elif response.status_code != 200:
+                # 其余 4xx 重试也不会成功
+                print(f"  ⚠️ API请求失败 ({endpoint}): HTTP {response.status_code}")
+                METRICS.count('errors')
+                break
+                
+            # 请求成功，解析数据
+            data = build_raw_readme_data(*read_capped_body(response, raw_max_bytes)) if raw else response.json()
+            
+            # 仅当数据有效时才写入缓存，同时保存验证信息
+            if data is not None:  # 关键判断：确保不是None
+                cache.set(
+                    endpoint, data,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified')
+                )
+                record_cache_event('refetched' if cache_entry is not None else 'miss')
+            
+            return data
+            
+        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError) as e:
+            # requests 的 JSONDecodeError 同时继承 RequestException，必须先于网络错误捕获，避免重试并计入熔断
+            print(f"  ⚠️ JSON解析失败 ({endpoint}): {e}")
+            break
+        except requests.exceptions.Timeout:
+            print(f"  ⚠️ API请求超时 (尝试 {attempt+1}/{retries+1}): {endpoint}")
+            METRICS.count('timeouts')
+            breaker.record_failure(endpoint_class)
+            if attempt < retries and wait_before_retry(attempt):
+                continue
+            print(f"  ❌ 重试多次后仍失败: {endpoint}")
+            break
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠️ 网络请求失败 (尝试 {attempt+1}/{retries+1}): {e}")
+            METRICS.count('errors')
+            breaker.record_failure(endpoint_class)
+            if attempt < retries and wait_before_retry(attempt):
+                continue
+            break
+    
+    # 请求失败时退回使用已有缓存（可能已过期）
+    if cache_entry is not None:
+        print(f"  💾 请求失败，使用已有缓存: {endpoint}")
+        record_cache_event('stale')
+        return cache_entry['data']
+    
+    return None
+def get_repository_info(owner: str, repo_name: str) -> Optional[Dict[str, Any]]:
+    """
+    获取仓库基本信息
+    """
+    return call_github_api(f"/repos/{owner}/{repo_name}")
+def get_repository_readme(owner: str, repo_name: str) -> str:
+    """
+    获取仓库的README内容
+    """
+    return get_repository_readme_blob(owner, repo_name)[0]
+def get_readme_max_bytes() -> int:
+    """
+    README 读取上限（字节），0 表示不限制
+    """
+    return DEFAULT_README_MAX_BYTES if config.README_MAX_BYTES is None else max(0, int(config.README_MAX_BYTES))
+def build_readme_blob(body: bytes) -> Tuple[str, Optional[str]]:
+    """
+    按 readme_max_bytes 截断完整的 README 正文，返回 (内容, SHA)
+    与流式读取 raw README 的截断与 SHA 规则相同，本地检出与 GraphQL 的描述提取结果可与 REST 共用
+    """
+    if not body:
+        return "", None
+    max_bytes = get_readme_max_bytes()
+    truncated = bool(max_bytes) and len(body) > max_bytes
+    data = build_raw_readme_data(body[:max_bytes] if truncated else body, truncated)
+    return data['content'], data['sha']
+def get_repository_readme_blob(owner: str, repo_name: str) -> Tuple[str, Optional[str]]:
+    """
+    获取仓库的README内容（最多 readme_max_bytes 字节）及其 SHA（用于记忆描述提取结果）
+    """
+    data = call_github_api(f"/repos/{owner}/{repo_name}/readme", raw_max_bytes=get_readme_max_bytes())
+    if not data:
+        return "", None
+    
+    if data.get('encoding') == 'raw':
+        return data.get('content') or "", data.get('sha')
+    
+    # 旧版缓存中的 base64 JSON 格式
+    if data.get('encoding') == 'base64':
+        try:
+            content = base64.b64decode(data['content']).decode('utf-8', errors='ignore')
+            return content, data.get('sha')
+        except (binascii.Error, UnicodeDecodeError) as e:  # <-- 修改这里
+            print(f"  ⚠️ README解码失败: {e}")
+            return "", None
+    
+    return "", None
+def get_repository_languages(owner: str, repo_name: str) -> Dict[str, int]:
+    """
+    获取仓库使用的编程语言统计
+    """
+    data = call_github_api(f"/repos/{owner}/{repo_name}/languages")
+    return data if data else {}
+def call_github_graphql(query: str, variables: Dict[str, Any], retries: int = 2) -> Optional[Dict[str, Any]]:
+    """
+    调用GitHub GraphQL API，返回 data 部分（允许部分仓库出错）
+    """
+    import requests  # 延迟导入，仅在真正发请求时加载
+    payload = {'query': query, 'variables': variables}
+    
+    breaker = get_circuit_breaker()
+    for attempt in range(retries + 1):
+        if not breaker.allow('graphql'):
+            print("  🔌 graphql 请求已熔断，跳过")
+            return None
+        try:
+            response = send_github_request('POST', get_graphql_url(), resource='graphql', json=payload, timeout=60)
+            if response is None:
+                return None
+            body = response.text if response.status_code == 403 else None
+            
+            if is_retryable(response, body):
+                print(f"  ⚠️ GraphQL请求失败: HTTP {response.status_code} (尝试 {attempt+1}/{retries+1})")
+                METRICS.count('rate_limited' if is_secondary_rate_limit(response, body) else 'errors')
+                breaker.record_failure('graphql')
+                if attempt < retries and wait_before_retry(attempt, get_retry_after(response)):
+                    continue
+                return None
+            breaker.record_success('graphql')
+            
+            if response.status_code in (401, 403):
+                print(f"  ⚠️ GraphQL请求被拒绝: HTTP {response.status_code}")
+                return None
+            elif response.status_code != 200:
+                print(f"  ⚠️ GraphQL请求失败: HTTP {response.status_code}")
+                METRICS.count('errors')
+                return None
+            
+            result = response.json()
+            for error in result.get('errors') or []:
+                # NOT_FOUND 等单仓库错误不影响同批其他仓库
+                print(f"  ⚠️ GraphQL错误: {error.get('message', error)}")
+            return result.get('data')
+            
+        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError) as e:
+            print(f"  ⚠️ GraphQL响应解析失败: {e}")
+            return None
+        except requests.exceptions.Timeout:
+            print(f"  ⚠️ GraphQL请求超时 (尝试 {attempt+1}/{retries+1})")
+            METRICS.count('timeouts')
+            breaker.record_failure('graphql')
+            if attempt < retries and wait_before_retry(attempt):
+                continue
+            return None
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠️ GraphQL网络请求失败 (尝试 {attempt+1}/{retries+1}): {e}")
+            METRICS.count('errors')
+            breaker.record_failure('graphql')
+            if attempt < retries and wait_before_retry(attempt):
+                continue
+            return None
+    
+    return None
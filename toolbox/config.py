@@ -0,0 +1,127 @@
+"""
+运行配置：令牌、用户名以及 config.json 中的各项设置
+导入本模块不做任何工作；由入口调用 load_env() 与 load_config() 填充
+"""
+import os
+import json
+from typing import List, Optional
+
+# ========== 配置部分 ==========
+DEFAULT_API_BASE_URL = 'https://api.github.com'
+CONFIG_FILE = 'config.json'
+DEFAULT_MAX_WORKERS = 4  # 默认同时分析的仓库数量
+DEFAULT_CACHE_MODE = 'revalidate'  # revalidate: 条件请求验证缓存; prefer-cache: 有缓存直接使用; stale-while-revalidate: 见 refresh.py
+DEFAULT_USERNAME = 'DaiZhouHui'
+DEFAULT_REPO_LIST = ["NodeWeb", "CustomNode", "50DayChallenge"]
+
+# 以下为默认值，load_env() / load_config() 调用后被覆盖
+GITHUB_TOKEN: Optional[str] = None
+GITHUB_TOKENS: List[str] = []
+WEBHOOK_SECRET: Optional[str] = None
+USERNAME = DEFAULT_USERNAME
+REPO_LIST = list(DEFAULT_REPO_LIST)
+MAX_WORKERS = DEFAULT_MAX_WORKERS
+CACHE_MODE = DEFAULT_CACHE_MODE
+API_BASE_URL = DEFAULT_API_BASE_URL
+HTTP_POOL_SIZE = None  # None 表示按并发数自动计算
+FETCH_BACKEND = 'rest'
+GRAPHQL_BATCH_SIZE = None
+CACHE_BACKEND = None
+CACHE_PATH = None
+CACHE_MAX_BYTES = None
+CACHE_TTL = {}
+DISCOVERY = {}
+INCREMENTAL = False
+MANIFEST_FILE = None
+RATE_LIMIT_RESERVE = None
+RATE_LIMIT_MAX_WAIT = None
+RETRY_MAX_WAIT = None  # 单次重试最长等待（秒），None 表示 60
+CIRCUIT_BREAKER_THRESHOLD = None  # 端点类别连续失败多少次后熔断，None 表示 5
+CIRCUIT_BREAKER_COOLDOWN = None  # 熔断后的冷却时间（秒），None 表示 30
+METRICS_FILE = None
+README_MAX_BYTES = None
+SEARCH_INDEX_FILE = None  # None 使用默认文件名，false 不生成检索索引
+BINARY_INDEX_FILE = None  # None 使用默认文件名，false 不生成二进制索引
+LOCAL_TOOLS_DIR = None  # local 获取方式读取的子模块目录，None 表示 tools
+REFRESH_BUDGET = None  # stale-while-revalidate 模式的后台刷新预算（秒）
+ACCOUNTS: List[dict] = []  # 多账号配置，每项 {"username": ..., "repositories": [...], 其他覆盖项}
+SHARDS_DIR = None  # 各账号分片输出目录的上级目录，None 表示 accounts
+HISTORY_DIR = None  # 快照历史目录，None 使用默认目录，false 不记录历史
+
+def load_env():
+    """
+    加载 .env 文件并从环境变量读取GitHub令牌和用户名
+    """
+    global GITHUB_TOKEN, GITHUB_TOKENS, USERNAME, WEBHOOK_SECRET
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()  # 加载.env文件中的环境变量
+    except ImportError:
+        pass  # 未安装 python-dotenv 时只使用已有环境变量
+
+    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+    # 可选：GITHUB_TOKENS 以逗号分隔配置多个令牌，请求时轮换使用
+    GITHUB_TOKENS = [token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()]
+    if GITHUB_TOKEN and GITHUB_TOKEN not in GITHUB_TOKENS:
+        GITHUB_TOKENS.insert(0, GITHUB_TOKEN)
+    GITHUB_TOKEN = GITHUB_TOKEN or (GITHUB_TOKENS[0] if GITHUB_TOKENS else None)
+    USERNAME = os.getenv('GITHUB_USERNAME', DEFAULT_USERNAME)
+    # webhook 接收器校验签名用的密钥（与 GitHub webhook 设置中的 Secret 相同）
+    WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET')
+def load_config(path: str = CONFIG_FILE, account: Optional[str] = None):
+    """
+    从 config.json 配置文件读取要分析的仓库列表及各项设置
+    指定 account 时，用 accounts 中该账号的配置项覆盖顶层配置（未找到时抛出 ValueError）
+    """
+    global CONFIG_FILE, USERNAME, REPO_LIST, MAX_WORKERS, CACHE_MODE, API_BASE_URL, HTTP_POOL_SIZE
+    global FETCH_BACKEND, GRAPHQL_BATCH_SIZE, CACHE_BACKEND, CACHE_PATH, CACHE_MAX_BYTES, CACHE_TTL
+    global DISCOVERY, INCREMENTAL, MANIFEST_FILE, RATE_LIMIT_RESERVE, RATE_LIMIT_MAX_WAIT, METRICS_FILE
+    global README_MAX_BYTES, SEARCH_INDEX_FILE, BINARY_INDEX_FILE, LOCAL_TOOLS_DIR, REFRESH_BUDGET
+    global ACCOUNTS, SHARDS_DIR, HISTORY_DIR, RETRY_MAX_WAIT, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+    CONFIG_FILE = path
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        print(f"✅ 已从 {CONFIG_FILE} 加载配置。")
+    except FileNotFoundError:
+        print(f"⚠️  未找到配置文件 {CONFIG_FILE}，使用默认配置。")
+        config = {'repositories': list(DEFAULT_REPO_LIST)}
+
+    ACCOUNTS = [entry for entry in config.get('accounts', []) if isinstance(entry, dict) and entry.get('username')]
+    SHARDS_DIR = config.get('shards_dir')
+    if account is not None:
+        entry = next((entry for entry in ACCOUNTS if entry['username'].lower() == account.lower()), None)
+        if entry is None:
+            raise ValueError(f"配置文件中没有账号 {account}")
+        overrides = {key: value for key, value in entry.items() if key != 'username'}
+        config = {**config, 'repositories': [], **overrides, 'github_username': entry['username']}
+
+    USERNAME = config.get('github_username', DEFAULT_USERNAME)
+    REPO_LIST = config.get('repositories', [])
+    MAX_WORKERS = config.get('max_workers', DEFAULT_MAX_WORKERS)
+    CACHE_MODE = config.get('cache_mode', DEFAULT_CACHE_MODE)
+    API_BASE_URL = config.get('api_base_url', DEFAULT_API_BASE_URL)
+    HTTP_POOL_SIZE = config.get('http_pool_size')
+    FETCH_BACKEND = config.get('fetch_backend', 'rest')
+    GRAPHQL_BATCH_SIZE = config.get('graphql_batch_size')
+    CACHE_BACKEND = config.get('cache_backend')
+    CACHE_PATH = config.get('cache_path')
+    CACHE_MAX_BYTES = config.get('cache_max_bytes')
+    CACHE_TTL = config.get('cache_ttl', {})
+    DISCOVERY = config.get('discovery', {})
+    INCREMENTAL = config.get('incremental', False)
+    MANIFEST_FILE = config.get('manifest_file')
+    RATE_LIMIT_RESERVE = config.get('rate_limit_reserve')
+    RATE_LIMIT_MAX_WAIT = config.get('rate_limit_max_wait')
+    RETRY_MAX_WAIT = config.get('retry_max_wait')
+    CIRCUIT_BREAKER_THRESHOLD = config.get('circuit_breaker_threshold')
+    CIRCUIT_BREAKER_COOLDOWN = config.get('circuit_breaker_cooldown')
+    METRICS_FILE = config.get('metrics_file')
+    README_MAX_BYTES = config.get('readme_max_bytes')
+    SEARCH_INDEX_FILE = config.get('search_index_file')
+    BINARY_INDEX_FILE = config.get('binary_index_file')
+    LOCAL_TOOLS_DIR = config.get('local_tools_dir')
+    REFRESH_BUDGET = config.get('refresh_budget')
+    HISTORY_DIR = config.get('history_dir')
+    # 环境变量优先（GitHub Actions 会自动设置 GITHUB_API_URL；本地测试可指向模拟服务器）
+    API_BASE_URL = os.getenv('GITHUB_API_URL', API_BASE_URL).rstrip('/')
@@ -0,0 +1,92 @@
+"""
+账号仓库发现：分页遍历用户/组织的仓库列表并按条件过滤
+"""
+import fnmatch
+from typing import List, Dict, Any
+
+from . import config
+from .client import call_github_api
+
+# ========== 账号仓库发现 ==========
+# 分页遍历 /users/{user}/repos 与 /orgs/{org}/repos（每页100个），列表响应已包含
+# 分析所需的大部分字段，只有 README（以及可选的语言统计）需要额外请求。
+DISCOVERY_PAGE_SIZE = 100
+DEFAULT_DISCOVERY = {
+    'enabled': False,
+    'users': [],                # 为空时使用 github_username
+    'orgs': [],
+    'include_archived': False,
+    'include_forks': False,
+    'topics': [],               # 非空时只保留至少包含其中一个主题的仓库
+    'include': ['*'],           # 仓库名通配符（fnmatch）
+    'exclude': [],
+    'fetch_languages': False,   # 是否为每个仓库额外请求语言统计
+}
+
+def get_discovery_settings() -> Dict[str, Any]:
+    """
+    合并默认值与 config.json 中的 discovery 配置
+    """
+    settings = {**DEFAULT_DISCOVERY, **(config.DISCOVERY or {})}
+    if not settings['users'] and not settings['orgs']:
+        settings['users'] = [config.USERNAME]
+    return settings
+def iter_account_repositories(kind: str, account: str):
+    """
+    按页流式返回账号下的仓库（kind 为 users 或 orgs）
+    """
+    page = 1
+    while True:
+        endpoint = f"/{kind}/{account}/repos?per_page={DISCOVERY_PAGE_SIZE}&page={page}&sort=full_name"
+        data = call_github_api(endpoint)
+        if data is None:
+            print(f"  ⚠️  获取 {account} 的仓库列表第 {page} 页失败，后续仓库将被忽略")
+            return
+        if not isinstance(data, list):
+            print(f"  ⚠️  {account} 的仓库列表格式异常: {type(data)}")
+            return
+        
+        for item in data:
+            if isinstance(item, dict) and item.get('name'):
+                yield item
+        
+        if len(data) < DISCOVERY_PAGE_SIZE:
+            return
+        page += 1
+def repo_matches_filters(item: Dict[str, Any], settings: Dict[str, Any]) -> bool:
+    """
+    判断列表中的仓库是否满足发现过滤条件
+    """
+    name = item.get('name', '')
+    if item.get('archived') and not settings['include_archived']:
+        return False
+    if item.get('fork') and not settings['include_forks']:
+        return False
+    if settings['topics']:
+        topics = item.get('topics') or []
+        if not any(topic in topics for topic in settings['topics']):
+            return False
+    if not any(fnmatch.fnmatch(name, pattern) for pattern in settings['include']):
+        return False
+    if any(fnmatch.fnmatch(name, pattern) for pattern in settings['exclude']):
+        return False
+    return True
+def discover_repositories(settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    遍历配置的用户与组织，返回满足条件的仓库列表数据（按账号顺序、仓库全名排序，去重）
+    """
+    discovered = []
+    seen = set()
+    accounts = [('users', user) for user in settings['users']] + [('orgs', org) for org in settings['orgs']]
+    for kind, account in accounts:
+        print(f"🔎 发现仓库: {account}")
+        matched = 0
+        for item in iter_account_repositories(kind, account):
+            full_name = (item.get('full_name') or f"{account}/{item['name']}").lower()
+            if full_name in seen or not repo_matches_filters(item, settings):
+                continue
+            seen.add(full_name)
+            discovered.append(item)
+            matched += 1
+        print(f"  ✅ {account}: {matched} 个仓库符合条件")
+    return discovered
@@ -0,0 +1,142 @@
+"""
+README 描述提取
+"""
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# ========== README分析函数 ==========
+# 逐行流式扫描README：跟踪代码块（``` / ~~~）与HTML注释，找到带关键词的描述后立即停止；
+# 没有找到时扫描到内容末尾（README 已按 readme_max_bytes 截断），再使用第一段足够长的文本。
+DESCRIPTIVE_KEYWORDS = ('是一个', '用于', '提供', '支持', '基于', '实现', '可以帮助')
+KEYWORD_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in DESCRIPTIVE_KEYWORDS))
+# 关键词候选跳过的行首（标题、图片、链接、表格、引用、列表等）
+CANDIDATE_SKIP_PREFIXES = ('#', '!', '[', '```', '<!--', '---', '|', '>', '- ', '* ', '1.')
+# 备选候选（第一段足够长的文本）跳过的行首
+FALLBACK_SKIP_PREFIXES = ('#', '!', '[', '```', '<!--')
+FENCE_PATTERN = re.compile(r'(`{3,}|~{3,})')
+# 清理Markdown格式
+IMAGE_PATTERN = re.compile(r'!\[.*?\]\(.*?\)')
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+CODE_PATTERN = re.compile(r'`([^`]+)`')
+BOLD_PATTERN = re.compile(r'\*\*([^*]+)\*\*')
+ITALIC_PATTERN = re.compile(r'\*([^*]+)\*')
+# 提取结果按README内容的SHA记忆在内存中，README未变化时不再重新分析；
+# 增量模式下随清单的 readme_descriptions 持久化（只保留当前仓库用到的SHA），
+# 提取规则变化时递增版本号使旧结果失效
+DESCRIPTION_MEMO_VERSION = 2
+_description_memo: Dict[str, Optional[str]] = {}
+_description_memo_lock = threading.Lock()
+
+def iter_lines(text: str) -> Iterator[str]:
+    """
+    按需逐行返回文本，不预先切分整个字符串
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+def clean_description(description: str) -> str:
+    """
+    移除Markdown格式并限制长度
+    """
+    description = IMAGE_PATTERN.sub('', description)  # 移除图片
+    description = LINK_PATTERN.sub(r'\1', description)  # 移除链接保留文本
+    description = CODE_PATTERN.sub(r'\1', description)  # 移除代码标记
+    description = BOLD_PATTERN.sub(r'\1', description)  # 移除粗体
+    description = ITALIC_PATTERN.sub(r'\1', description)  # 移除斜体
+
+    # 限制长度
+    if len(description) > 180:
+        description = description[:177] + '...'
+    return description
+def find_readme_description(readme_content: str) -> Optional[str]:
+    """
+    单遍扫描README寻找描述：优先带描述性关键词的段落，其次第一段足够长的文本
+    代码块与HTML注释中的内容不作为描述；没有候选时返回None
+    """
+    fallback = None
+    fence = None
+    in_comment = False
+    for raw_line in iter_lines(readme_content):
+        line = raw_line.strip()
+
+        # 跳过代码块与HTML注释内部
+        if in_comment:
+            if '-->' in line:
+                in_comment = False
+            continue
+        if fence:
+            match = FENCE_PATTERN.match(line)
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence) and not line[len(match.group(1)):].strip():
+                fence = None
+            continue
+        if not line:
+            continue
+        match = FENCE_PATTERN.match(line)
+        if match:
+            fence = match.group(1)
+            continue
+        if line.startswith('<!--'):
+            in_comment = '-->' not in line[4:]
+            continue
+
+        # 带描述性关键词的段落：找到即停止
+        if len(line) >= 25 and not line.startswith(CANDIDATE_SKIP_PREFIXES) and KEYWORD_PATTERN.search(line):
+            return clean_description(line)
+
+        # 记录第一段足够长的文本作为备选
+        if fallback is None and 30 < len(line) < 200 and not line.startswith(FALLBACK_SKIP_PREFIXES):
+            fallback = line
+
+    return clean_description(fallback) if fallback is not None else None
+def extract_description_from_readme(readme_content: str, repo_name: str, sha: Optional[str] = None) -> str:
+    """
+    从README内容中智能提取项目描述
+    提供 sha（README的blob SHA）时复用之前对同一内容的提取结果
+    """
+    if not readme_content or readme_content.isspace():
+        return f"{repo_name} - 一个实用的开发工具项目"
+
+    description = get_memoized_description(readme_content, sha) if sha else find_readme_description(readme_content)
+    if description:
+        return description
+
+    # 备用方案：返回简化的描述
+    return f"{repo_name} 项目，提供实用的功能和工具"
+def get_memoized_description(readme_content: str, sha: str) -> Optional[str]:
+    """
+    按 README 的 SHA 查找提取结果，没有时提取并记录
+    """
+    with _description_memo_lock:
+        if sha in _description_memo:
+            return _description_memo[sha]
+    description = find_readme_description(readme_content)
+    with _description_memo_lock:
+        _description_memo[sha] = description
+    return description
+def load_description_memo(data: Any):
+    """
+    载入清单中保存的提取结果（版本不符或格式无效时忽略）
+    """
+    if not isinstance(data, dict) or data.get('version') != DESCRIPTION_MEMO_VERSION:
+        return
+    entries = data.get('entries')
+    if not isinstance(entries, dict):
+        return
+    with _description_memo_lock:
+        for sha, description in entries.items():
+            if description is None or isinstance(description, str):
+                _description_memo.setdefault(sha, description)
+def dump_description_memo(shas: Iterable[Optional[str]]) -> Dict[str, Any]:
+    """
+    导出给定SHA的提取结果，写入清单的 readme_descriptions
+    """
+    with _description_memo_lock:
+        entries = {sha: _description_memo[sha] for sha in shas if sha and sha in _description_memo}
+    return {'version': DESCRIPTION_MEMO_VERSION, 'entries': entries}
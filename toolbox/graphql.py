@@ -0,0 +1,114 @@
+"""
+GraphQL 批量查询的构建与结果转换
+"""
+import os
+from typing import Dict, Any
+
+from . import config
+
+# ========== GraphQL 批量获取 ==========
+# 一次 GraphQL 查询获取多个仓库的全部所需字段（含语言字节数与README文本），
+# 将每仓库 2~3 次 REST 请求合并为每批一次请求。
+# 语言统计只取字节数最多的前 100 种（GraphQL 单页上限，不分页），超出部分会被忽略；
+# REST /languages 返回全部语言，实际仓库极少超过这个数量。
+# README 文本由 GraphQL 完整返回，按 raw README 相同的上限与规则截断后再使用（见 client.build_readme_blob）。
+DEFAULT_GRAPHQL_BATCH_SIZE = 50  # 每批仓库数，避免超出 GraphQL 节点数限制
+FETCH_BACKENDS = ('rest', 'graphql', 'local')  # local: README 与语言统计读取 tools/ 下的本地检出
+
+GRAPHQL_REPO_FIELDS = """
+fragment RepoFields on Repository {
+  name
+  url
+  description
+  stargazerCount
+  forkCount
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  createdAt
+  updatedAt
+  pushedAt
+  primaryLanguage { name }
+  languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  licenseInfo { name }
+  hasWikiEnabled
+  hasProjectsEnabled
+  isArchived
+  isDisabled
+  isPrivate
+  readmeMd: object(expression: "HEAD:README.md") { ... on Blob { text } }
+  readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+  readmePlain: object(expression: "HEAD:README") { ... on Blob { text } }
+}
+"""
+
+def get_graphql_url() -> str:
+    """
+    GraphQL 接口地址（GitHub Actions 会设置 GITHUB_GRAPHQL_URL）
+    """
+    return os.getenv('GITHUB_GRAPHQL_URL', f"{config.API_BASE_URL}/graphql")
+def build_graphql_batch_query(count: int) -> str:
+    """
+    构建包含 count 个仓库别名（r0, r1, ...）的查询，仓库名通过变量传入
+    """
+    params = ', '.join(['$owner: String!'] + [f'$n{i}: String!' for i in range(count)])
+    fields = '\n'.join(
+        f'  r{i}: repository(owner: $owner, name: $n{i}) {{ ...RepoFields }}'
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{fields}\n}}\n{GRAPHQL_REPO_FIELDS}"
+def graphql_node_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将 GraphQL 仓库节点转换为 REST /repos/{owner}/{repo} 格式
+    注意：GraphQL 不提供 has_pages / has_downloads，使用 REST 的默认值
+    """
+    def total(key: str) -> int:
+        value = node.get(key) or {}
+        return value.get('totalCount', 0) if isinstance(value, dict) else 0
+    
+    license_info = node.get('licenseInfo')
+    topics = [
+        item['topic']['name']
+        for item in (node.get('repositoryTopics') or {}).get('nodes') or []
+        if item and item.get('topic')
+    ]
+    return {
+        'name': node.get('name'),
+        'html_url': node.get('url'),
+        'description': node.get('description'),
+        'stargazers_count': node.get('stargazerCount', 0),
+        'forks_count': node.get('forkCount', 0),
+        # REST 的 watchers_count 实际是星标数（关注者数在 subscribers_count 中）
+        'watchers_count': node.get('stargazerCount', 0),
+        # REST 的 open_issues_count 包含未关闭的 PR
+        'open_issues_count': total('issues') + total('pullRequests'),
+        'created_at': node.get('createdAt'),
+        'updated_at': node.get('updatedAt'),
+        'pushed_at': node.get('pushedAt'),
+        'language': (node.get('primaryLanguage') or {}).get('name'),
+        'topics': topics,
+        'license': {'name': license_info.get('name')} if isinstance(license_info, dict) else None,
+        'has_wiki': node.get('hasWikiEnabled', False),
+        'has_projects': node.get('hasProjectsEnabled', False),
+        'archived': node.get('isArchived', False),
+        'disabled': node.get('isDisabled', False),
+        'private': node.get('isPrivate', False),
+    }
+def graphql_node_languages(node: Dict[str, Any]) -> Dict[str, int]:
+    """
+    提取语言字节数统计（按字节数降序，与 REST /languages 一致）
+    """
+    languages = {}
+    for edge in (node.get('languages') or {}).get('edges') or []:
+        if edge and edge.get('node'):
+            languages[edge['node']['name']] = edge.get('size', 0)
+    return languages
+def graphql_node_readme(node: Dict[str, Any]) -> str:
+    """
+    提取README文本（依次尝试 README.md / readme.md / README）
+    """
+    for key in ('readmeMd', 'readmeLower', 'readmePlain'):
+        blob = node.get(key)
+        if isinstance(blob, dict) and blob.get('text'):
+            return blob['text']
+    return ""
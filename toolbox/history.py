@@ -0,0 +1,305 @@
+"""
+仓库快照历史与增长趋势
+每次定时运行向列式历史库追加一个紧凑的快照块（星标、Fork、Issue、pushed_at），
+趋势（7/30 天增量、增长最快的仓库）以滚动汇总为基准计算，不回扫全部历史
+"""
+import os
+import sys
+import json
+import struct
+from array import array
+from datetime import date, datetime
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+
+from .records import RepositoryRecord
+
+# ========== 快照存储 ==========
+# 目录结构：
+#   repos.json          仓库键（owner/name，小写）列表，下标即仓库编号，只追加
+#   snapshots-YYYY.bin  按年分段的快照块，只追加；每块为块头 + 5 列等长数组：
+#                       仓库编号 / 星标 / Fork / Issue / pushed_at（1970-01-01 起的天数，-1 表示无）
+#                       每个分段的第一块为完整快照（关键帧），之后的块只包含数值有变化的仓库
+#   rollup.json         滚动汇总：每个仓库最近 max(TREND_WINDOWS) 天内的数值变化，用于增量计算趋势
+DEFAULT_HISTORY_DIR = 'toolbox_history'
+SNAPSHOT_MAGIC = b'TBXS'
+SNAPSHOT_VERSION = 1
+BLOCK_HEADER = struct.Struct('<4sHHiI')  # 魔数、版本、标志、日期（天数）、仓库数
+BLOCK_KEYFRAME = 1
+SNAPSHOT_COLUMNS = ('repo', 'stars', 'forks', 'open_issues', 'pushed_at')
+SNAPSHOT_TYPECODES = ('I', 'I', 'I', 'I', 'i')
+ROLLUP_VERSION = 1
+TREND_WINDOWS = (7, 30)
+FASTEST_GROWING_TOP = 10
+EPOCH = date(1970, 1, 1)
+
+def to_day(value: Any) -> int:
+    """
+    日期 / ISO 时间字符串转换为 1970-01-01 起的天数，无法解析时返回 -1
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, str) and value:
+        try:
+            value = date.fromisoformat(value[:10])
+        except ValueError:
+            return -1
+    return (value - EPOCH).days if isinstance(value, date) else -1
+def from_day(day: int) -> str:
+    return date.fromordinal(EPOCH.toordinal() + day).isoformat()
+def get_repo_key(repo: RepositoryRecord) -> str:
+    """
+    历史中的仓库键：owner/name（小写，由仓库链接得到）
+    """
+    path = repo.url.rstrip('/').split('github.com/', 1)[-1]
+    return (path if '/' in path else repo.name).lower()
+def _to_bytes(column: array) -> bytes:
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+def _from_bytes(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+def _write_json(path: str, data: Any):
+    """
+    先写临时文件再替换，避免中断时留下半个文件
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        # json.dumps 使用 C 编码器，比 json.dump 逐段写入快得多
+        f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    os.replace(temp_path, path)
+
+class HistoryStore:
+    """
+    只追加的列式快照库
+    """
+    def __init__(self, path: str = DEFAULT_HISTORY_DIR):
+        self.path = path
+        self._repo_keys: Optional[List[str]] = None
+
+    def repo_keys(self) -> List[str]:
+        if self._repo_keys is None:
+            try:
+                with open(os.path.join(self.path, 'repos.json'), 'r', encoding='utf-8') as f:
+                    self._repo_keys = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._repo_keys = []
+        return self._repo_keys
+
+    def get_segment(self, day: int) -> str:
+        return os.path.join(self.path, f"snapshots-{from_day(day)[:4]}.bin")
+
+    def append(self, day: int, rows: List[Tuple[str, int, int, int, int]], keyframe: bool = False):
+        """
+        追加一个快照块；rows 为 (仓库键, 星标, Fork, Issue, pushed_at天数)
+        keyframe 为真表示 rows 是全部仓库的完整快照
+        """
+        os.makedirs(self.path, exist_ok=True)
+        keys = self.repo_keys()
+        ids = {key: i for i, key in enumerate(keys)}
+        new_keys = [row[0] for row in rows if row[0] not in ids]
+        for key in new_keys:
+            ids[key] = len(keys)
+            keys.append(key)
+        if new_keys:
+            _write_json(os.path.join(self.path, 'repos.json'), keys)
+        columns = [array(typecode) for typecode in SNAPSHOT_TYPECODES]
+        for key, *values in rows:
+            columns[0].append(ids[key])
+            for column, value in zip(columns[1:], values):
+                column.append(value)
+        with open(self.get_segment(day), 'ab') as f:
+            flags = BLOCK_KEYFRAME if keyframe else 0
+            f.write(BLOCK_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, day, len(rows)))
+            for column in columns:
+                f.write(_to_bytes(column))
+
+    def iter_blocks(self, since: Optional[int] = None, until: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, array]]]:
+        """
+        按时间顺序读取 [since, until] 天内的快照块，返回 (日期天数, 列名 -> 数组)
+        只打开涉及年份的分段文件；关键帧之外的块只包含数值有变化的仓库
+        """
+        first_year = from_day(since)[:4] if since is not None else None
+        last_year = from_day(until)[:4] if until is not None else None
+        try:
+            segments = sorted(name for name in os.listdir(self.path) if name.startswith('snapshots-') and name.endswith('.bin'))
+        except FileNotFoundError:
+            return
+        for name in segments:
+            year = name[len('snapshots-'):-len('.bin')]
+            if (first_year and year < first_year) or (last_year and year > last_year):
+                continue
+            with open(os.path.join(self.path, name), 'rb') as f:
+                while True:
+                    header = f.read(BLOCK_HEADER.size)
+                    if len(header) < BLOCK_HEADER.size:
+                        break
+                    magic, version, _flags, day, count = BLOCK_HEADER.unpack(header)
+                    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                        raise ValueError(f"快照文件格式错误: {name}")
+                    if (since is not None and day < since) or (until is not None and day > until):
+                        f.seek(count * 4 * len(SNAPSHOT_COLUMNS), os.SEEK_CUR)
+                        continue
+                    yield day, {
+                        column: _from_bytes(typecode, f.read(count * 4))
+                        for column, typecode in zip(SNAPSHOT_COLUMNS, SNAPSHOT_TYPECODES)
+                    }
+
+    def repo_series(self, key: str, since: Optional[int] = None, until: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        单个仓库在 [since, until] 内数值有变化的日期及当天的数值（未列出的日期沿用前一条）：
+        [{'date', 'stars', 'forks', 'open_issues', 'pushed_at'}, ...]
+        """
+        keys = self.repo_keys()
+        if key.lower() not in keys:
+            return []
+        repo_id = keys.index(key.lower())
+        series: Dict[int, Dict[str, Any]] = {}
+        for day, columns in self.iter_blocks(since, until):
+            try:
+                row = columns['repo'].index(repo_id)
+            except ValueError:
+                continue
+            pushed = columns['pushed_at'][row]
+            series[day] = {
+                'date': from_day(day),
+                'stars': columns['stars'][row],
+                'forks': columns['forks'][row],
+                'open_issues': columns['open_issues'][row],
+                'pushed_at': from_day(pushed) if pushed >= 0 else None,
+            }
+        return [series[day] for day in sorted(series)]
+
+# ========== 滚动汇总与趋势 ==========
+# rollup.json 中每个仓库的数值序列只在数值变化时追加 [日期, 星标, Fork, Issue, pushed_at]，
+# 未变化的日期沿用前一条；窗口起点之前只保留最后一条作为基准
+def load_rollup(path: str) -> Dict[str, Any]:
+    empty = {'version': ROLLUP_VERSION, 'first_day': None, 'repos': {}}
+    try:
+        with open(os.path.join(path, 'rollup.json'), 'r', encoding='utf-8') as f:
+            rollup = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty
+    if not isinstance(rollup, dict) or rollup.get('version') != ROLLUP_VERSION:
+        return empty
+    return rollup
+def update_rollup(rollup: Dict[str, Any], day: int,
+                  rows: List[Tuple[str, int, int, int, int]]) -> List[Tuple[str, int, int, int, int]]:
+    """
+    把当天的数值并入滚动汇总并丢弃窗口之外的旧值，返回与汇总中最新数值不同的行
+    """
+    horizon = day - max(TREND_WINDOWS)
+    repos = rollup['repos']
+    changed = []
+    for row in rows:
+        key, values = row[0], list(row[1:])
+        series = repos.setdefault(key, [])
+        if series and series[-1][1:] == values:
+            continue
+        changed.append(row)
+        if series and series[-1][0] == day:
+            # 同一天重复运行：覆盖当天的数值，与前一条相同时去掉
+            series.pop()
+            if series and series[-1][1:] == values:
+                continue
+        series.append([day] + values)
+    for series in repos.values():
+        while len(series) > 1 and series[1][0] <= horizon:
+            series.pop(0)
+    if rollup.get('first_day') is None:
+        rollup['first_day'] = day
+    return changed
+def find_baseline(series: List[List[int]], day: int) -> List[int]:
+    """
+    day 当天的数值（不晚于 day 的最后一条）；仓库在 day 之后才出现时用最早的一条
+    """
+    baseline = series[0]
+    for entry in series:
+        if entry[0] > day:
+            break
+        baseline = entry
+    return baseline
+def get_snapshot_rows(repositories: List[RepositoryRecord]) -> List[Tuple[str, int, int, int, int]]:
+    """
+    快照行：(仓库键, 星标, Fork, Issue, pushed_at天数)
+    """
+    return [
+        (get_repo_key(repo), max(0, int(repo.stars)), max(0, int(repo.forks)), max(0, int(repo.open_issues)),
+         to_day(repo.pushed_at))
+        for repo in repositories
+    ]
+def compute_trends(rollup: Dict[str, Any], rows: List[Tuple[str, int, int, int, int]], names: List[str],
+                   day: int) -> Optional[Dict[str, Any]]:
+    """
+    以滚动汇总中的数值为基准、rows 为当前数值，计算 7/30 天增量与增长最快的仓库（names 为对应的显示名）
+    last_changed 为当前仓库最近一次数值变化的日期（不随运行日期变化，输出内容未变时文件也不会重写）
+    历史中还没有早于 day 的快照时返回None
+    """
+    if rollup.get('first_day') is None or rollup['first_day'] >= day:
+        return None
+    totals = {f"{field}_{window}d": 0 for field in ('stars', 'forks', 'open_issues') for window in TREND_WINDOWS}
+    growth = []
+    last_changed = rollup['first_day']
+    for (key, *current), name in zip(rows, names):
+        series = rollup['repos'].get(key)
+        if not series:
+            continue
+        # 当前数值与汇总中最新的一条不同时，说明变化发生在今天（尚未记录）
+        last_changed = max(last_changed, series[-1][0] if series[-1][1:] == current else day)
+        stars = {}
+        for window in TREND_WINDOWS:
+            baseline = find_baseline(series, day - window)
+            for i, field in enumerate(('stars', 'forks', 'open_issues')):
+                totals[f"{field}_{window}d"] += current[i] - baseline[i + 1]
+            stars[f"stars_{window}d"] = current[0] - baseline[1]
+        if any(delta > 0 for delta in stars.values()):
+            growth.append({'name': name, **stars})
+    short, long = (f"stars_{window}d" for window in TREND_WINDOWS)
+    growth.sort(key=lambda entry: (-entry[short], -entry[long], entry['name']))
+    return {'last_changed': from_day(last_changed), **totals, 'fastest_growing': growth[:FASTEST_GROWING_TOP]}
+def get_trends(repositories: List[RepositoryRecord], path: str = DEFAULT_HISTORY_DIR,
+               today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    只读：用已记录的历史计算 repositories 的趋势（见 compute_trends），不写入任何文件
+    """
+    return compute_trends(load_rollup(path), get_snapshot_rows(repositories), [repo.name for repo in repositories],
+                          to_day(today or date.today()))
+def record_snapshot(repositories: List[RepositoryRecord], path: str = DEFAULT_HISTORY_DIR,
+                    today: Optional[date] = None):
+    """
+    追加本次运行的快照并更新滚动汇总；每次定时运行只调用一次
+    数值没有变化的仓库不写入快照块；每年的分段以一个完整快照开头；
+    不在 repositories 中的仓库（已从配置移除或未被发现）从滚动汇总中删除
+    """
+    day = to_day(today or date.today())
+    rows = get_snapshot_rows(repositories)
+    store = HistoryStore(path)
+    rollup = load_rollup(path)
+    changed = update_rollup(rollup, day, rows)
+    current = {row[0] for row in rows}
+    removed = [key for key in rollup['repos'] if key not in current]
+    for key in removed:
+        del rollup['repos'][key]
+    if not os.path.exists(store.get_segment(day)):
+        store.append(day, rows, keyframe=True)
+    elif changed:
+        store.append(day, changed)
+    if changed or removed:
+        _write_json(os.path.join(path, 'rollup.json'), rollup)
+def main(argv: Optional[List[str]] = None):
+    """
+    输出单个仓库的快照历史（JSON），用法: python -m toolbox.history owner/name [历史目录]
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("用法: python -m toolbox.history owner/name [历史目录]")
+        sys.exit(1)
+    store = HistoryStore(argv[1] if len(argv) > 1 else DEFAULT_HISTORY_DIR)
+    json.dump(store.repo_series(argv[0]), sys.stdout, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+增量生成：仓库变化清单与按需写入输出文件
+"""
+import json
+from datetime import datetime
+from typing import Dict, Optional, Any, AnyStr, Callable, TextIO
+
+from .discovery import iter_account_repositories
+from .records import RepositoryRecord
+
+# ========== 增量生成 ==========
+# 清单文件记录每个仓库上次看到的 pushed_at / updated_at 及其 repository_info。
+# 下次运行时通过账号仓库列表（每页100个）发现变化，只重新分析时间戳变化的仓库；
+# 输出文件只有在内容真正变化时才重写，生成时间也沿用上一次的值。
+DEFAULT_MANIFEST_FILE = 'toolbox_manifest.json'
+MANIFEST_VERSION = 2  # 版本2：记录中增加 language_bytes
+# 列表数据中可直接刷新到复用记录上的统计字段
+LISTING_COUNT_FIELDS = {
+    'stars': 'stargazers_count',
+    'forks': 'forks_count',
+    'watchers': 'watchers_count',
+    'open_issues': 'open_issues_count',
+}
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """
+    读取增量清单；不存在或格式不符时返回空清单
+    """
+    empty = {'version': MANIFEST_VERSION, 'outputs': {}, 'repositories': {}}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return empty
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"⚠️  增量清单无法读取，将全部重新分析: {e}")
+        return empty
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return empty
+    manifest.setdefault('outputs', {})
+    manifest.setdefault('repositories', {})
+    return manifest
+def get_manifest_key(owner: str, repo_name: str) -> str:
+    """
+    清单键：owner/name（不区分大小写）
+    """
+    return f"{owner}/{repo_name}".lower()
+def get_repo_signature(item: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    仓库变化签名：完整的 pushed_at / updated_at 时间戳
+    """
+    return {'pushed_at': item.get('pushed_at'), 'updated_at': item.get('updated_at')}
+def reuse_manifest_record(entry: Optional[Dict[str, Any]], item: Optional[Dict[str, Any]]) -> Optional[RepositoryRecord]:
+    """
+    时间戳未变化时复用清单中的 repository_info，并用列表数据刷新星标等计数
+    """
+    if not entry or not item or not entry.get('repository_info'):
+        return None
+    signature = get_repo_signature(item)
+    if not signature['pushed_at'] or entry.get('signature') != signature:
+        return None
+    repo_info = RepositoryRecord.from_dict(entry['repository_info'])
+    if repo_info is None:
+        return None
+    for field, listing_field in LISTING_COUNT_FIELDS.items():
+        if isinstance(item.get(listing_field), (int, float)):
+            setattr(repo_info, field, item[listing_field])
+    return repo_info
+def fetch_listing_index(owner: str) -> Dict[str, Dict[str, Any]]:
+    """
+    获取账号仓库列表，返回 小写仓库名 -> 列表数据
+    """
+    return {item['name'].lower(): item for item in iter_account_repositories('users', owner)}
+def parse_manifest_time(value: Any) -> Optional[datetime]:
+    """
+    解析清单中记录的生成时间
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+class MatchingSink:
+    """
+    逐段与现有文件内容比较的写入目标，不把整个文件读入内存
+    """
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.matches = True
+    def write(self, text: AnyStr) -> int:
+        if self.matches and self.f.read(len(text)) != text:
+            self.matches = False
+        return len(text)
+    def finish(self) -> bool:
+        """
+        写入结束后调用：内容完全一致且文件没有多余内容时返回 True
+        """
+        return self.matches and not self.f.read(1)
+def write_if_changed(path: str, write: Callable[[TextIO, datetime], None], outputs: Dict[str, str],
+                     newline: Optional[str] = None, binary: bool = False) -> bool:
+    """
+    先用该文件上一次的生成时间流式渲染并与现有文件逐段比较，一致则不写入；
+    否则用当前时间重新渲染并直接流式写入文件，同时更新 outputs 中记录的生成时间
+    write(sink, generated_at) 负责把内容写入 sink；newline 原样传给 open()，binary 为真时以二进制模式读写
+    返回是否写入了文件
+    """
+    open_args = {} if binary else {'encoding': 'utf-8', 'newline': newline}
+    previous_time = parse_manifest_time(outputs.get(path))
+    if previous_time is not None:
+        try:
+            with open(path, 'rb' if binary else 'r', **open_args) as f:
+                sink = MatchingSink(f)
+                write(sink, previous_time)
+                if sink.finish():
+                    return False
+        except (FileNotFoundError, IOError):
+            pass
+    generated_at = datetime.now()
+    with open(path, 'wb' if binary else 'w', **open_args) as f:
+        write(f, generated_at)
+    outputs[path] = generated_at.isoformat()
+    return True
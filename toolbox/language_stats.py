@@ -0,0 +1,147 @@
+"""
+按代码字节数加权的语言统计
+仓库 × 语言 的字节数以列式（稀疏 COO）数组保存，默认对扁平数组单遍累加（只依赖标准库）；
+numpy 不是依赖项，环境中已安装时改用 bincount / argsort 向量化汇总，两种方式结果相同
+"""
+from array import array
+from itertools import chain, repeat
+from typing import List, Dict, Any, Iterable
+
+# ========== 语言字节矩阵 ==========
+LANGUAGE_DISTRIBUTION_TOP = 10  # README 中列出的语言数量
+LANGUAGE_BAR_WIDTH = 20
+_numpy: Any = False  # False 表示尚未尝试导入
+
+def get_numpy():
+    """
+    延迟导入可选的 numpy（不在 requirements.txt 中），未安装时返回None
+    """
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+class LanguageMatrix:
+    """
+    仓库 × 语言 字节数矩阵（稀疏 COO：三个等长的列 repo / language / bytes）
+    languages 按名称排序，language 列保存其下标
+    """
+    __slots__ = ('repo_count', 'languages', 'repo_column', 'language_column', 'bytes_column')
+
+    def __init__(self, repo_count: int, languages: List[str], repo_column: array,
+                 language_column: array, bytes_column: array):
+        self.repo_count = repo_count
+        self.languages = languages
+        self.repo_column = repo_column
+        self.language_column = language_column
+        self.bytes_column = bytes_column
+
+    @classmethod
+    def from_breakdowns(cls, breakdowns: List[Dict[str, int]]) -> 'LanguageMatrix':
+        """
+        由每个仓库的 {语言: 字节数}（非负整数）构建矩阵（扁平展开，不逐仓库嵌套循环）
+        """
+        names = list(chain.from_iterable(breakdowns))
+        byte_values = array('q', chain.from_iterable(b.values() for b in breakdowns))
+        repo_column = array('q', chain.from_iterable(repeat(i, len(b)) for i, b in enumerate(breakdowns)))
+        languages = sorted(set(names))
+        index = {name: i for i, name in enumerate(languages)}
+        return cls(len(breakdowns), languages, repo_column, array('q', map(index.__getitem__, names)), byte_values)
+
+    def language_totals(self) -> List[int]:
+        """
+        每种语言的字节总数（与 languages 对应）
+        """
+        if get_numpy() is not None:
+            return self._bincount(self.language_column, self.bytes_column, len(self.languages)).tolist()
+        totals = [0] * len(self.languages)
+        for language, value in zip(self.language_column, self.bytes_column):
+            totals[language] += value
+        return totals
+
+    def language_repo_counts(self) -> List[int]:
+        """
+        每种语言出现在多少个仓库中
+        """
+        if get_numpy() is not None:
+            return self._bincount(self.language_column, None, len(self.languages)).tolist()
+        counts = [0] * len(self.languages)
+        for language in self.language_column:
+            counts[language] += 1
+        return counts
+
+    @staticmethod
+    def _bincount(column: array, weights: Any, length: int):
+        np = get_numpy()
+        indices = np.frombuffer(column, dtype=np.int64) if len(column) else np.zeros(0, dtype=np.int64)
+        if weights is None:
+            return np.bincount(indices, minlength=length)
+        values = np.frombuffer(weights, dtype=np.int64) if len(weights) else np.zeros(0, dtype=np.int64)
+        # 浮点累加在 2^53 字节以内是精确的
+        return np.rint(np.bincount(indices, weights=values, minlength=length)).astype(np.int64)
+
+def compute_language_distribution(breakdowns: Iterable[Dict[str, int]]) -> List[Dict[str, Any]]:
+    """
+    计算整个项目集合的语言字节分布，按字节数降序（相同时按名称）排名
+    返回 [{'language', 'bytes', 'share', 'repositories', 'rank'}, ...]，不含字节数为0的语言
+    """
+    matrix = LanguageMatrix.from_breakdowns([b for b in breakdowns if isinstance(b, dict)])
+    if not matrix.languages:
+        return []
+    return rank_languages(matrix.languages, matrix.language_totals(), matrix.language_repo_counts())
+def rank_languages(languages: List[str], totals: List[int], counts: List[int]) -> List[Dict[str, Any]]:
+    """
+    由按名称排序的语言及其字节总数、仓库数生成排名后的分布
+    """
+    grand_total = sum(totals)
+    if grand_total <= 0:
+        return []
+    np = get_numpy()
+    if np is not None:
+        # 按字节数降序；languages 已按名称排序，稳定排序保证同字节数时按名称
+        order = np.argsort(-np.asarray(totals, dtype=np.int64), kind='stable').tolist()
+    else:
+        order = sorted(range(len(totals)), key=lambda i: -totals[i])
+    distribution = []
+    for i in order:
+        if totals[i] <= 0:
+            break
+        distribution.append({
+            'language': languages[i],
+            'bytes': totals[i],
+            'share': round(totals[i] / grand_total, 4),
+            'repositories': counts[i],
+            'rank': len(distribution) + 1,
+        })
+    return distribution
+def merge_language_distributions(distributions: Iterable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    合并多个（互不重叠的仓库集合的）语言分布：字节数与仓库数相加后重新计算占比与排名
+    """
+    totals: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    for distribution in distributions:
+        for entry in distribution or []:
+            language = entry['language']
+            totals[language] = totals.get(language, 0) + int(entry.get('bytes', 0))
+            counts[language] = counts.get(language, 0) + int(entry.get('repositories', 0))
+    languages = sorted(totals)
+    return rank_languages(languages, [totals[name] for name in languages], [counts[name] for name in languages])
+def format_language_distribution(distribution: List[Dict[str, Any]], top: int = LANGUAGE_DISTRIBUTION_TOP) -> str:
+    """
+    README 中的字节分布条形图（~~~ 代码块内的文本行）
+    """
+    lines = []
+    for entry in distribution[:top]:
+        filled = int(round(entry['share'] * LANGUAGE_BAR_WIDTH))
+        bar = '█' * filled + '░' * (LANGUAGE_BAR_WIDTH - filled)
+        lines.append(f"{entry['language']:<15} {bar} {entry['share'] * 100:5.1f}% ({entry['repositories']} 个仓库)\n")
+    rest = distribution[top:]
+    if rest:
+        share = sum(entry['share'] for entry in rest)
+        lines.append(f"{'其他':<15} {'':<{LANGUAGE_BAR_WIDTH}} {share * 100:5.1f}% ({len(rest)} 种语言)\n")
+    return ''.join(lines)
@@ -0,0 +1,156 @@
+"""
+本地分析：直接读取 tools/ 下已检出子模块的 README 与代码文件
+README 与语言字节数不再请求 API，结果按 git tree 哈希缓存，子模块未变化时不再遍历
+"""
+import os
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
+
+from . import config
+from .cache import get_cache_store, record_cache_event
+from .client import build_readme_blob, get_readme_max_bytes
+from .metrics import METRICS
+
+# ========== 语言识别 ==========
+DEFAULT_LOCAL_TOOLS_DIR = 'tools'
+LOCAL_TREE_CACHE_VERSION = 1
+# 按扩展名（小写）识别语言，名称与 GitHub 的语言统计一致；文档、数据与配置文件不计入
+EXTENSION_LANGUAGES = {
+    '.py': 'Python', '.pyw': 'Python', '.pyi': 'Python',
+    '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.mts': 'TypeScript', '.cts': 'TypeScript',
+    '.html': 'HTML', '.htm': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass', '.less': 'Less',
+    '.vue': 'Vue', '.svelte': 'Svelte',
+    '.go': 'Go', '.rs': 'Rust', '.java': 'Java', '.kt': 'Kotlin', '.kts': 'Kotlin', '.scala': 'Scala',
+    '.c': 'C', '.h': 'C', '.cpp': 'C++', '.cc': 'C++', '.cxx': 'C++', '.hpp': 'C++', '.hh': 'C++',
+    '.cs': 'C#', '.m': 'Objective-C', '.swift': 'Swift', '.dart': 'Dart',
+    '.rb': 'Ruby', '.php': 'PHP', '.pl': 'Perl', '.lua': 'Lua', '.r': 'R',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell', '.ps1': 'PowerShell', '.bat': 'Batchfile', '.cmd': 'Batchfile',
+}
+FILENAME_LANGUAGES = {'dockerfile': 'Dockerfile', 'makefile': 'Makefile'}
+# 不计入统计的目录（依赖、构建产物与版本控制目录）
+IGNORED_DIRECTORIES = {'.git', 'node_modules', 'vendor', 'dist', 'build', '__pycache__', '.venv', 'venv', 'third_party'}
+README_NAMES = ('readme.md', 'readme.markdown', 'readme.rst', 'readme.txt', 'readme')
+# 目录遍历线程池：scan_directory 不再提交新任务，由分析线程共用不会死锁
+_walk_executor: Optional[ThreadPoolExecutor] = None
+_walk_executor_lock = threading.Lock()
+
+def get_local_repo_path(repo_name: str) -> Optional[str]:
+    """
+    仓库在本地的检出目录；不存在或不是 git 检出时返回None
+    """
+    path = os.path.join(config.LOCAL_TOOLS_DIR or DEFAULT_LOCAL_TOOLS_DIR, repo_name)
+    return path if os.path.exists(os.path.join(path, '.git')) else None
+def get_tree_hash(path: str) -> Optional[str]:
+    """
+    检出内容的 git tree 哈希（HEAD^{tree}），用作缓存键；获取失败时返回None
+    工作区有未提交的修改或未跟踪的文件时也返回None：统计读取的是工作区文件，不能沿用已提交内容的缓存
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD^{tree}'], cwd=path, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        status = subprocess.run(['git', 'status', '--porcelain'], cwd=path, capture_output=True, text=True)
+    except OSError:
+        return None
+    if status.returncode != 0 or status.stdout.strip():
+        return None
+    return result.stdout.strip()
+def classify_file(name: str) -> Optional[str]:
+    lower = name.lower()
+    language = FILENAME_LANGUAGES.get(lower)
+    if language:
+        return language
+    return EXTENSION_LANGUAGES.get(os.path.splitext(lower)[1])
+def scan_directory(path: str) -> Tuple[Dict[str, int], List[str]]:
+    """
+    统计单个目录中文件的语言字节数，返回 (语言 -> 字节数, 子目录列表)；不跟随符号链接
+    """
+    sizes: Dict[str, int] = {}
+    subdirectories = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRECTORIES:
+                        subdirectories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    language = classify_file(entry.name)
+                    if language:
+                        sizes[language] = sizes.get(language, 0) + entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+    return sizes, subdirectories
+def get_walk_executor() -> ThreadPoolExecutor:
+    """
+    获取目录遍历线程池（首次调用时按 config.MAX_WORKERS 惰性创建）
+    各仓库共用同一个线程池，并发分析多个仓库时线程数不会成倍增加
+    """
+    global _walk_executor
+    with _walk_executor_lock:
+        if _walk_executor is None:
+            _walk_executor = ThreadPoolExecutor(max_workers=max(1, config.MAX_WORKERS), thread_name_prefix='walk')
+        return _walk_executor
+def compute_language_bytes(root: str, pool: Optional[ThreadPoolExecutor] = None) -> Dict[str, int]:
+    """
+    并发逐层遍历目录树，按字节数降序返回 {语言: 字节数}（与 languages API 的结构相同）
+    """
+    pool = pool or get_walk_executor()
+    totals: Dict[str, int] = {}
+    frontier = [root]
+    while frontier:
+        next_frontier = []
+        for sizes, subdirectories in pool.map(scan_directory, frontier):
+            for language, size in sizes.items():
+                totals[language] = totals.get(language, 0) + size
+            next_frontier.extend(subdirectories)
+        frontier = next_frontier
+    return dict(sorted(totals.items(), key=lambda item: (-item[1], item[0])))
+def read_local_readme(root: str) -> Tuple[str, Optional[str]]:
+    """
+    读取根目录中的README（最多 readme_max_bytes 字节），返回 (内容, SHA)
+    与 API 获取的 raw README 使用相同的截断与 SHA 规则，描述提取结果可以共用
+    """
+    try:
+        names = {entry.name.lower(): entry.name for entry in os.scandir(root) if entry.is_file()}
+    except OSError:
+        return "", None
+    for candidate in README_NAMES:
+        if candidate in names:
+            max_bytes = get_readme_max_bytes()
+            with open(os.path.join(root, names[candidate]), 'rb') as f:
+                body = f.read(max_bytes + 1) if max_bytes else f.read()
+            return build_readme_blob(body)
+    return "", None
+
+# ========== 本地分析 ==========
+def load_local_repository(repo_name: str) -> Optional[Dict[str, Any]]:
+    """
+    读取本地检出仓库的 README 与语言字节数：{'readme', 'readme_sha', 'languages'}
+    同一 tree 哈希与 README 上限的结果从缓存读取（工作区有修改时每次重新统计）；仓库未检出时返回None
+    """
+    path = get_local_repo_path(repo_name)
+    if path is None:
+        return None
+    tree = get_tree_hash(path)
+    cache = get_cache_store()
+    # README 按 readme_max_bytes 截断，上限不同的结果不能共用
+    key = f"/_local_trees/v{LOCAL_TREE_CACHE_VERSION}/{tree}?readme_max_bytes={get_readme_max_bytes()}"
+    if tree:
+        entry = cache.get(key)
+        if entry is not None and isinstance(entry['data'], dict) and 'languages' in entry['data']:
+            record_cache_event('cached')
+            return entry['data']
+    with METRICS.phase('local_scan'):
+        readme, readme_sha = read_local_readme(path)
+        data = {
+            'readme': readme,
+            'readme_sha': readme_sha,
+            'languages': compute_language_bytes(path),
+        }
+    if tree:
+        record_cache_event('miss')
+        cache.set(key, data, None, None)
+    return data
@@ -0,0 +1,255 @@
+"""
+运行指标：各阶段耗时、各类端点请求延迟、重试/超时次数、缓存统计与下载字节数
+可选 cProfile / tracemalloc 采样，结果写入 JSON 文件
+"""
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Callable, TextIO
+
+# ========== 运行指标 ==========
+# 阶段耗时：analyze / output 为实际经过的时间；fetch / extract / render / write
+# 为多个线程累计的时间，并发时总和可能超过实际经过的时间。
+DEFAULT_METRICS_FILE = 'toolbox_metrics.json'
+DEFAULT_PROFILE_FILE = 'toolbox_profile.prof'
+METRICS_VERSION = 1
+PROFILE_MODES = ('cpu', 'memory', 'all')
+# 延迟直方图的桶上限（毫秒），最后一个桶收集更慢的请求
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PROFILE_TOP_COUNT = 20  # 报告中列出的最耗时函数 / 最大内存分配数量
+
+class MetricsCollector:
+    """
+    线程安全的指标收集器
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.phases: Dict[str, Dict[str, float]] = {}
+            self.latencies: Dict[str, List[float]] = {}
+            self.statuses: Dict[str, Dict[str, int]] = {}
+            self.counters = {
+                'requests': 0, 'retries': 0, 'timeouts': 0, 'errors': 0, 'rate_limited': 0, 'bytes_downloaded': 0,
+            }
+
+    def add_phase(self, name: str, seconds: float):
+        with self._lock:
+            phase = self.phases.setdefault(name, {'seconds': 0.0, 'count': 0})
+            phase['seconds'] += seconds
+            phase['count'] += 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        记录 with 块的耗时
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def record_request(self, endpoint_class: str, seconds: float, status: Optional[int], size: int = 0):
+        """
+        记录一次请求：端点类别、耗时、HTTP状态（None 表示未得到响应）与响应体字节数
+        """
+        with self._lock:
+            self.latencies.setdefault(endpoint_class, []).append(seconds * 1000)
+            statuses = self.statuses.setdefault(endpoint_class, {})
+            key = str(status) if status is not None else 'no_response'
+            statuses[key] = statuses.get(key, 0) + 1
+            self.counters['requests'] += 1
+            self.counters['bytes_downloaded'] += size
+        self.add_phase('fetch', seconds)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self, cache_stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        汇总为可写入 JSON 的字典
+        """
+        with self._lock:
+            endpoints = {
+                name: summarize_latencies(values, self.statuses.get(name, {}))
+                for name, values in sorted(self.latencies.items())
+            }
+            return {
+                'version': METRICS_VERSION,
+                'started_at': self.started_at.isoformat(),
+                'total_seconds': round(time.perf_counter() - self._start, 3),
+                'phases': {
+                    name: {'seconds': round(phase['seconds'], 3), 'count': phase['count']}
+                    for name, phase in self.phases.items()
+                },
+                'endpoints': endpoints,
+                'requests': dict(self.counters),
+                'cache': dict(cache_stats or {}),
+            }
+
+METRICS = MetricsCollector()
+
+def summarize_latencies(values: List[float], statuses: Dict[str, int]) -> Dict[str, Any]:
+    """
+    计算延迟统计与直方图（毫秒）
+    """
+    ordered = sorted(values)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+    histogram = {f"<={bound}ms": 0 for bound in LATENCY_BUCKETS_MS}
+    histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = 0
+    for value in ordered:
+        for bound in LATENCY_BUCKETS_MS:
+            if value <= bound:
+                histogram[f"<={bound}ms"] += 1
+                break
+        else:
+            histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] += 1
+    return {
+        'count': len(ordered),
+        'total_ms': round(sum(ordered), 2),
+        'min_ms': round(ordered[0], 2),
+        'max_ms': round(ordered[-1], 2),
+        'p50_ms': percentile(0.5),
+        'p95_ms': percentile(0.95),
+        'status': dict(sorted(statuses.items())),
+        'histogram': histogram,
+    }
+class TimedSink:
+    """
+    包装写入目标，累计 write() 花费的时间（用于区分渲染与写文件的耗时）
+    """
+    def __init__(self, sink: TextIO):
+        self.sink = sink
+        self.seconds = 0.0
+    def write(self, text: str) -> int:
+        start = time.perf_counter()
+        try:
+            return self.sink.write(text)
+        finally:
+            self.seconds += time.perf_counter() - start
+def timed_writer(write: Callable[[TextIO, datetime], None]) -> Callable[[TextIO, datetime], None]:
+    """
+    包装 write(sink, generated_at)，将耗时分别记入 render 与 write 阶段
+    """
+    def wrapper(sink: TextIO, generated_at: datetime):
+        timed_sink = TimedSink(sink)
+        start = time.perf_counter()
+        write(timed_sink, generated_at)
+        total = time.perf_counter() - start
+        METRICS.add_phase('render', total - timed_sink.seconds)
+        METRICS.add_phase('write', timed_sink.seconds)
+    return wrapper
+
+# ========== 性能采样 ==========
+class Profiler:
+    """
+    可选的 cProfile（cpu）与 tracemalloc（memory）采样
+    Python 3.12 以前 cProfile 只记录调用 enable() 的线程，因此为每个新线程单独启用
+    """
+    def __init__(self, mode: Optional[str], profile_file: str = DEFAULT_PROFILE_FILE):
+        self.mode = mode
+        self.profile_file = profile_file
+        self.cpu = mode in ('cpu', 'all')
+        self.memory = mode in ('memory', 'all')
+        self._profilers = []
+        self._lock = threading.Lock()
+
+    def _start_cpu_profiler(self, *_):
+        import cProfile
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._profilers.append(profiler)
+        profiler.enable()
+
+    def start(self):
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.cpu:
+            if sys.version_info < (3, 12):
+                threading.setprofile(self._start_cpu_profiler)
+            self._start_cpu_profiler()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        停止采样，写出 cProfile 数据文件，返回写入指标报告的摘要
+        """
+        report: Dict[str, Any] = {}
+        if self.cpu:
+            threading.setprofile(None)
+            report['cpu'] = self._stop_cpu()
+        if self.memory:
+            report['memory'] = self._stop_memory()
+        return report
+
+    def _stop_cpu(self) -> Dict[str, Any]:
+        import io
+        import pstats
+        with self._lock:
+            profilers = list(self._profilers)
+        for profiler in profilers:
+            profiler.disable()
+        stats = pstats.Stats(profilers[0], stream=io.StringIO())
+        for profiler in profilers[1:]:
+            try:
+                stats.add(profiler)
+            except TypeError:
+                pass  # 线程尚未产生任何调用记录
+        stats.dump_stats(self.profile_file)
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_COUNT]
+        return {
+            'profile_file': os.path.abspath(self.profile_file),
+            'threads': len(profilers),
+            'top_cumulative': [
+                {
+                    'function': f"{os.path.basename(filename)}:{line}({name})",
+                    'calls': calls,
+                    'total_seconds': round(total_time, 4),
+                    'cumulative_seconds': round(cumulative, 4),
+                }
+                for (filename, line, name), (_, calls, total_time, cumulative, _) in top
+            ],
+        }
+
+    def _stop_memory(self) -> Dict[str, Any]:
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        top = snapshot.statistics('lineno')[:PROFILE_TOP_COUNT]
+        return {
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'top_allocations': [
+                {
+                    'location': f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    'size_bytes': stat.size,
+                    'count': stat.count,
+                }
+                for stat in top
+            ],
+        }
+def write_metrics(path: str, cache_stats: Optional[Dict[str, int]] = None,
+                  profile: Optional[Dict[str, Any]] = None):
+    """
+    将指标报告写入 JSON 文件
+    """
+    report = METRICS.report(cache_stats)
+    if profile:
+        report['profile'] = profile
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
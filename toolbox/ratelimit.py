@@ -0,0 +1,151 @@
+"""
+多令牌速率限制调度
+"""
+import time
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+
+from . import config
+
+# ========== 速率限制调度 ==========
+# 按令牌、按资源（REST 为 core，GraphQL 为 graphql）记录响应头中的
+# X-RateLimit-Remaining / X-RateLimit-Reset。每次请求选择可用额度最多的令牌；
+# 额度接近用完时均匀放慢请求，全部用完时精确等待到最早的重置时间。
+DEFAULT_RATE_LIMIT_RESERVE = 10      # 每个令牌保留的额度，不在本次运行中用掉
+DEFAULT_RATE_LIMIT_MAX_WAIT = 3600   # 等待额度重置的最长时间（秒）
+RATE_LIMIT_PACING_RATIO = 0.1        # 剩余额度低于上限的该比例时开始均匀放慢请求
+
+def mask_token(token: str) -> str:
+    """
+    隐藏令牌中间部分，用于日志输出
+    """
+    return f"{token[:4]}…{token[-4:]}" if len(token) > 8 else "****"
+class RateLimitScheduler:
+    """
+    多令牌速率限制调度器（线程安全）
+    """
+
+    def __init__(self, tokens: List[str], reserve: int = DEFAULT_RATE_LIMIT_RESERVE,
+                 max_wait: float = DEFAULT_RATE_LIMIT_MAX_WAIT):
+        self.tokens = tokens
+        self.reserve = max(0, reserve)
+        self.max_wait = max_wait
+        self._budgets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _budget(self, token: str, resource: str) -> Dict[str, Any]:
+        key = (token, resource)
+        if key not in self._budgets:
+            # remaining 为 None 表示尚未从响应头得知额度
+            self._budgets[key] = {'remaining': None, 'limit': None, 'reset_at': 0.0, 'next_at': 0.0}
+        return self._budgets[key]
+
+    def _wait_time(self, budget: Dict[str, Any], now: float) -> float:
+        if budget['remaining'] is not None and budget['reset_at'] <= now:
+            budget['remaining'] = None  # 已过重置时间，额度恢复
+        if budget['remaining'] is None or budget['remaining'] > self.reserve:
+            return max(0.0, budget['next_at'] - now)
+        return max(0.0, budget['reset_at'] - now) + 1  # 多等1秒，避免时钟误差
+
+    def _pacing_interval(self, budget: Dict[str, Any], now: float) -> float:
+        remaining, limit = budget['remaining'], budget['limit']
+        if remaining is None or not limit or remaining >= limit * RATE_LIMIT_PACING_RATIO:
+            return 0.0
+        usable = max(1, remaining - self.reserve)
+        return max(0.0, budget['reset_at'] - now) / usable
+
+    def acquire(self, resource: str = 'core', max_wait: Optional[float] = None) -> Optional[str]:
+        """
+        获取一个可用令牌（必要时等待）；等待时间超过上限时返回None
+        max_wait 为本次调用的等待上限（秒），不超过调度器的 max_wait
+        """
+        if not self.tokens:
+            print("  ❌ 没有可用的 GitHub 令牌")
+            return None
+        limit = self.max_wait if max_wait is None else min(self.max_wait, max(0.0, max_wait))
+        announced = False
+        while True:
+            with self._lock:
+                now = time.time()
+                best_token, best_wait, best_remaining = None, None, -1
+                for token in self.tokens:
+                    budget = self._budget(token, resource)
+                    wait = self._wait_time(budget, now)
+                    remaining = budget['remaining'] if budget['remaining'] is not None else float('inf')
+                    if best_wait is None or wait < best_wait or (wait == best_wait and remaining > best_remaining):
+                        best_token, best_wait, best_remaining = token, wait, remaining
+                
+                if best_wait <= 0:
+                    budget = self._budget(best_token, resource)
+                    if budget['remaining'] is not None:
+                        budget['remaining'] -= 1  # 预先扣减，响应返回后以响应头为准
+                    budget['next_at'] = now + self._pacing_interval(budget, now)
+                    return best_token
+            
+            if best_wait > limit:
+                print(f"  ❌ 所有令牌的 {resource} 额度均已用完，需等待 {best_wait:.0f} 秒，超过上限 {limit:g} 秒")
+                return None
+            if best_wait >= 5 and not announced:
+                resume = datetime.fromtimestamp(time.time() + best_wait).strftime('%H:%M:%S')
+                print(f"  ⏳ {resource} 额度不足，暂停 {best_wait:.0f} 秒至 {resume} 后继续")
+                announced = True
+            time.sleep(best_wait)
+
+    def update(self, token: str, headers: Any, resource: str = 'core'):
+        """
+        根据响应头更新令牌额度
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        resource = headers.get('X-RateLimit-Resource') or resource
+        try:
+            with self._lock:
+                budget = self._budget(token, resource)
+                budget['remaining'] = int(remaining)
+                if headers.get('X-RateLimit-Limit'):
+                    budget['limit'] = int(headers['X-RateLimit-Limit'])
+                if headers.get('X-RateLimit-Reset'):
+                    budget['reset_at'] = float(headers['X-RateLimit-Reset'])
+        except ValueError:
+            pass
+
+    def mark_exhausted(self, token: str, resource: str, reset_at: Optional[float] = None):
+        """
+        标记令牌额度已用完（收到速率限制响应时调用）
+        """
+        with self._lock:
+            budget = self._budget(token, resource)
+            budget['remaining'] = 0
+            if reset_at:
+                budget['reset_at'] = reset_at
+            elif budget['reset_at'] <= time.time():
+                budget['reset_at'] = time.time() + 60
+
+    def summary(self) -> List[str]:
+        """
+        每个令牌的额度概况
+        """
+        lines = []
+        with self._lock:
+            for (token, resource), budget in sorted(self._budgets.items(), key=lambda item: (self.tokens.index(item[0][0]), item[0][1])):
+                if budget['remaining'] is None:
+                    continue
+                reset = datetime.fromtimestamp(budget['reset_at']).strftime('%H:%M:%S') if budget['reset_at'] else '-'
+                lines.append(f"{mask_token(token)} [{resource}] 剩余 {budget['remaining']}/{budget['limit']}，{reset} 重置")
+        return lines
+_rate_limiter: Optional[RateLimitScheduler] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimitScheduler:
+    """
+    获取共享的速率限制调度器（首次调用时创建）
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            reserve = DEFAULT_RATE_LIMIT_RESERVE if config.RATE_LIMIT_RESERVE is None else int(config.RATE_LIMIT_RESERVE)
+            max_wait = DEFAULT_RATE_LIMIT_MAX_WAIT if config.RATE_LIMIT_MAX_WAIT is None else float(config.RATE_LIMIT_MAX_WAIT)
+            _rate_limiter = RateLimitScheduler(config.GITHUB_TOKENS, reserve, max_wait)
+        return _rate_limiter
@@ -0,0 +1,148 @@
+"""
+仓库记录与汇总统计
+"""
+from typing import List, Dict, Optional, Any, Iterable, Mapping, Union
+
+from .language_stats import compute_language_distribution
+
+# ========== 仓库记录 ==========
+# 每个仓库一条紧凑的 __slots__ 记录，字段顺序即写入清单时的键顺序。
+REPOSITORY_FIELDS = (
+    'name', 'url',
+    'official_description', 'extracted_description', 'final_description', 'readme_sha',
+    'stars', 'forks', 'watchers', 'open_issues',
+    'created_at', 'updated_at', 'pushed_at',
+    'language', 'languages', 'language_bytes', 'topics', 'license',
+    'has_wiki', 'has_pages', 'has_projects', 'has_downloads',
+    'archived', 'disabled', 'private',
+)
+REPOSITORY_DEFAULTS: Dict[str, Any] = {
+    'official_description': '', 'extracted_description': '', 'final_description': '', 'readme_sha': None,
+    'stars': 0, 'forks': 0, 'watchers': 0, 'open_issues': 0,
+    'created_at': '', 'updated_at': '', 'pushed_at': '',
+    'language': '多种语言', 'license': None,
+    'has_wiki': False, 'has_pages': False, 'has_projects': False, 'has_downloads': True,
+    'archived': False, 'disabled': False, 'private': False,
+}
+# 列表 / 字典类型字段的默认值需要每条记录单独创建
+REPOSITORY_CONTAINER_FIELDS = {'languages': list, 'topics': list, 'language_bytes': dict}
+
+class RepositoryRecord:
+    """
+    单个仓库的分析结果
+    """
+    __slots__ = REPOSITORY_FIELDS
+
+    def __init__(self, name: str, url: str, **fields: Any):
+        unknown = set(fields) - set(REPOSITORY_FIELDS)
+        if unknown:
+            raise TypeError(f"未知的仓库字段: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.url = url
+        for field in REPOSITORY_FIELDS[2:]:
+            if field in fields:
+                value = fields[field]
+            elif field in REPOSITORY_CONTAINER_FIELDS:
+                value = REPOSITORY_CONTAINER_FIELDS[field]()
+            else:
+                value = REPOSITORY_DEFAULTS[field]
+            setattr(self, field, value)
+
+    def __repr__(self) -> str:
+        return f"RepositoryRecord(name={self.name!r}, stars={self.stars!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RepositoryRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in REPOSITORY_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典（写入增量清单等JSON文件）
+        """
+        return {field: getattr(self, field) for field in REPOSITORY_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional['RepositoryRecord']:
+        """
+        由字典还原记录，忽略未知字段；缺少名称或链接时返回None
+        """
+        if not isinstance(data, dict) or not data.get('name') or not data.get('url'):
+            return None
+        return cls(**{field: data[field] for field in REPOSITORY_FIELDS if field in data})
+# 渲染函数同时接受记录与旧版字典格式（与 to_dict() 相同的键）的仓库
+RepositoryLike = Union[RepositoryRecord, Mapping[str, Any]]
+
+def as_records(repositories: Iterable[RepositoryLike]) -> List[RepositoryRecord]:
+    """
+    将仓库列表统一为 RepositoryRecord：字典通过 from_dict 转换，缺少名称或链接的跳过
+    """
+    records = []
+    for repo in repositories:
+        if not isinstance(repo, RepositoryRecord):
+            repo = RepositoryRecord.from_dict(dict(repo))
+        if repo is not None:
+            records.append(repo)
+    return records
+
+# ========== 汇总统计 ==========
+class RepositoryStatistics:
+    """
+    仪表板、JSON索引与控制台摘要共用的汇总统计，由 compute_statistics() 单遍计算
+    """
+    __slots__ = (
+        'total_repos', 'total_stars', 'total_forks', 'total_issues',
+        'unique_languages', 'primary_languages', 'language_counts',
+        'with_wiki', 'with_pages', 'with_license', 'total_topics', 'language_distribution',
+        'stale_repositories', 'trends',
+    )
+
+    def __init__(self):
+        self.total_repos = 0
+        self.total_stars = 0
+        self.total_forks = 0
+        self.total_issues = 0
+        self.unique_languages: List[str] = []    # 主语言与语言列表中出现的全部语言（排除"多种语言"）
+        self.primary_languages: List[str] = []   # 各仓库的主语言
+        self.language_counts: Dict[str, int] = {}  # 主语言 -> 仓库数（排除"多种语言"）
+        self.with_wiki = 0
+        self.with_pages = 0
+        self.with_license = 0
+        self.total_topics = 0
+        self.language_distribution: List[Dict[str, Any]] = []  # 按代码字节数加权的语言分布
+        self.stale_repositories: List[str] = []  # 数据来自过期缓存、尚未刷新的仓库（由调用方设置）
+        self.trends: Optional[Dict[str, Any]] = None  # 快照历史得到的增长趋势（由调用方设置，见 history.py）
+
+    @property
+    def average_topics(self) -> float:
+        return self.total_topics / self.total_repos if self.total_repos > 0 else 0
+
+def compute_statistics(repositories: Iterable[RepositoryRecord]) -> RepositoryStatistics:
+    """
+    一次遍历计算全部汇总统计；语言字节数在遍历中收集，再整体向量化汇总
+    """
+    stats = RepositoryStatistics()
+    all_languages = set()
+    primary_languages = set()
+    breakdowns = []
+    for repo in repositories:
+        stats.total_repos += 1
+        stats.total_stars += repo.stars
+        stats.total_forks += repo.forks
+        stats.total_issues += repo.open_issues
+        language = repo.language
+        if language:
+            primary_languages.add(language)
+        if language and language != '多种语言':
+            all_languages.add(language)
+            stats.language_counts[language] = stats.language_counts.get(language, 0) + 1
+        all_languages.update(repo.languages)
+        stats.with_wiki += 1 if repo.has_wiki else 0
+        stats.with_pages += 1 if repo.has_pages else 0
+        stats.with_license += 1 if repo.license else 0
+        stats.total_topics += len(repo.topics)
+        breakdowns.append(repo.language_bytes)
+    stats.language_distribution = compute_language_distribution(breakdowns)
+    stats.unique_languages = sorted(all_languages)
+    stats.primary_languages = sorted(primary_languages)
+    return stats
@@ -0,0 +1,77 @@
+"""
+stale-while-revalidate 模式的后台刷新：在时间预算内重新验证本次使用过的过期缓存
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional, Set
+
+from .cache import get_cache_store, get_endpoint_class
+from .client import call_github_api, get_readme_max_bytes
+from .metrics import METRICS
+
+# ========== 后台刷新 ==========
+DEFAULT_REFRESH_BUDGET = 30.0  # 秒
+MIN_REFRESH_TIMEOUT = 1.0  # 预算将尽时单个请求的最短超时
+
+def get_endpoint_repo(endpoint: str) -> Optional[str]:
+    """
+    端点所属的仓库名（小写）；不是单个仓库的端点时返回None
+    """
+    parts = [part for part in endpoint.split('?')[0].split('/') if part]
+    if len(parts) >= 3 and parts[0] == 'repos':
+        return parts[2].lower()
+    return None
+class BackgroundRefresh:
+    """
+    在线程池中重新验证过期缓存端点，请求超时与等待速率限制额度的时间都不超过剩余预算
+        job = BackgroundRefresh(endpoints, budget=30, max_workers=4)
+        ...  # 先用过期数据生成输出
+        result = job.wait()  # {'changed': {...}, 'pending': {...}}
+    """
+    def __init__(self, endpoints: List[str], budget: float, max_workers: int):
+        self.endpoints = endpoints
+        self.deadline = time.monotonic() + max(0.0, budget)
+        self.changed: Set[str] = set()
+        self.done: Set[str] = set()
+        self._closed = False  # 预算用尽后不再接收仍在进行的请求的结果
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='refresh')
+        self._futures = [self._executor.submit(self._refresh, endpoint) for endpoint in endpoints]
+
+    def _refresh(self, endpoint: str):
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        entry = get_cache_store().get(endpoint)
+        raw_max_bytes = get_readme_max_bytes() if get_endpoint_class(endpoint) == 'readme' else None
+        data = call_github_api(endpoint, retries=0, raw_max_bytes=raw_max_bytes,
+                               timeout=max(MIN_REFRESH_TIMEOUT, remaining), revalidate=True,
+                               max_wait=self.deadline - time.monotonic())
+        with self._lock:
+            if self._closed:
+                return
+            # 请求失败时 call_github_api 返回旧数据，视为未刷新
+            refreshed = get_cache_store().get(endpoint)
+            if refreshed is not None and (entry is None or refreshed['cached_at'] != entry['cached_at']):
+                self.done.add(endpoint)
+                if entry is None or data != entry['data']:
+                    self.changed.add(endpoint)
+
+    def wait(self) -> Dict[str, Set[str]]:
+        """
+        等待刷新完成或预算用尽，返回 {'changed': 数据有变化的仓库, 'pending': 未能刷新的仓库}
+        预算用尽时不再等待仍在进行的请求，这些端点计为未刷新
+        """
+        with METRICS.phase('refresh'):
+            wait(self._futures, timeout=max(0.0, self.deadline - time.monotonic()))
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._closed = True
+            changed = {get_endpoint_repo(endpoint) for endpoint in self.changed}
+            pending = {get_endpoint_repo(endpoint) for endpoint in self.endpoints if endpoint not in self.done}
+        METRICS.count('refreshed', len(self.done))
+        METRICS.count('refresh_pending', len(self.endpoints) - len(self.done))
+        changed.discard(None)
+        pending.discard(None)
+        return {'changed': changed, 'pending': pending}
@@ -0,0 +1,302 @@
+"""
+README.md 与 tools_index.json 的内容生成
+"""
+import io
+import heapq
+import json
+from datetime import datetime
+from typing import Dict, Optional, Any, Iterable, TextIO
+
+from . import config
+from .language_stats import format_language_distribution
+from .records import RepositoryLike, RepositoryRecord, RepositoryStatistics, as_records, compute_statistics
+
+# ========== README生成函数 ==========
+def generate_badge(label: str, value: Any, color: str = "blue") -> str:
+    """
+    生成Shields.io徽章
+    """
+    value_str = str(value).replace('-', '--').replace('_', '__')
+    label_str = str(label).replace('-', '--').replace('_', '__')
+    return f"![{label}](https://img.shields.io/badge/{label_str}-{value_str}-{color})"
+def generate_repository_card(repo_info: RepositoryRecord, stale: bool = False) -> str:
+    """
+    为单个仓库生成Markdown卡片；stale 为真时标记数据来自尚未刷新的缓存
+    """
+    card = f"""
+### 🗃️ [{repo_info.name}]({repo_info.url}){' ⏳' if stale else ''}
+{repo_info.final_description}
+**📊 统计信息:**
+- ⭐ 星标: **{repo_info.stars}** | 🍴 Fork: **{repo_info.forks}**
+- 📅 更新: `{repo_info.updated_at}` | 🐛 问题: {repo_info.open_issues}
+- 🔧 语言: `{repo_info.language}` | 📚 Wiki: {'✅' if repo_info.has_wiki else '❌'}
+"""
+    
+    # 添加主题标签
+    if repo_info.topics:
+        topics_str = ' '.join([f'`{topic}`' for topic in repo_info.topics[:5]])
+        card += f"**🏷️ 主题标签:** {topics_str}\n\n"
+    
+    # 添加许可证信息
+    if repo_info.license:
+        card += f"**📄 许可证:** {repo_info.license}\n\n"
+    
+    card += f"**🔗 快速链接:** [访问仓库]({repo_info.url})"
+    
+    # 添加其他语言
+    if len(repo_info.languages) > 1:
+        other_langs = ', '.join([f'`{lang}`' for lang in repo_info.languages[1:3]])
+        card += f" | 其他语言: {other_langs}"
+    
+    card += "\n\n---\n"
+    return card
+def format_delta(value: int) -> str:
+    return f"+{value}" if value > 0 else str(value)
+def generate_trends_section(trends: Dict[str, Any]) -> str:
+    """
+    生成增长趋势部分：7/30 天的累计增量与增长最快的仓库
+    """
+    lines = [f"""
+## 📈 增长趋势
+> 基于每日快照历史，数据最近变化于 {trends['last_changed']}
+
+| 指标 | 近 7 天 | 近 30 天 |
+|------|---------|----------|
+| ⭐ 星标 | {format_delta(trends['stars_7d'])} | {format_delta(trends['stars_30d'])} |
+| 🍴 Fork | {format_delta(trends['forks_7d'])} | {format_delta(trends['forks_30d'])} |
+| 🐛 Issue | {format_delta(trends['open_issues_7d'])} | {format_delta(trends['open_issues_30d'])} |
+"""]
+    if trends['fastest_growing']:
+        lines.append("""### 增长最快的项目
+| 仓库 | 近 7 天星标 | 近 30 天星标 |
+|------|-------------|--------------|
+""")
+        for entry in trends['fastest_growing']:
+            lines.append(f"| {entry['name']} | {format_delta(entry['stars_7d'])} | {format_delta(entry['stars_30d'])} |\n")
+    return ''.join(lines)
+def write_readme(repositories: Iterable[RepositoryLike], sink: TextIO, generated_at: Optional[datetime] = None,
+                 stats: Optional[RepositoryStatistics] = None):
+    """
+    将完整的README.md内容逐段写入 sink（文件或任意带 write() 的文本对象）
+    repositories 可以是 RepositoryRecord 或 to_dict() 格式的字典
+    各段与仓库卡片生成后立即写出，不在内存中拼接整篇文档
+    generated_at 为页面显示的生成时间，默认当前时间；stats 未提供时现场计算
+    """
+    repositories = as_records(repositories)
+    generated_at = generated_at or datetime.now()
+    stats = stats or compute_statistics(repositories)
+    unique_languages = stats.unique_languages
+    
+    # 按星标数排序
+    sorted_repos = sorted(repositories, key=lambda x: x.stars, reverse=True)
+    
+    # 生成最近更新的仓库
+    recent_repos = heapq.nlargest(3, repositories, key=lambda x: x.updated_at)
+    
+    # 开始生成Markdown
+    sink.write(f"""# 🧰 {config.USERNAME}'s Toolbox
+> 个人开发工具与项目集合 | 最后更新: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}
+## 📊 仪表板概览
+| 统计项 | 结果 | 说明 |
+|--------|------|------|
+| 📁 仓库总数 | **{stats.total_repos}** | 收录的项目数量 |
+| ⭐ 累计星标 | **{stats.total_stars}** | 所有仓库星标总和 |
+| 🍴 累计 Fork | **{stats.total_forks}** | 所有仓库Fork总和 |
+| 🔧 使用语言 | **{len(unique_languages)}** 种 | {', '.join(unique_languages[:5])}{'...' if len(unique_languages) > 5 else ''} |
+| 📅 最后更新 | `{recent_repos[0].updated_at if recent_repos else 'N/A'}` | {recent_repos[0].name if recent_repos else ''} |
+""")
+    if stats.stale_repositories:
+        sink.write(f"> ⏳ {len(stats.stale_repositories)} 个仓库的数据来自缓存，尚未刷新（标记为 ⏳）\n")
+    sink.write("""## 🏆 热门项目
+以下是根据星标数排序的热门项目:
+""")
+    
+    # 添加仓库卡片
+    stale = set(stats.stale_repositories)
+    for repo in sorted_repos:
+        sink.write(generate_repository_card(repo, repo.name in stale))
+    
+    # 添加最近更新部分
+    sink.write("""
+## 🔄 最近更新
+| 仓库 | 更新日期 | 星标数 | 状态 |
+|------|----------|--------|------|
+""")
+    for repo in recent_repos:
+        status = "🟢 活跃"  # 默认状态
+        try:
+            if repo.updated_at:  # 确保日期不为空
+                # 增加日期格式解析保护
+                date_obj = datetime.strptime(repo.updated_at, '%Y-%m-%d')
+                days_ago = (datetime.now() - date_obj).days
+                if days_ago < 30:
+                    status = "🟢 活跃"
+                elif days_ago < 90:
+                    status = "🟡 一般"
+                else:
+                    status = "🔴 停滞"
+        except (ValueError, TypeError):
+            # 如果日期解析失败（例如格式不对或为空），保持默认状态
+            pass
+        
+        sink.write(f"| [{repo.name}]({repo.url}) | {repo.updated_at} | ⭐ {repo.stars} | {status} |\n")
+    
+    # 添加增长趋势（需要至少两天的快照历史）
+    if stats.trends:
+        sink.write(generate_trends_section(stats.trends))
+    
+    # 添加技术栈分析（此处使用 ~~~ 避免嵌套 ``` 导致的显示问题）
+    sink.write("""
+## 🔧 技术栈分析
+### 主要编程语言分布
+~~~
+""")
+    
+    # 简单的语言统计
+    for lang, count in sorted(stats.language_counts.items(), key=lambda x: x[1], reverse=True):
+        bar = '█' * count
+        sink.write(f"{lang:<15} {bar} ({count})\n")
+    
+    sink.write("~~~\n")
+    
+    # 按代码字节数加权的语言分布
+    if stats.language_distribution:
+        sink.write("""### 代码量分布（按字节）
+~~~
+""")
+        sink.write(format_language_distribution(stats.language_distribution))
+        sink.write("~~~\n")
+    
+    sink.write("""### 项目特性统计
+- 📚 带Wiki的项目: {}/{}
+- 🌐 启用Pages的项目: {}/{}
+- 🏷️ 平均标签数: {:.1f} 个/项目
+- 📄 有许可证的项目: {}/{}
+""".format(
+        stats.with_wiki, stats.total_repos,
+        stats.with_pages, stats.total_repos,
+        stats.average_topics,
+        stats.with_license, stats.total_repos
+    ))
+    
+    # 添加使用说明
+    sink.write(f"""
+## 🚀 使用说明
+### 手动更新
+要手动更新此页面，在项目根目录运行:
+~~~bash
+# 确保已安装依赖
+pip install requests python-dotenv
+# 运行生成脚本
+python generate_auto_descriptions.py
+~~~
+### 自动更新
+此页面通过GitHub Actions自动更新，每天运行一次。
+### 添加新仓库
+要添加新仓库到此工具箱，请修改 `generate_auto_descriptions.py` 文件中的 `REPO_LIST`。
+## 📁 项目结构
+~~~
+Toolbox/
+├── generate_auto_descriptions.py   # 本脚本
+├── README.md                       # 本文件（自动生成）
+├── tools_index.json                # JSON格式索引
+├── tools_index.bin                 # 二进制索引（mmap 按需读取）
+├── tools_index.search.jsonl        # 检索索引（倒排表，供快速查询）
+├── toolbox_history/                # 每日快照历史（增长趋势）
+├── .env                            # 环境变量（本地）
+├── .github/workflows/              # GitHub Actions
+├── scripts/                        # 辅助脚本
+└── tools/                          # 子模块存放处
+~~~
+## 🤝 贡献与反馈
+这个工具箱是自动生成的。如果你发现任何问题或有改进建议，请:
+1. 检查 `.env` 文件中的GitHub令牌是否正确
+2. 确保要分析的仓库是公开的
+3. 检查网络连接是否正常
+---
+*✨ 此页面由自动化脚本生成 | 生成时间: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}*
+*[查看生成脚本](generate_auto_descriptions.py) | [报告问题](https://github.com/{config.USERNAME}/Toolbox/issues)*
+""")
+def generate_readme_content(repositories: Iterable[RepositoryLike], generated_at: Optional[datetime] = None) -> str:
+    """
+    生成完整的README.md内容（字符串形式，写文件请用 write_readme）
+    """
+    buffer = io.StringIO()
+    write_readme(repositories, buffer, generated_at)
+    return buffer.getvalue()
+def generate_index_header(repositories: Iterable[RepositoryLike], generated_at: Optional[datetime] = None,
+                          stats: Optional[RepositoryStatistics] = None) -> Dict[str, Any]:
+    """
+    tools_index.json 中仓库列表以外的部分（metadata 与 statistics）
+    """
+    repositories = as_records(repositories)
+    generated_at = generated_at or datetime.now()
+    stats = stats or compute_statistics(repositories)
+    metadata = {
+        "generated_at": generated_at.isoformat(),
+        "total_repositories": stats.total_repos,
+        "username": config.USERNAME,
+        "toolbox_version": "1.0.0"
+    }
+    if stats.stale_repositories:
+        metadata["stale_repositories"] = stats.stale_repositories
+    return {
+        "metadata": metadata,
+        "statistics": {
+            "total_stars": stats.total_stars,
+            "total_forks": stats.total_forks,
+            "total_issues": stats.total_issues,
+            "languages": stats.primary_languages,
+            "language_distribution": stats.language_distribution,
+            **({"trends": stats.trends} if stats.trends else {})
+        }
+    }
+def generate_index_data(repositories: Iterable[RepositoryLike], generated_at: Optional[datetime] = None,
+                        stats: Optional[RepositoryStatistics] = None) -> Dict[str, Any]:
+    """
+    生成 tools_index.json 的数据
+    """
+    repositories = as_records(repositories)
+    return {
+        **generate_index_header(repositories, generated_at, stats),
+        "repositories": [generate_index_entry(repo) for repo in repositories]
+    }
+def generate_index_entry(repo: RepositoryRecord) -> Dict[str, Any]:
+    """
+    tools_index.json 中单个仓库的条目（检索索引中的记录使用同一结构）
+    """
+    return {
+        "name": repo.name,
+        "url": repo.url,
+        "description": repo.final_description,
+        "stars": repo.stars,
+        "forks": repo.forks,
+        "language": repo.language,
+        "updated_at": repo.updated_at,
+        "topics": repo.topics,
+        "has_wiki": repo.has_wiki,
+        "license": repo.license
+    }
+def write_index(repositories: Iterable[RepositoryLike], sink: TextIO, generated_at: Optional[datetime] = None,
+                stats: Optional[RepositoryStatistics] = None):
+    """
+    将 tools_index.json 的文本内容逐段写入 sink：先写 metadata 与 statistics，
+    再逐个写出仓库条目，不在内存中构建完整的索引；输出与 json.dump(indent=2) 逐字节一致
+    """
+    repositories = as_records(repositories)
+    header = json.dumps(
+        {**generate_index_header(repositories, generated_at, stats), "repositories": []},
+        ensure_ascii=False, indent=2, default=str
+    )
+    # 表头以 '"repositories": []\n}' 结尾，在空列表处接上逐个写出的条目
+    sink.write(header[:-len("]\n}")])
+    for i, repo in enumerate(repositories):
+        entry = json.dumps(generate_index_entry(repo), ensure_ascii=False, indent=2, default=str)
+        # JSON 字符串中的换行已转义，按行缩进两层即可
+        sink.write(("," if i else "") + "\n    " + entry.replace("\n", "\n    "))
+    sink.write("\n  ]\n}" if repositories else "]\n}")
+def generate_index_content(repositories: Iterable[RepositoryLike], generated_at: Optional[datetime] = None) -> str:
+    """
+    生成 tools_index.json 的文本内容
+    """
+    return json.dumps(generate_index_data(repositories, generated_at), ensure_ascii=False, indent=2, default=str)
@@ -0,0 +1,139 @@
+"""
+请求重试与熔断：REST 与 GraphQL 请求共用的退避策略和按端点类别的断路器
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Dict, Optional, Any
+
+from . import config
+from .metrics import METRICS
+
+if TYPE_CHECKING:
+    import requests
+
+# ========== 退避等待 ==========
+# 带抖动的指数退避：第 n 次重试等待 [d/2, d]，d = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2^n)。
+# 429 与 403 二级限流优先按响应的 Retry-After 等待；需要等待超过 retry_max_wait 的不再重试。
+# 等待只阻塞发起重试的线程，不持有任何锁或连接，其他并发请求照常进行。
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+DEFAULT_RETRY_MAX_WAIT = 60.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def get_retry_after(response: 'requests.Response') -> Optional[float]:
+    """
+    Retry-After 响应头（秒数或 HTTP 日期）表示的等待秒数，没有或无法解析时返回None
+    """
+    value = (response.headers.get('Retry-After') or '').strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+def is_secondary_rate_limit(response: 'requests.Response', body: Optional[str] = None) -> bool:
+    """
+    是否为二级速率限制（短时间内请求过多）；主速率限制由 send_github_request 换令牌处理
+    body 为已读取的响应正文（流式响应已关闭时传 None，只看响应头）
+    """
+    if response.status_code not in (403, 429):
+        return False
+    if response.status_code == 429 or response.headers.get('Retry-After'):
+        return True
+    return body is not None and 'secondary rate limit' in body.lower()
+def is_retryable(response: 'requests.Response', body: Optional[str] = None) -> bool:
+    return response.status_code in RETRYABLE_STATUS_CODES or is_secondary_rate_limit(response, body)
+def get_backoff_delay(attempt: int) -> float:
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+def wait_before_retry(attempt: int, retry_after: Optional[float] = None) -> bool:
+    """
+    第 attempt 次（从 0 开始）失败后等待再重试；需要等待的时间超过上限时不等待并返回 False
+    """
+    max_wait = DEFAULT_RETRY_MAX_WAIT if config.RETRY_MAX_WAIT is None else float(config.RETRY_MAX_WAIT)
+    if retry_after is not None:
+        # 服务端给出的时间加少量抖动，避免同时等待的请求一起重发
+        delay = retry_after + random.uniform(0, RETRY_BASE_DELAY)
+    else:
+        delay = get_backoff_delay(attempt)
+    if delay > max_wait:
+        print(f"    需要等待 {delay:.0f} 秒，超过重试等待上限 {max_wait:g} 秒，放弃重试")
+        return False
+    print(f"    等待 {delay:.1f} 秒后重试...")
+    METRICS.count('retries')
+    time.sleep(delay)
+    return True
+
+# ========== 断路器 ==========
+# 每个端点类别（info / readme / languages / list / graphql …）一个断路器：连续失败达到阈值后打开，
+# 冷却期内的请求直接失败（退回缓存）；冷却结束后每个冷却期只放行一个试探请求，成功则关闭，失败则重新计时。
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_COOLDOWN = 30.0  # 秒
+
+class CircuitBreaker:
+    """
+    按端点类别的断路器（线程安全）
+    """
+    def __init__(self, threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+                 cooldown: float = DEFAULT_CIRCUIT_BREAKER_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.cooldown = max(0.0, cooldown)
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, endpoint_class: str) -> Dict[str, Any]:
+        if endpoint_class not in self._states:
+            self._states[endpoint_class] = {'failures': 0, 'opened_at': None, 'probe_at': None}
+        return self._states[endpoint_class]
+
+    def allow(self, endpoint_class: str) -> bool:
+        """
+        是否允许发出请求；断路器打开时返回 False
+        """
+        with self._lock:
+            state = self._state(endpoint_class)
+            if state['opened_at'] is None:
+                return True
+            now = time.monotonic()
+            if now - (state['probe_at'] or state['opened_at']) < self.cooldown:
+                METRICS.count('circuit_rejected')
+                return False
+            state['probe_at'] = now  # 半开：放行一个试探请求
+            return True
+
+    def record_success(self, endpoint_class: str):
+        with self._lock:
+            state = self._state(endpoint_class)
+            if state['opened_at'] is not None:
+                print(f"  ✅ {endpoint_class} 请求已恢复，断路器关闭")
+            state.update(failures=0, opened_at=None, probe_at=None)
+
+    def record_failure(self, endpoint_class: str):
+        with self._lock:
+            state = self._state(endpoint_class)
+            state['failures'] += 1
+            if state['opened_at'] is not None:
+                state.update(opened_at=time.monotonic(), probe_at=None)
+            elif state['failures'] >= self.threshold:
+                print(f"  🔌 {endpoint_class} 请求连续失败 {state['failures']} 次，"
+                      f"断路器打开（{self.cooldown:g} 秒内直接使用缓存）")
+                METRICS.count('circuit_opened')
+                state['opened_at'] = time.monotonic()
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    获取共享的断路器（首次调用时创建）
+    """
+    global _circuit_breaker
+    with _circuit_breaker_lock:
+        if _circuit_breaker is None:
+            threshold = DEFAULT_CIRCUIT_BREAKER_THRESHOLD if config.CIRCUIT_BREAKER_THRESHOLD is None else int(config.CIRCUIT_BREAKER_THRESHOLD)
+            cooldown = DEFAULT_CIRCUIT_BREAKER_COOLDOWN if config.CIRCUIT_BREAKER_COOLDOWN is None else float(config.CIRCUIT_BREAKER_COOLDOWN)
+            _circuit_breaker = CircuitBreaker(threshold, cooldown)
+        return _circuit_breaker
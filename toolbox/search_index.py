@@ -0,0 +1,205 @@
+"""
+tools_index.json 的检索索引（sidecar）与查询接口
+文件第一行是索引头（倒排表、排序与记录偏移），之后每行一条紧凑的仓库记录；
+查询只解析索引头，命中的记录按字节偏移单独读取
+"""
+import json
+import re
+import heapq
+import threading
+from datetime import datetime
+from itertools import accumulate
+from typing import List, Dict, Optional, Any, TextIO, Union, Iterable
+
+from .records import RepositoryRecord
+from .render import generate_index_entry
+
+# ========== 索引构建 ==========
+DEFAULT_SEARCH_INDEX_FILE = 'tools_index.search.jsonl'
+SEARCH_INDEX_FORMAT = 'toolbox-search-index'
+SEARCH_INDEX_VERSION = 1
+SEARCH_FIELDS = ('language', 'topic', 'license', 'name')
+SEARCH_SORTS = ('stars', 'updated_at')
+DEFAULT_SEARCH_LIMIT = 20
+# 名称分词：按非字母数字字符与驼峰边界切分，如 50DayChallenge -> 50 / day / challenge
+NAME_TOKEN_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+def normalize_term(term: Any) -> str:
+    return str(term).strip().lower()
+def tokenize_name(name: str) -> List[str]:
+    """
+    名称的检索词：完整名称加上各个分词（均为小写）
+    """
+    tokens = [normalize_term(name)]
+    for token in NAME_TOKEN_PATTERN.findall(name):
+        token = token.lower()
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+def get_document_terms(repo: RepositoryRecord) -> Dict[str, Iterable[str]]:
+    """
+    单个仓库在各检索字段下的检索词（language 为主语言）
+    """
+    return {
+        'language': [normalize_term(repo.language)] if repo.language else [],
+        'topic': {normalize_term(topic) for topic in repo.topics},
+        'license': [normalize_term(repo.license)] if repo.license else [],
+        'name': tokenize_name(repo.name),
+    }
+def write_search_index(repositories: List[RepositoryRecord], sink: TextIO, generated_at: Optional[datetime] = None):
+    """
+    将检索索引写入 sink（必须以 newline='\\n' 打开，记录偏移按 UTF-8 字节计算）
+    记录按星标数降序（相同时按名称）编号，倒排表按编号升序即为星标顺序
+    """
+    generated_at = generated_at or datetime.now()
+    documents = sorted(repositories, key=lambda repo: (-repo.stars, repo.name.lower()))
+    lines = [
+        json.dumps(generate_index_entry(repo), ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+        for repo in documents
+    ]
+    postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in SEARCH_FIELDS}
+    for doc_id, repo in enumerate(documents):
+        for field, terms in get_document_terms(repo).items():
+            for term in terms:
+                postings[field].setdefault(term, []).append(doc_id)
+    header = {
+        'format': SEARCH_INDEX_FORMAT,
+        'version': SEARCH_INDEX_VERSION,
+        'generated_at': generated_at.isoformat(),
+        'total': len(documents),
+        'names': [repo.name for repo in documents],
+        'postings': {field: dict(sorted(terms.items())) for field, terms in postings.items()},
+        'order': {
+            # 更新时间降序，相同时保持星标顺序
+            'updated_at': sorted(range(len(documents)), key=lambda i: documents[i].updated_at or '', reverse=True),
+        },
+        # 第 i 条记录位于记录区的 [offsets[i], offsets[i + 1]) 字节
+        'offsets': list(accumulate((len(line.encode('utf-8')) for line in lines), initial=0)),
+    }
+    sink.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')) + '\n')
+    for line in lines:
+        sink.write(line)
+
+# ========== 索引查询 ==========
+class SearchIndex:
+    """
+    只读检索索引：SearchIndex.open(path) 打开，query() 查询
+        with SearchIndex.open('tools_index.search.jsonl') as index:
+            index.query(language='Python', topic='cli', limit=20)
+    """
+    def __init__(self, f, header: Dict[str, Any]):
+        self._f = f
+        self._lock = threading.Lock()
+        self._records_start = f.tell()
+        self._updated_rank: Optional[List[int]] = None
+        self.header = header
+        self.names: List[str] = header['names']
+        self.postings: Dict[str, Dict[str, List[int]]] = header['postings']
+        self.offsets: List[int] = header['offsets']
+        self._name_ids = {name.lower(): i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_SEARCH_INDEX_FILE) -> 'SearchIndex':
+        """
+        打开索引文件并只解析索引头；格式或版本不符时抛出 ValueError
+        """
+        f = open(path, 'rb')
+        try:
+            header = json.loads(f.readline())
+            if not isinstance(header, dict) or header.get('format') != SEARCH_INDEX_FORMAT:
+                raise ValueError(f"{path} 不是 Toolbox 检索索引")
+            if header.get('version') != SEARCH_INDEX_VERSION:
+                raise ValueError(f"不支持的检索索引版本: {header.get('version')}")
+        except Exception:
+            f.close()
+            raise
+        return cls(f, header)
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self) -> 'SearchIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def terms(self, field: str) -> List[str]:
+        """
+        某个检索字段下的全部检索词
+        """
+        return list(self._get_postings(field))
+
+    def record(self, doc_id: int) -> Dict[str, Any]:
+        """
+        按编号读取一条记录（结构与 tools_index.json 中的仓库条目相同）
+        """
+        start, end = self.offsets[doc_id], self.offsets[doc_id + 1]
+        with self._lock:
+            self._f.seek(self._records_start + start)
+            data = self._f.read(end - start)
+        return json.loads(data)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        按仓库名（不区分大小写）读取记录，不存在时返回None
+        """
+        doc_id = self._name_ids.get(name.lower())
+        return self.record(doc_id) if doc_id is not None else None
+
+    def match(self, language: Union[str, List[str], None] = None, topic: Union[str, List[str], None] = None,
+              license: Union[str, List[str], None] = None, text: Optional[str] = None) -> List[int]:
+        """
+        返回同时满足全部条件的记录编号（升序，即星标降序）
+        每个条件可以是单个值或列表（列表中的值都要满足）；text 按名称分词匹配
+        """
+        conditions = []
+        for field, values in (('language', language), ('topic', topic), ('license', license)):
+            if values is None:
+                continue
+            for value in [values] if isinstance(values, str) else values:
+                conditions.append(self._get_postings(field).get(normalize_term(value), []))
+        if text:
+            for token in NAME_TOKEN_PATTERN.findall(text) or [text]:
+                conditions.append(self.postings['name'].get(normalize_term(token), []))
+        if not conditions:
+            return list(range(len(self.names)))
+        conditions.sort(key=len)
+        result = set(conditions[0])
+        for posting in conditions[1:]:
+            if not result:
+                break
+            result.intersection_update(posting)
+        return sorted(result)
+
+    def query(self, language: Union[str, List[str], None] = None, topic: Union[str, List[str], None] = None,
+              license: Union[str, List[str], None] = None, text: Optional[str] = None,
+              sort: str = 'stars', limit: Optional[int] = DEFAULT_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """
+        查询并按 sort（stars / updated_at，均为降序）返回前 limit 条记录；只读取返回的记录
+        """
+        if sort not in SEARCH_SORTS:
+            raise ValueError(f"未知的排序方式: {sort}（可选 {', '.join(SEARCH_SORTS)}）")
+        doc_ids = self.match(language, topic, license, text)
+        if sort == 'updated_at':
+            rank = self._get_updated_rank()
+            doc_ids = heapq.nsmallest(limit, doc_ids, key=rank.__getitem__) if limit is not None else sorted(doc_ids, key=rank.__getitem__)
+        elif limit is not None:
+            doc_ids = doc_ids[:limit]
+        return [self.record(doc_id) for doc_id in doc_ids]
+
+    def _get_postings(self, field: str) -> Dict[str, List[int]]:
+        if field not in self.postings:
+            raise ValueError(f"未知的检索字段: {field}（可选 {', '.join(SEARCH_FIELDS)}）")
+        return self.postings[field]
+
+    def _get_updated_rank(self) -> List[int]:
+        if self._updated_rank is None:
+            rank = [0] * len(self.names)
+            for position, doc_id in enumerate(self.header['order']['updated_at']):
+                rank[doc_id] = position
+            self._updated_rank = rank
+        return self._updated_rank
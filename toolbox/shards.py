@@ -0,0 +1,132 @@
+"""
+多账号分片生成：每个账号一个子进程，在各自目录中生成 README 与索引，
+最后只读取各分片的 tools_index.json 合并出总索引，并由合并结果生成顶层 README、
+检索索引与二进制索引（不再请求 API）；快照历史与增长趋势只在各分片中记录，合并输出不包含趋势
+"""
+import os
+import sys
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Any, BinaryIO, TextIO, Tuple
+
+from . import config
+from .binary_index import encode_binary_index
+from .language_stats import merge_language_distributions
+from .records import RepositoryRecord, RepositoryStatistics, compute_statistics
+
+# ========== 分片运行 ==========
+DEFAULT_SHARDS_DIR = 'accounts'
+SHARD_LOG_FILE = 'generate.log'
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def get_shard_dir(username: str) -> str:
+    return os.path.join(config.SHARDS_DIR or DEFAULT_SHARDS_DIR, username)
+def run_shard(username: str, argv: List[str]) -> int:
+    """
+    在账号的分片目录中以子进程运行生成流程（输出写入 generate.log），返回退出码
+    """
+    shard_dir = get_shard_dir(username)
+    os.makedirs(shard_dir, exist_ok=True)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get('PYTHONPATH')]))
+    env.setdefault('PYTHONIOENCODING', 'utf-8')
+    # 后出现的 --config 覆盖 argv 中的同名参数；分片目录中的相对路径不再指向原配置文件
+    command = [sys.executable, '-m', 'toolbox'] + argv + [
+        '--config', os.path.abspath(config.CONFIG_FILE), '--account', username,
+    ]
+    with open(os.path.join(shard_dir, SHARD_LOG_FILE), 'w', encoding='utf-8') as log:
+        return subprocess.run(command, cwd=shard_dir, env=env, stdout=log, stderr=subprocess.STDOUT).returncode
+def run_shards(argv: List[str], jobs: int) -> Dict[str, int]:
+    """
+    并发运行全部账号分片（最多 jobs 个进程同时运行），返回 账号 -> 退出码
+    """
+    usernames = [entry['username'] for entry in config.ACCOUNTS]
+    print(f"🧩 分片生成 {len(usernames)} 个账号（并发 {jobs} 个进程）: {', '.join(usernames)}")
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix='shard') as pool:
+        for username, code in zip(usernames, pool.map(lambda name: run_shard(name, argv), usernames)):
+            results[username] = code
+            status = '✅' if code == 0 else f"❌ (exit {code}，见 {os.path.join(get_shard_dir(username), SHARD_LOG_FILE)})"
+            print(f"  {status} {username}")
+    return results
+
+# ========== 合并 ==========
+def load_shard_indexes(usernames: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    读取各分片的 tools_index.json；缺失或无法解析的分片跳过
+    """
+    shards = []
+    for username in usernames:
+        path = os.path.join(get_shard_dir(username), 'tools_index.json')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shards.append((username, json.load(f)))
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"  ⚠️  跳过分片 {username}: {e}")
+    return shards
+def merge_index_data(shards: List[Tuple[str, Dict[str, Any]]], generated_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    合并各分片的索引：仓库条目增加 owner 字段，统计值相加，语言分布按字节数重新排名
+    """
+    generated_at = generated_at or datetime.now()
+    repositories = []
+    languages = set()
+    totals = {'total_stars': 0, 'total_forks': 0, 'total_issues': 0}
+    for username, index in shards:
+        statistics = index.get('statistics', {})
+        for key in totals:
+            totals[key] += statistics.get(key, 0)
+        languages.update(statistics.get('languages', []))
+        repositories.extend({**entry, "owner": username} for entry in index.get('repositories', []))
+    return {
+        "metadata": {
+            "generated_at": generated_at.isoformat(),
+            "total_repositories": len(repositories),
+            "usernames": [username for username, _ in shards],
+            "toolbox_version": "1.0.0",
+            "shards": [
+                {
+                    "username": username,
+                    "path": get_shard_dir(username).replace(os.sep, '/'),
+                    "total_repositories": len(index.get('repositories', [])),
+                    "generated_at": index.get('metadata', {}).get('generated_at')
+                }
+                for username, index in shards
+            ]
+        },
+        "statistics": {
+            **totals,
+            "languages": sorted(languages),
+            "language_distribution": merge_language_distributions(
+                index.get('statistics', {}).get('language_distribution', []) for _, index in shards
+            )
+        },
+        "repositories": repositories
+    }
+def write_merged_index(shards: List[Tuple[str, Dict[str, Any]]], sink: TextIO, generated_at: Optional[datetime] = None):
+    json.dump(merge_index_data(shards, generated_at), sink, ensure_ascii=False, indent=2, default=str)
+def write_merged_binary_index(shards: List[Tuple[str, Dict[str, Any]]], sink: BinaryIO,
+                              generated_at: Optional[datetime] = None):
+    sink.write(encode_binary_index(merge_index_data(shards, generated_at)))
+def merged_index_records(merged: Dict[str, Any]) -> Tuple[List[RepositoryRecord], RepositoryStatistics]:
+    """
+    由合并后的索引还原仓库记录与汇总统计，用于生成顶层 README 与检索索引
+    索引条目只包含部分字段（没有语言字节数与 Issue 数），语言分布与各项总数沿用合并结果
+    """
+    repositories = []
+    for entry in merged['repositories']:
+        repo = RepositoryRecord.from_dict({
+            **{key: value for key, value in entry.items() if key != 'description'},
+            'final_description': entry.get('description') or '',
+        })
+        if repo is not None:
+            repositories.append(repo)
+    stats = compute_statistics(repositories)
+    statistics = merged['statistics']
+    stats.total_stars = statistics['total_stars']
+    stats.total_forks = statistics['total_forks']
+    stats.total_issues = statistics['total_issues']
+    stats.language_distribution = statistics['language_distribution']
+    return repositories, stats
@@ -0,0 +1,347 @@
+"""
+事件驱动的增量更新：接收 GitHub webhook（push / star / release / repository edited），
+校验签名后只重新分析受影响的仓库，并在内存中的仓库列表里原位替换其记录后重新生成输出
+另提供 replay 子命令重放录制的 webhook 负载，便于本地测试
+
+用法示例：
+    GITHUB_WEBHOOK_SECRET=... python -m toolbox.webhook serve --port 8787 --record webhook_payloads
+    python -m toolbox.webhook replay webhook_payloads/*.json                          # 进程内直接处理
+    python -m toolbox.webhook replay webhook_payloads/*.json --url http://127.0.0.1:8787/  # 签名后发送到接收器
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Any, Tuple
+
+from . import config
+from .analysis import analyze_discovered_repository, analyze_repositories
+from .cache import CACHE_DIR, get_endpoint_class, pop_stale_endpoints
+from .cli import apply_trends, check_tokens, run_analysis, write_outputs
+from .client import call_github_api, get_readme_max_bytes
+from .discovery import get_discovery_settings
+from .extract import dump_description_memo, load_description_memo
+from .history import get_repo_key
+from .incremental import DEFAULT_MANIFEST_FILE, get_manifest_key, load_manifest
+from .records import RepositoryRecord, compute_statistics
+
+# ========== 事件解析 ==========
+DEFAULT_WEBHOOK_HOST = '127.0.0.1'
+DEFAULT_WEBHOOK_PORT = 8787
+DEFAULT_DEBOUNCE = 1.0  # 秒；同一时间段内的多个事件合并为一次更新
+MAX_PAYLOAD_BYTES = 25 * 1024 * 1024  # GitHub webhook 负载上限
+SIGNATURE_HEADER = 'X-Hub-Signature-256'
+# 事件 -> 会触发更新的 action（None 表示不区分 action）；watch 是 star 的旧事件名
+HANDLED_EVENTS = {
+    'push': None,
+    'star': None,
+    'watch': None,
+    'release': None,
+    'repository': {'edited'},
+}
+
+def sign_payload(secret: str, body: bytes) -> str:
+    """
+    X-Hub-Signature-256 请求头的值
+    """
+    return 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    return bool(signature) and hmac.compare_digest(sign_payload(secret, body), signature)
+def get_event_repo(event: str, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    需要更新的仓库键（owner/name，小写，与 history.get_repo_key 一致）；事件无需处理时返回None
+    """
+    if event not in HANDLED_EVENTS or not isinstance(payload, dict):
+        return None
+    actions = HANDLED_EVENTS[event]
+    if actions is not None and payload.get('action') not in actions:
+        return None
+    full_name = (payload.get('repository') or {}).get('full_name')
+    return full_name.lower() if isinstance(full_name, str) and '/' in full_name else None
+def load_recorded_payload(path: str, event: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    读取录制的负载：serve --record 保存的 {"event", "delivery", "payload"}，
+    或直接的负载 JSON（此时需要 event 参数）
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'payload' in data and 'event' in data:
+        return event or data['event'], data['payload']
+    if not event:
+        raise ValueError(f"{path} 不是录制格式，请用 --event 指定事件类型")
+    return event, data
+
+# ========== 增量更新 ==========
+class WebhookUpdater:
+    """
+    持有当前全部仓库记录；事件对应的仓库重新分析后原位替换，再重新生成 README 与各索引
+    事件由 submit() 放入待处理集合，后台线程合并后批量处理
+    """
+    def __init__(self, debounce: float = DEFAULT_DEBOUNCE):
+        self.debounce = debounce
+        self.discovery = get_discovery_settings()
+        self.incremental = bool(config.INCREMENTAL)
+        self.manifest_file = config.MANIFEST_FILE or DEFAULT_MANIFEST_FILE
+        self.manifest = load_manifest(self.manifest_file) if self.incremental else {'outputs': {}, 'repositories': {}}
+        load_description_memo(self.manifest.get('readme_descriptions'))
+        self.repositories: List[RepositoryRecord] = []
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self):
+        """
+        启动时完整分析一次（增量模式下复用清单），生成与定时任务相同的输出
+        """
+        _, results, entries = run_analysis(self.discovery, self.manifest['repositories'], self.incremental)
+        self.repositories = [repo_info for repo_info in results if repo_info]
+        if self.incremental:
+            self.manifest['repositories'] = entries
+        self.render()
+        print(f"📋 已加载 {len(self.repositories)} 个仓库")
+
+    def find(self, key: str) -> Optional[int]:
+        for i, repo in enumerate(self.repositories):
+            if get_repo_key(repo) == key:
+                return i
+        return None
+
+    def reanalyze(self, key: str, repository: Dict[str, Any]) -> Optional[RepositoryRecord]:
+        """
+        重新分析单个仓库：先用条件请求重新验证它的缓存端点（304 不消耗额度），再按配置的方式分析
+        """
+        owner, name = (repository.get('full_name') or key).split('/', 1)
+        if not self.discovery['enabled']:
+            owner = config.USERNAME  # 与 analyze_repository 使用的缓存端点一致
+        endpoints = [f"/repos/{owner}/{name}", f"/repos/{owner}/{name}/languages", f"/repos/{owner}/{name}/readme"]
+        if self.discovery['enabled']:
+            item = call_github_api(endpoints[0], revalidate=True)
+            if not isinstance(item, dict):
+                return None
+            if self.discovery['fetch_languages']:
+                call_github_api(endpoints[1], revalidate=True)
+            call_github_api(endpoints[2], raw_max_bytes=get_readme_max_bytes(), revalidate=True)
+            return analyze_discovered_repository(item, self.discovery['fetch_languages'])
+        if config.FETCH_BACKEND != 'graphql':
+            # GraphQL 请求不经过缓存，无需预先刷新
+            for endpoint in endpoints:
+                raw_max_bytes = get_readme_max_bytes() if get_endpoint_class(endpoint) == 'readme' else None
+                call_github_api(endpoint, raw_max_bytes=raw_max_bytes, revalidate=True)
+        result = analyze_repositories([name], 1)[0]
+        pop_stale_endpoints()  # 刚刷新过，不需要 stale-while-revalidate 的后台刷新
+        return result
+
+    def update(self, events: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        重新分析事件涉及的仓库并重新生成输出，返回实际更新的仓库名
+        """
+        updated = []
+        for key, repository in events.items():
+            index = self.find(key)
+            if index is None:
+                print(f"  ⏭️  {key} 不在工具箱中，忽略")
+                continue
+            repo_info = self.reanalyze(key, repository)
+            if repo_info is None:
+                print(f"  ⚠️  {key} 重新分析失败，保留原有数据")
+                continue
+            self.repositories[index] = repo_info
+            # 清单中的旧记录已过时，下次完整运行时重新验证
+            owner = key.split('/', 1)[0]
+            self.manifest['repositories'].pop(get_manifest_key(owner, repo_info.name), None)
+            updated.append(repo_info.name)
+        if updated:
+            self.render()
+        return updated
+
+    def render(self):
+        """
+        由内存中的记录重新生成输出：统计与趋势现场计算，不追加快照（快照只由定时运行记录）
+        """
+        stats = compute_statistics(self.repositories)
+        apply_trends(self.repositories, stats)
+        written = write_outputs(self.repositories, stats, self.manifest.setdefault('outputs', {}))
+        if self.incremental:
+            self.manifest['readme_descriptions'] = dump_description_memo(repo.readme_sha for repo in self.repositories)
+            with open(self.manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        changed = [path for path, path_written in written.items() if path_written]
+        print(f"📝 已更新: {', '.join(changed)}" if changed else "📝 输出内容未变化")
+
+    def submit(self, key: str, repository: Dict[str, Any]):
+        with self._condition:
+            self._pending[key] = repository
+            self._condition.notify()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='webhook-update', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # 等待片刻，把连续到达的事件（例如 push 后紧跟的 release）合并处理
+            time.sleep(self.debounce)
+            with self._condition:
+                events, self._pending = self._pending, {}
+            started = time.perf_counter()
+            try:
+                updated = self.update(events)
+            except Exception as e:
+                print(f"  ❌ 处理事件失败: {type(e).__name__}: {e}")
+                continue
+            if updated:
+                print(f"✅ {', '.join(updated)} 已更新（{time.perf_counter() - started:.1f} 秒）")
+
+# ========== 接收器 ==========
+def make_handler(updater: WebhookUpdater, secret: str, record_dir: Optional[str]):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status: int, message: str):
+            body = json.dumps({'message': message}, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self.reply(200, 'ok')
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+            except ValueError:
+                self.reply(400, 'invalid content length')
+                return
+            if length <= 0 or length > MAX_PAYLOAD_BYTES:
+                self.reply(413 if length > 0 else 400, 'invalid payload size')
+                return
+            body = self.rfile.read(length)
+            if not verify_signature(secret, body, self.headers.get(SIGNATURE_HEADER)):
+                print(f"  🚫 签名校验失败，已拒绝（{self.client_address[0]}）")
+                self.reply(401, 'invalid signature')
+                return
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError:
+                self.reply(400, 'invalid json')
+                return
+            event = self.headers.get('X-GitHub-Event', '')
+            delivery = self.headers.get('X-GitHub-Delivery', '')
+            if record_dir:
+                record_payload(record_dir, event, delivery, payload)
+            if event == 'ping':
+                self.reply(200, 'pong')
+                return
+            key = get_event_repo(event, payload)
+            if key is None:
+                self.reply(202, 'ignored')
+                return
+            print(f"📨 {event} {payload.get('action') or ''} -> {key}")
+            updater.submit(key, payload.get('repository') or {})
+            self.reply(202, 'queued')
+    return Handler
+def record_payload(record_dir: str, event: str, delivery: str, payload: Dict[str, Any]):
+    os.makedirs(record_dir, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{event or 'unknown'}-{delivery[:8] or os.getpid()}.json"
+    with open(os.path.join(record_dir, name), 'w', encoding='utf-8') as f:
+        json.dump({'event': event, 'delivery': delivery, 'payload': payload}, f, ensure_ascii=False, indent=2)
+def serve(args: argparse.Namespace, secret: str):
+    updater = WebhookUpdater(args.debounce)
+    updater.load()
+    updater.start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(updater, secret, args.record))
+    print(f"🛰️  webhook 接收器已启动: http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 接收器已停止")
+    finally:
+        server.server_close()
+
+# ========== 重放 ==========
+def replay(args: argparse.Namespace, secret: Optional[str]):
+    """
+    重放录制的负载：指定 --url 时签名后发送到接收器，否则在进程内直接处理
+    """
+    recorded = [load_recorded_payload(path, args.event) for path in args.files]
+    if args.url:
+        import requests  # 延迟导入，仅在真正发请求时加载
+        for path, (event, payload) in zip(args.files, recorded):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            headers = {'Content-Type': 'application/json', 'X-GitHub-Event': event,
+                       'X-GitHub-Delivery': f"replay-{os.path.basename(path)}"}
+            if secret:
+                headers[SIGNATURE_HEADER] = sign_payload(secret, body)
+            response = requests.post(args.url, data=body, headers=headers, timeout=30)
+            print(f"  {path}: HTTP {response.status_code} {response.text.strip()}")
+        return
+
+    updater = WebhookUpdater()
+    updater.load()
+    events = {}
+    for path, (event, payload) in zip(args.files, recorded):
+        key = get_event_repo(event, payload)
+        print(f"  {path}: {event} -> {key or '忽略'}")
+        if key:
+            events[key] = payload.get('repository') or {}
+    updated = updater.update(events)
+    print(f"✅ 重放完成，更新了 {len(updated)} 个仓库: {', '.join(updated)}" if updated else "✅ 重放完成，没有仓库需要更新")
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="接收 GitHub webhook 并增量更新工具箱")
+    parser.add_argument('--config', default=config.CONFIG_FILE, help=f"配置文件路径（默认 {config.CONFIG_FILE}）")
+    parser.add_argument('--account', default=None, help="多账号配置时处理的账号")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help="启动 webhook 接收器")
+    serve_parser.add_argument('--host', default=DEFAULT_WEBHOOK_HOST, help=f"监听地址（默认 {DEFAULT_WEBHOOK_HOST}）")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_WEBHOOK_PORT, help=f"监听端口（默认 {DEFAULT_WEBHOOK_PORT}）")
+    serve_parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                              help=f"合并连续事件的等待时间（秒，默认 {DEFAULT_DEBOUNCE:g}）")
+    serve_parser.add_argument('--record', default=None, metavar='DIR', help="把校验通过的负载保存到目录，供 replay 使用")
+    replay_parser = commands.add_parser('replay', help="重放录制的 webhook 负载")
+    replay_parser.add_argument('files', nargs='+', help="录制的负载文件")
+    replay_parser.add_argument('--event', default=None, help="负载不是录制格式时的事件类型（如 star）")
+    replay_parser.add_argument('--url', default=None, help="发送到运行中的接收器（默认在进程内直接处理）")
+    return parser.parse_args(argv)
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    config.load_env()
+    secret = config.WEBHOOK_SECRET
+    if args.command == 'replay' and args.url:
+        replay(args, secret)
+        return
+
+    try:
+        config.load_config(args.config, args.account)
+    except ValueError as e:
+        print(f"❌ 错误：{e}")
+        sys.exit(1)
+    if config.ACCOUNTS and args.account is None:
+        print("❌ 错误：多账号配置请用 --account 指定接收器处理的账号")
+        sys.exit(1)
+    if args.command == 'serve' and not secret:
+        print("❌ 错误：未设置 GITHUB_WEBHOOK_SECRET，无法校验 webhook 签名")
+        sys.exit(1)
+    if not check_tokens():
+        sys.exit(1)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    config.MAX_WORKERS = max(1, int(config.MAX_WORKERS))
+
+    if args.command == 'serve':
+        serve(args, secret)
+    else:
+        replay(args, secret)
+
+if __name__ == "__main__":
+    main()